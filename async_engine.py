@@ -0,0 +1,195 @@
+"""
+Redfin Property Scraper - Async Engine
+Drives many tabs of one Chrome over the DevTools Protocol (Playwright) to load
+detail pages concurrently
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from playwright.async_api import async_playwright
+
+from browser import USER_AGENT, preset_for_url
+from dom_snapshot import EXPAND_INTERIOR_JS, SNAPSHOT_JS
+from parsing import parse_snapshot
+from rate_limiter import THROTTLED_ERROR, looks_throttled
+from waits import WAIT_BUDGETS
+
+# page.evaluate() expects a function expression
+_EXPAND_FN = "() => {" + EXPAND_INTERIOR_JS + "}"
+_SNAPSHOT_FN = "() => {" + SNAPSHOT_JS + "}"
+_INTERIOR_READY_FN = ("() => Array.from(document.querySelectorAll('li.entryItem'))"
+                      ".some(li => /Heating|Cooling/.test(li.textContent))")
+_PAGE_TEXT_FN = ("() => document.title + ' ' + "
+                 "(document.body ? document.body.innerText.slice(0, 3000) : '')")
+
+
+class AsyncRedfinEngine:
+    """Concurrent detail-page extraction over CDP with a tab limit
+
+    If rate_limiter (an AdaptiveRateLimiter) is set, every tab waits for a
+    token before its goto and reports the outcome, as the Selenium path does.
+    """
+
+    def __init__(self, concurrency=8, headless=True, wait_stats=None, resource_stats=None,
+                 rate_limiter=None):
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter
+        self.headless = headless
+        self.wait_stats = wait_stats
+        self.resource_stats = resource_stats
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._semaphore = None
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        self._context = await self._browser.new_context(user_agent=USER_AGENT)
+        if self.resource_stats is not None and self.resource_stats.presets:
+            await self._context.route('**/*', self._route)
+            self._context.on('requestfinished', self._request_finished)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        print(f"✓ Async engine started ({self.concurrency} concurrent tabs)")
+
+    async def _route(self, route):
+        """Request interceptor: abort anything matching a block preset"""
+        url = route.request.url
+        if preset_for_url(url, self.resource_stats.presets):
+            self.resource_stats.record_blocked(url)
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    async def _request_finished(self, request):
+        try:
+            sizes = await request.sizes()
+            self.resource_stats.record_loaded(sizes.get('responseBodySize', 0) + sizes.get('responseHeadersSize', 0))
+        except Exception:
+            pass
+
+    async def close(self):
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._context = self._browser = self._playwright = None
+
+    async def _timed(self, label, awaitable):
+        start = time.monotonic()
+        timed_out = False
+        try:
+            return await awaitable
+        except Exception:
+            timed_out = True
+            return None
+        finally:
+            if self.wait_stats is not None:
+                self.wait_stats.record(label, time.monotonic() - start, timed_out)
+
+    async def extract_property_details_async(self, property_url):
+        """Async counterpart of RedfinScraperComplete.extract_property_details"""
+        property_data = {
+            'url': property_url,
+            'listing_status': 'unknown',
+            'scrape_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                # acquire() sleeps, so it waits on an executor thread
+                await asyncio.get_running_loop().run_in_executor(None, self.rate_limiter.acquire, property_url)
+            started = time.monotonic()
+            page = await self._context.new_page()
+            try:
+                await page.goto(property_url, wait_until='domcontentloaded',
+                                timeout=WAIT_BUDGETS['document_ready'] * 1000)
+                banner = await self._timed('listing_status', page.wait_for_selector(
+                    'div.ListingStatusBannerSection', state='attached',
+                    timeout=WAIT_BUDGETS['listing_status'] * 1000))
+                if banner is None and looks_throttled(await page.evaluate(_PAGE_TEXT_FN)):
+                    raise Exception(THROTTLED_ERROR)
+
+                if await page.evaluate(_EXPAND_FN) == 'clicked':
+                    await self._timed('interior_entries', page.wait_for_function(
+                        _INTERIOR_READY_FN, timeout=WAIT_BUDGETS['interior_entries'] * 1000))
+
+                parse_snapshot(await page.evaluate(_SNAPSHOT_FN) or {}, property_data)
+                print(f"  ✓ [async] {property_data['full_address']} - Oil: {property_data['has_oil_heating']}")
+
+            except Exception as e:
+                print(f"  ✗ [async] Error extracting {property_url}: {e}")
+                property_data['error'] = str(e)
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+            if self.rate_limiter is not None:
+                error = property_data.get('error')
+                if not error:
+                    self.rate_limiter.record(property_url, time.monotonic() - started, 'ok')
+                else:
+                    self.rate_limiter.record(property_url,
+                                             outcome='throttled' if error.startswith(THROTTLED_ERROR) else 'error')
+
+        return property_data
+
+    async def extract_many(self, property_urls):
+        """Extract all urls concurrently (bounded by concurrency), in input order"""
+        return await asyncio.gather(*(self.extract_property_details_async(url) for url in property_urls))
+
+
+class AsyncEngineRunner:
+    """Synchronous wrapper so the Selenium-based flow can call the async engine
+
+    Keeps one event loop alive for the whole run so the browser is reused
+    across pages.
+    """
+
+    def __init__(self, concurrency=8, headless=True, wait_stats=None, resource_stats=None,
+                 rate_limiter=None):
+        self.loop = asyncio.new_event_loop()
+        self.engine = AsyncRedfinEngine(concurrency=concurrency, headless=headless,
+                                        wait_stats=wait_stats, resource_stats=resource_stats,
+                                        rate_limiter=rate_limiter)
+        self.started = False
+
+    def extract_many(self, property_urls):
+        if not self.started:
+            self.loop.run_until_complete(self.engine.start())
+            self.started = True
+        return self.loop.run_until_complete(self.engine.extract_many(property_urls))
+
+    def close(self):
+        if self.started:
+            self.loop.run_until_complete(self.engine.close())
+            self.started = False
+        self.loop.close()
+
+
+if __name__ == "__main__":
+    # Offline check: extract the fixture pages through a local mock server
+    from mock_server import MockRedfinServer, DEFAULT_ROUTES
+
+    with MockRedfinServer() as mock:
+        runner = AsyncEngineRunner(concurrency=4)
+        try:
+            start = time.monotonic()
+            results = runner.extract_many([mock.url(path) for path in DEFAULT_ROUTES])
+            print(f"\nExtracted {len(results)} pages in {time.monotonic() - start:.2f}s")
+            for data in results:
+                print(f"   {data.get('full_address')}: {data.get('listing_status')}, "
+                      f"heating={data.get('heating_type')}, error={data.get('error', '-')}")
+        finally:
+            runner.close()
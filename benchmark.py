@@ -0,0 +1,286 @@
+"""
+Redfin Property Scraper - Benchmark
+Offline end-to-end run against the mock server: paginated search pages,
+detail pages (sold, for sale, collapsed Interior) and the journal/Excel path,
+plus a micro-benchmark of batch reparsing of stored records
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from urllib.parse import urljoin
+
+import requests
+from lxml import html as lxml_html
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+import pandas as pd
+
+from main import RedfinScraperComplete
+from mock_server import MockRedfinServer, search_page_routes
+from parsing import (parse_address, parse_addresses, parse_interior_entries, parse_interior_batch,
+                     reparse_records)
+
+SEARCH_PATH = '/county/1974/NY/Nassau-County'
+
+# The collapsed-Interior page needs a browser to expand, so the HTTP-only
+# mode leaves it out
+BROWSER_FIXTURES = ['property_sold.html', 'property_for_sale.html', 'property_collapsed_interior.html']
+HTTP_FIXTURES = ['property_sold.html', 'property_for_sale.html']
+
+
+def build_routes(homes, per_page, fixtures):
+    """Search pages listing `homes` detail pages that cycle through fixtures"""
+    routes = {}
+    listings = []
+    for i in range(1, homes + 1):
+        path = f"/NY/Benchmark/{i}-Main-St-11000/home/{900000 + i}"
+        routes[path] = fixtures[i % len(fixtures)]
+        listings.append((path, f"{i} Main St, Benchmark, NY 11000", f"${400000 + i * 1000:,}"))
+    routes.update(search_page_routes(SEARCH_PATH, listings, per_page))
+    return routes
+
+
+def peak_rss_mb():
+    """(this process, finished child processes) peak RSS in MB, or None"""
+    if resource is None:
+        return None, None
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return round(own, 1), round(children, 1)
+
+
+def make_scraper(args, workdir, mock):
+    scraper = RedfinScraperComplete(excel_file=os.path.join(workdir, 'benchmark.xlsx'),
+                                    storage_backend=args.storage)
+    scraper.base_url = mock.url(SEARCH_PATH)
+    scraper.headless = True
+    scraper.remote_debugging_port = None
+    scraper.requests_per_second = args.rate
+    scraper.max_requests_per_second = args.rate
+    scraper.detail_workers = args.workers
+    scraper.detail_engine = args.engine
+    scraper.use_http_fast_path = args.mode == 'http' or args.http_fast_path
+    scraper.use_pipeline = args.pipeline
+    # No dedup index: every run saves the same fixture addresses again
+    return scraper
+
+
+def run_browser(scraper):
+    """scrape_current_page + the pagination loop, as in run_normal_mode"""
+    scraper.setup_driver()
+    scraper.driver.get(scraper.base_url)
+    pages = 1
+    while True:
+        saved_before = scraper.properties_saved_count
+        scraper.scrape_current_page()
+        navigated = scraper.has_next_page() and scraper.go_to_next_page()
+        scraper.finish_pipelined_page(saved_before)
+        if not navigated:
+            break
+        pages += 1
+    return pages
+
+
+def run_http(scraper):
+    """Crawl the search pages with requests, then extract over HTTP only"""
+    session = requests.Session()
+    url = scraper.base_url
+    urls = []
+    pages = 0
+    while url:
+        with scraper.metrics.time('listing_page'):
+            tree = lxml_html.fromstring(session.get(url, timeout=10).content)
+        pages += 1
+        urls.extend(urljoin(url, href) for href in
+                    tree.xpath('//a[contains(@class, "bp-Homecard__Address")]/@href'))
+        next_arrow = tree.xpath('//button[contains(@class, "PageArrow__direction--next")'
+                                ' and not(contains(@class, "PageArrow--hidden"))]/@onclick')
+        match = re.search(r"'([^']+)'", next_arrow[0]) if next_arrow else None
+        url = urljoin(url, match.group(1)) if match else None
+    scraper.process_property_urls(urls)
+    return pages
+
+
+# Address layouts and Interior entries seen on sold / for-sale pages
+SAMPLE_ADDRESSES = [
+    '25 Schooner Ln, Port Washington, NY 11050',
+    '166 N Oak St, Massapequa NY 11758',
+    '12 Harbor View Dr, Oyster Bay, NY 11771',
+    '3 Elm Pl, NY 11501',
+    '1 Main St',
+]
+SAMPLE_HEATING = ['Oil, Baseboard', 'Natural Gas, Forced Air', 'Hot Water, Oil', 'Electric', '-']
+
+
+def _synthetic_addresses(rows, distinct):
+    return [f"{i % distinct} " + SAMPLE_ADDRESSES[i % len(SAMPLE_ADDRESSES)].split(' ', 1)[1]
+            for i in range(rows)]
+
+
+def _time_addresses(addresses):
+    """(parse_address loop seconds, parse_addresses seconds, identical results)"""
+    started = time.monotonic()
+    scalar = [parse_address(text) for text in addresses]
+    scalar_seconds = round(time.monotonic() - started, 2)
+
+    started = time.monotonic()
+    batch = parse_addresses(addresses)
+    batch_seconds = round(time.monotonic() - started, 2)
+    return scalar_seconds, batch_seconds, batch.to_dict('records') == scalar
+
+
+def run_parsing(rows):
+    """Reparse `rows` synthetic stored records: per-row functions vs the batch API
+
+    Addresses are timed twice: all distinct (house numbers run 0..rows), the
+    worst case for the batch path, and as a weekly journal where each
+    listing shows up about ten times. Both paths must give identical results.
+    """
+    records = pd.DataFrame({
+        'full_address': _synthetic_addresses(rows, rows),
+        'heating_type': [SAMPLE_HEATING[i % len(SAMPLE_HEATING)] for i in range(rows)],
+    })
+    entries = [[f"Heating: {heating}", 'Cooling: Central Air'] for heating in records['heating_type'][:100000]]
+    results = {'rows': rows, 'distinct_addresses': int(records['full_address'].nunique())}
+
+    (results['scalar_address_seconds'], results['batch_address_seconds'],
+     results['address_results_match']) = _time_addresses(records['full_address'])
+
+    journal = pd.Series(_synthetic_addresses(rows, max(1, rows // 10)))
+    (results['scalar_journal_address_seconds'], results['batch_journal_address_seconds'],
+     journal_match) = _time_addresses(journal)
+    results['address_results_match'] = results['address_results_match'] and journal_match
+
+    started = time.monotonic()
+    scalar_interior = [parse_interior_entries(item_texts) for item_texts in entries]
+    results['scalar_interior_seconds_per_100k'] = round(time.monotonic() - started, 2)
+
+    started = time.monotonic()
+    batch_interior = parse_interior_batch(entries)
+    results['batch_interior_seconds_per_100k'] = round(time.monotonic() - started, 2)
+    results['interior_results_match'] = batch_interior.to_dict('records') == scalar_interior
+
+    started = time.monotonic()
+    reparsed = reparse_records(records)
+    results['batch_reparse_seconds'] = round(time.monotonic() - started, 2)
+    results['rows_per_second'] = round(rows / max(results['batch_reparse_seconds'], 1e-9))
+    results['oil_rows'] = int((reparsed['has_oil_heating'] == 'Yes').sum())
+
+    print("\n" + "="*60)
+    print("PARSING BENCHMARK")
+    print("="*60)
+    print(f"Rows: {rows:,} ({results['distinct_addresses']:,} distinct addresses)")
+    print(f"Addresses: {results['scalar_address_seconds']}s parse_address loop, "
+          f"{results['batch_address_seconds']}s parse_addresses "
+          f"({'identical' if results['address_results_match'] else 'RESULTS DIFFER'})")
+    print(f"Addresses, each repeated ~10x (weekly journal): {results['scalar_journal_address_seconds']}s loop, "
+          f"{results['batch_journal_address_seconds']}s parse_addresses")
+    print(f"reparse_records (address + oil flag): {results['batch_reparse_seconds']}s "
+          f"→ {results['rows_per_second']:,} rows/s")
+    print(f"Interior entries, 100k properties: {results['scalar_interior_seconds_per_100k']}s one by one, "
+          f"{results['batch_interior_seconds_per_100k']}s batched "
+          f"({'identical' if results['interior_results_match'] else 'RESULTS DIFFER'})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark against the mock Redfin server")
+    parser.add_argument('--mode', choices=['browser', 'http', 'parsing'], default='browser',
+                        help='browser: Selenium end to end; http: no browser at all; '
+                             'parsing: batch reparse of --rows stored records')
+    parser.add_argument('--rows', type=int, default=1000000, help='records for --mode parsing')
+    parser.add_argument('--homes', type=int, default=120, help='listings across all search pages')
+    parser.add_argument('--per-page', type=int, default=40)
+    parser.add_argument('--workers', type=int, default=1, help='detail workers (browser mode)')
+    parser.add_argument('--engine', choices=['selenium', 'async'], default='selenium')
+    parser.add_argument('--http-fast-path', action='store_true', help='browser mode: try HTTP first')
+    parser.add_argument('--pipeline', action='store_true', help='browser mode: background extraction/saving')
+    parser.add_argument('--storage', choices=['jsonl', 'sqlite'], default='jsonl')
+    parser.add_argument('--rate', type=float, default=50.0, help='requests/s cap for the rate limiter')
+    parser.add_argument('--json', metavar='FILE', help='also write the results as JSON')
+    parser.add_argument('--keep', action='store_true', help='keep the output directory')
+    args = parser.parse_args()
+
+    if args.mode == 'parsing':
+        results = run_parsing(args.rows)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            print(f"\n✓ Results written to {args.json}")
+        return
+
+    workdir = tempfile.mkdtemp(prefix='redfin-bench-')
+    fixtures = HTTP_FIXTURES if args.mode == 'http' else BROWSER_FIXTURES
+    routes = build_routes(args.homes, args.per_page, fixtures)
+
+    with MockRedfinServer(routes=routes) as mock:
+        scraper = make_scraper(args, workdir, mock)
+        started = time.monotonic()
+        try:
+            pages = run_http(scraper) if args.mode == 'http' else run_browser(scraper)
+        finally:
+            scraper.stop_pipeline()
+            scraper.close_writer()
+            elapsed = time.monotonic() - started
+            for closer in (scraper.detail_pool, scraper.async_runner, scraper.http_extractor, scraper):
+                if closer is not None:
+                    try:
+                        closer.close()
+                    except Exception:
+                        pass
+        requests_served = mock.requests_served
+
+    extracted = scraper.metrics.counters.get('properties_extracted', 0)
+    own_rss, child_rss = peak_rss_mb()
+    results = {
+        'mode': args.mode,
+        'engine': args.engine,
+        'workers': args.workers,
+        'homes': args.homes,
+        'pages': pages,
+        'properties': extracted,
+        'oil_saved': scraper.properties_saved_count,
+        'errors': scraper.metrics.counters.get('extract_errors', 0),
+        'elapsed_seconds': round(elapsed, 2),
+        'properties_per_minute': round(extracted / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        'requests_served': requests_served,
+        'peak_rss_mb': own_rss,
+        'peak_child_rss_mb': child_rss,
+        'metrics': scraper.metrics.summary(),
+    }
+
+    print("\n" + "="*60)
+    print("BENCHMARK RESULTS")
+    print("="*60)
+    print(f"Mode: {args.mode} ({args.engine}, {args.workers} workers)")
+    print(f"Pages: {pages}, properties: {extracted}, oil saved: {scraper.properties_saved_count}, "
+          f"errors: {results['errors']}")
+    print(f"Elapsed: {elapsed:.2f}s → {results['properties_per_minute']} properties/min")
+    if own_rss is not None:
+        print(f"Peak RSS: {own_rss} MB (this process), {child_rss} MB (largest finished child)")
+    scraper.metrics.report()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+
+    if args.keep:
+        print(f"✓ Output kept in {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Redfin Property Scraper - Browser
+Chrome driver construction shared by the main scraper and its workers
+"""
+
+import json
+import threading
+from fnmatch import fnmatch
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# URL patterns for Network.setBlockedURLs ('*' wildcards). We only read text,
+# so none of these are needed to scrape a property.
+BLOCK_PRESETS = {
+    'images': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.ico*',
+               '*ssl.cdn-redfin.com/photo/*', '*ssl.cdn-redfin.com/system_files/media/*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.ts?*'],
+    'fonts': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+    'maps': ['*maps.googleapis.com*', '*maps.gstatic.com*', '*khms*.google.com*',
+             '*api.mapbox.com*', '*tiles.mapbox.com*', '*/tiles/*'],
+    'trackers': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                 '*googlesyndication.com*', '*facebook.net*', '*connect.facebook.com*',
+                 '*bat.bing.com*', '*hotjar.com*', '*optimizely.com*', '*branch.io*',
+                 '*quantserve.com*', '*scorecardresearch.com*', '*nr-data.net*',
+                 '*criteo.com*', '*adsrvr.org*', '*tiktok.com*', '*pinterest.com/ct*'],
+}
+
+DEFAULT_BLOCK_PRESETS = ['images', 'media', 'fonts', 'maps', 'trackers']
+
+# Typical transfer size per blocked request, used to estimate bytes saved
+# (a blocked request never reports its real size)
+TYPICAL_BLOCKED_BYTES = {
+    'images': 80000,
+    'media': 500000,
+    'fonts': 40000,
+    'maps': 25000,
+    'trackers': 20000,
+}
+
+
+def blocked_url_patterns(presets):
+    patterns = []
+    for preset in presets or []:
+        patterns.extend(BLOCK_PRESETS.get(preset, []))
+    return patterns
+
+
+def preset_for_url(url, presets):
+    """Name of the first preset whose patterns match url, or None"""
+    for preset in presets or []:
+        if any(fnmatch(url, pattern) for pattern in BLOCK_PRESETS.get(preset, [])):
+            return preset
+    return None
+
+
+def apply_resource_blocking(driver, presets):
+    """Block the presets' URL patterns in this browser via CDP"""
+    patterns = blocked_url_patterns(presets)
+    if not patterns:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+
+class ResourceStats:
+    """Per-run counters of requests/bytes loaded and blocked
+
+    Selenium drivers are read from Chrome's performance log; the async engine
+    calls record_blocked/record_loaded from its request interceptor.
+    """
+
+    def __init__(self, presets=None):
+        self.presets = presets or []
+        self.requests_loaded = 0
+        self.bytes_loaded = 0
+        self.blocked = {}
+        self._lock = threading.Lock()
+
+    def record_blocked(self, url):
+        preset = preset_for_url(url, self.presets) or 'other'
+        with self._lock:
+            self.blocked[preset] = self.blocked.get(preset, 0) + 1
+
+    def record_loaded(self, num_bytes):
+        with self._lock:
+            self.requests_loaded += 1
+            self.bytes_loaded += int(num_bytes or 0)
+
+    def collect(self, driver):
+        """Drain the driver's performance log into the counters"""
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return
+
+        urls = {}
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except Exception:
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                urls[params.get('requestId')] = params.get('request', {}).get('url', '')
+            elif method == 'Network.loadingFinished':
+                self.record_loaded(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                self.record_blocked(urls.get(params.get('requestId'), ''))
+
+    def estimated_bytes_saved(self):
+        return sum(count * TYPICAL_BLOCKED_BYTES.get(preset, 20000)
+                   for preset, count in self.blocked.items())
+
+    def report(self):
+        total_blocked = sum(self.blocked.values())
+        if not total_blocked and not self.requests_loaded:
+            return
+        print("\n🛡 Resource blocking:")
+        print(f"   Loaded: {self.requests_loaded} requests, {self.bytes_loaded / 1e6:.1f} MB")
+        print(f"   Blocked: {total_blocked} requests "
+              f"(~{self.estimated_bytes_saved() / 1e6:.1f} MB saved, estimated)")
+        for preset in sorted(self.blocked):
+            print(f"      {preset}: {self.blocked[preset]}")
+
+
+def create_chrome_driver(headless=False, remote_debugging_port=9222, block_presets=None):
+    """Build a Chrome driver with the scraper's anti-detection settings
+
+    Workers run several browsers side by side, so they pass
+    remote_debugging_port=None to avoid fighting over port 9222.
+    block_presets names entries of BLOCK_PRESETS to block via CDP.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--window-size=1920,1080')
+    else:
+        chrome_options.add_argument('--start-maximized')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--no-service-autorun')
+    chrome_options.add_argument('--password-store=basic')
+    chrome_options.add_argument('--disable-gpu')
+    if remote_debugging_port:
+        chrome_options.add_argument(f'--remote-debugging-port={remote_debugging_port}')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    if block_presets:
+        # Performance log feeds ResourceStats
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    driver = webdriver.Chrome(options=chrome_options)
+
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+        "userAgent": USER_AGENT
+    })
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    if block_presets:
+        apply_resource_blocking(driver, block_presets)
+
+    return driver
@@ -0,0 +1,48 @@
+"""
+Redfin Property Scraper - Checkpoint
+Run state (phase plan, current page, processed URLs, counters) persisted
+atomically so an interrupted run can be resumed with --resume
+"""
+
+import json
+import os
+from datetime import datetime
+
+
+def checkpoint_path_for(excel_file):
+    """redfin_oil_properties.xlsx -> redfin_oil_properties.checkpoint.json"""
+    return os.path.splitext(excel_file)[0] + '.checkpoint.json'
+
+
+class Checkpoint:
+    """One JSON document rewritten via tmp file + fsync + rename
+
+    A crash mid-write leaves the previous checkpoint in place, so the file on
+    disk is always complete.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """The saved state dict, or None if there is no readable checkpoint"""
+        if not self.exists():
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                return json.load(fh)
+        except Exception as e:
+            print(f"⚠ Could not read checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, state):
+        state = dict(state, updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(state, fh, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
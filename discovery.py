@@ -0,0 +1,177 @@
+"""
+Redfin Property Scraper - Discovery
+List property URLs from the site's CSV search endpoint instead of paging
+through home cards in the browser
+"""
+
+import csv
+import re
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from browser import USER_AGENT
+
+SEARCH_CSV_PATH = '/stingray/api/gis-csv'
+
+# Region type codes used by the search endpoint, keyed on the URL segment
+REGION_TYPES = {
+    'neighborhood': 1,
+    'zipcode': 2,
+    'county': 5,
+    'city': 6,
+}
+
+# property-type=... values in the filter URL -> uipt codes
+PROPERTY_TYPE_CODES = {
+    'house': 1,
+    'condo': 2,
+    'townhouse': 3,
+    'multifamily': 4,
+    'land': 5,
+    'other': 6,
+    'manufactured': 7,
+    'co-op': 8,
+}
+
+# include=sold-... values in the filter URL -> sold_within_days
+SOLD_WITHIN_DAYS = {
+    'sold-1wk': 7,
+    'sold-1mo': 30,
+    'sold-3mo': 90,
+    'sold-6mo': 180,
+    'sold-1yr': 365,
+    'sold-2yr': 730,
+    'sold-3yr': 1095,
+    'sold-5yr': 1825,
+}
+
+
+def parse_price(text):
+    """'50k' -> 50000, '1.5m' -> 1500000, '450000' -> 450000"""
+    text = text.strip().lower()
+    if text.endswith('m'):
+        return int(float(text[:-1]) * 1000000)
+    if text.endswith('k'):
+        return int(float(text[:-1]) * 1000)
+    return int(float(text))
+
+
+def region_from_url(base_url):
+    """('5', '1974') from https://www.redfin.com/county/1974/NY/Nassau-County"""
+    match = re.search(r'/(county|city|zipcode|neighborhood)/(\d+)', urlparse(base_url).path)
+    if not match:
+        raise ValueError(f"Cannot find a region id in {base_url}")
+    return REGION_TYPES[match.group(1)], int(match.group(2))
+
+
+def filter_to_params(base_filter):
+    """Translate a filter URL segment (a=b,c=d) into search endpoint params"""
+    params = {}
+    for part in [p for p in (base_filter or '').split(',') if p]:
+        key, _, value = part.partition('=')
+        if key == 'property-type':
+            codes = [str(PROPERTY_TYPE_CODES[v]) for v in value.split('+') if v in PROPERTY_TYPE_CODES]
+            if codes:
+                params['uipt'] = ','.join(codes)
+        elif key == 'include' and value in SOLD_WITHIN_DAYS:
+            params['status'] = 9
+            params['sold_within_days'] = SOLD_WITHIN_DAYS[value]
+        elif key == 'min-price':
+            params['min_price'] = parse_price(value)
+        elif key == 'max-price':
+            params['max_price'] = parse_price(value)
+        elif key == 'min-beds':
+            params['num_beds'] = value
+        elif key == 'min-baths':
+            params['num_baths'] = value
+        else:
+            print(f"   ⚠ Filter '{part}' is not supported by API discovery, ignoring")
+    return params
+
+
+def _column(row, prefix):
+    for key, value in row.items():
+        if key and key.upper().startswith(prefix):
+            return value
+    return None
+
+
+def row_to_listing(row, site_base):
+    """Summary fields of one CSV row; None for disclaimer/footer rows"""
+    url = _column(row, 'URL')
+    if not url:
+        return None
+    return {
+        'url': urljoin(site_base, url),
+        'address': row.get('ADDRESS') or '-',
+        'city': row.get('CITY') or '-',
+        'state': row.get('STATE OR PROVINCE') or '-',
+        'zip_code': row.get('ZIP OR POSTAL CODE') or '-',
+        'price': row.get('PRICE') or '-',
+        'status': row.get('STATUS') or '-',
+        'sale_type': row.get('SALE TYPE') or '-',
+        'sold_date': row.get('SOLD DATE') or '-',
+        'property_type': row.get('PROPERTY TYPE') or '-',
+        'mls_number': _column(row, 'MLS') or '-',
+    }
+
+
+class SearchApiDiscovery:
+    """Stream property URLs and summary fields for a region + filter + price window"""
+
+    def __init__(self, base_url, base_filter='', site_base=None, page_size=350, session=None, timeout=30):
+        parsed = urlparse(base_url)
+        self.site_base = site_base or f"{parsed.scheme}://{parsed.netloc}"
+        self.region_type, self.region_id = region_from_url(base_url)
+        self.base_params = filter_to_params(base_filter)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.setdefault('User-Agent', USER_AGENT)
+        self.requests_made = 0
+
+    def build_params(self, min_price=None, max_price=None, page_number=1):
+        params = {
+            'al': 1,
+            'region_id': self.region_id,
+            'region_type': self.region_type,
+            'num_homes': self.page_size,
+            'page_number': page_number,
+            'v': 8,
+        }
+        params.update(self.base_params)
+        if min_price is not None:
+            params['min_price'] = min_price
+        if max_price is not None:
+            params['max_price'] = max_price
+        return params
+
+    def iter_listings(self, min_price=None, max_price=None, max_pages=50):
+        """Yield listing summaries page by page until a short page is returned"""
+        seen = set()
+        for page_number in range(1, max_pages + 1):
+            response = self.session.get(
+                self.site_base + SEARCH_CSV_PATH,
+                params=self.build_params(min_price, max_price, page_number),
+                timeout=self.timeout,
+                stream=True
+            )
+            self.requests_made += 1
+            response.raise_for_status()
+
+            rows = 0
+            lines = (line.decode('utf-8-sig') if isinstance(line, bytes) else line
+                     for line in response.iter_lines())
+            for row in csv.DictReader(lines):
+                listing = row_to_listing(row, self.site_base)
+                if listing is None:
+                    continue
+                rows += 1
+                if listing['url'] in seen:
+                    continue
+                seen.add(listing['url'])
+                yield listing
+
+            if rows < self.page_size:
+                break
@@ -0,0 +1,91 @@
+"""
+Redfin Property Scraper - DOM Snapshot
+Single execute_script round-trips for expanding Interior, reading a
+property page and reading search result cards, instead of one WebDriver
+call per field
+"""
+
+# Close any popup and expand Interior. JS clicks are not blocked by overlays,
+# so the popup no longer needs its own wait. Returns 'expanded' if the entries
+# were already rendered, 'clicked' after clicking the header, or null if the
+# header could not be found.
+EXPAND_INTERIOR_JS = """
+const close = document.querySelector('button.bp-CloseButton');
+if (close) { close.click(); }
+
+const hasEntries = Array.from(document.querySelectorAll('li.entryItem'))
+    .some(li => /Heating|Cooling/.test(li.textContent));
+if (hasEntries) { return 'expanded'; }
+
+let header = null;
+const bulb = document.querySelector('svg.lightbulb-shine');
+if (bulb) { header = bulb.closest('div.sectionHeaderContainer'); }
+if (!header) {
+    header = Array.from(document.querySelectorAll('div.sectionHeaderContainer'))
+        .find(h => h.querySelector('h3') && /Interior/.test(h.querySelector('h3').textContent)) || null;
+}
+if (!header) { return null; }
+
+header.scrollIntoView({block: 'center'});
+header.click();
+return 'clicked';
+"""
+
+# Every field extract_property_details needs, in one JSON object
+SNAPSHOT_JS = """
+const text = (sel) => {
+    const el = document.querySelector(sel);
+    return el ? el.innerText.trim() : null;
+};
+const xpathText = (xp) => {
+    const node = document.evaluate(xp, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return node ? node.textContent.trim() : null;
+};
+
+const entries = Array.from(document.querySelectorAll('li.entryItem')).map(li => li.innerText);
+// Same test as parsing._HEATING_ENTRY: an entry with a label but no value keeps the body text
+const hasHeating = entries.some(t => /Heating ?:[^\\S\\n]*(?:\\n(?!\\s*(?:Heating|Cooling) ?:)\\s*)?[^\\n]*[^\\s:]/.test(t));
+const bodyText = document.body ? document.body.innerText : '';
+
+return {
+    banner: text('div.ListingStatusBannerSection'),
+    full_address: text('h1.full-address'),
+    street_address: text('h1.street-address'),
+    price: text('div.statsValue') || text('div.price'),
+    beds: text('div.beds-section .statsValue'),
+    baths: text('div.baths-section .statsValue'),
+    sqft: text('div.sqft-section .statsValue'),
+    property_type: xpathText('//span[text()="Property Type"]/preceding-sibling::span[@class="valueText"]'),
+    listing_agent: xpathText('//span[contains(text(), "Listing by")]/span'),
+    broker: text('span.agent-basic-details--broker'),
+    entries: entries,
+    body_text: (!hasHeating && bodyText.includes('Heating:')) ? bodyText : null
+};
+"""
+
+# [href, price, status badge text] for every homecard on a search page
+HOMECARD_SUMMARY_JS = """
+return Array.from(document.querySelectorAll('a.bp-Homecard__Address')).map(a => {
+    const card = a.closest('.bp-Homecard') || a.parentElement;
+    const price = card.querySelector('[class*="Homecard__Price--value"]');
+    const badges = Array.from(card.querySelectorAll('[class*="Sash"], [class*="Homecard__Status"]'))
+        .map(el => el.textContent.trim());
+    return [a.href, price ? price.textContent.trim() : '', badges.join(' ')];
+});
+"""
+
+
+def expand_interior(driver):
+    """Close popups and expand the Interior section in one round-trip"""
+    return driver.execute_script(EXPAND_INTERIOR_JS)
+
+
+def take_snapshot(driver):
+    """Read every property field in one round-trip"""
+    return driver.execute_script(SNAPSHOT_JS) or {}
+
+
+def homecard_summaries(driver):
+    """[(url, price, status badge)] for the current search page in one round-trip"""
+    return [tuple(card) for card in driver.execute_script(HOMECARD_SUMMARY_JS) or [] if card[0]]
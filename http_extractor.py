@@ -0,0 +1,157 @@
+"""
+Redfin Property Scraper - HTTP Extractor
+Browser-free fast path: fetch property pages over a pooled HTTP session and
+parse the server-rendered HTML with lxml
+"""
+
+import re
+import sys
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+
+from browser import USER_AGENT
+from parsing import parse_snapshot
+from rate_limiter import THROTTLED_ERROR, looks_throttled, parse_retry_after
+
+# Fields that must be found in the HTML; otherwise fall back to Selenium.
+# Everything else (cooling, property type, ...) may be '-', as in the browser path
+REQUIRED_FIELDS = ['full_address', 'listing_status', 'heating_type']
+
+
+def _class_xpath(tag, css_class):
+    """XPath equivalent of the CSS selector tag.css_class"""
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+
+# Elements that start a new line in the browser's innerText
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'footer', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'header', 'li', 'ol', 'p', 'section', 'table', 'tr', 'ul',
+}
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _text(elem):
+    """Text like the browser's innerText: <br> and block children break lines,
+    other whitespace collapses to single spaces within each line"""
+    parts = []
+    _collect_text(elem, parts)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _collect_text(elem, parts):
+    # Source line breaks are plain whitespace; only the markup breaks lines
+    if elem.text:
+        parts.append(_WHITESPACE.sub(' ', elem.text))
+    for child in elem:
+        if child.tag == 'br':
+            parts.append('\n')
+        elif isinstance(child.tag, str):  # Skip comments and processing instructions
+            block = child.tag in BLOCK_TAGS
+            if block:
+                parts.append('\n')
+            _collect_text(child, parts)
+            if block:
+                parts.append('\n')
+        if child.tail:
+            parts.append(_WHITESPACE.sub(' ', child.tail))
+
+
+def _first_text(tree, xpath):
+    elems = tree.xpath(xpath)
+    return _text(elems[0]) if elems else None
+
+
+def parse_property_html(html_text, property_url):
+    """Build property_data from a property page's HTML (no network, no browser)
+
+    Uses the same selectors as extract_property_details. Fields that are not
+    present are left as '-'; missing REQUIRED_FIELDS are listed in the
+    returned missing list.
+    """
+    tree = lxml_html.fromstring(html_text)
+    property_data = {
+        'url': property_url,
+        'scrape_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    # Same shape as dom_snapshot.SNAPSHOT_JS so both paths share parse_snapshot
+    # (Interior entries are in the HTML even when the section is collapsed)
+    snapshot = {
+        'banner': _first_text(tree, _class_xpath('div', 'ListingStatusBannerSection')),
+        'full_address': _first_text(tree, _class_xpath('h1', 'full-address')),
+        'street_address': _first_text(tree, _class_xpath('h1', 'street-address')),
+        'price': (_first_text(tree, _class_xpath('div', 'statsValue'))
+                  or _first_text(tree, _class_xpath('div', 'price'))),
+        'property_type': _first_text(
+            tree, '//span[text()="Property Type"]/preceding-sibling::span[@class="valueText"]'),
+        'listing_agent': _first_text(tree, '//span[contains(text(), "Listing by")]/span'),
+        'broker': _first_text(tree, _class_xpath('span', 'agent-basic-details--broker')),
+        'entries': [_text(li) for li in tree.xpath(_class_xpath('li', 'entryItem'))],
+    }
+    for field, section in [('beds', 'beds-section'), ('baths', 'baths-section'), ('sqft', 'sqft-section')]:
+        snapshot[field] = _first_text(tree, _class_xpath('div', section) + _class_xpath('div', 'statsValue'))
+
+    parse_snapshot(snapshot, property_data)
+
+    missing = [field for field in REQUIRED_FIELDS
+               if property_data.get(field) in (None, '-', 'unknown')]
+    return property_data, missing
+
+
+class HttpPropertyExtractor:
+    """Fetch property pages with a pooled requests.Session"""
+
+    def __init__(self, pool_size=10, timeout=15):
+        self.timeout = timeout
+        self.session = requests.Session()
+        # A 429's Retry-After goes to the rate limiter instead of sleeping in this thread
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=Retry(total=2, respect_retry_after_header=False))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+
+    def fetch(self, property_url):
+        response = self.session.get(property_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def extract(self, property_url):
+        """Return (property_data, missing_fields); missing includes 'fetch' on errors"""
+        try:
+            html_text = self.fetch(property_url)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status in (403, 429):
+                return {'url': property_url, 'error': f"{THROTTLED_ERROR} (HTTP {status})",
+                        'retry_after': parse_retry_after(e.response.headers.get('Retry-After'))}, ['fetch']
+            return {'url': property_url, 'error': f"HTTP fetch failed: {e}"}, ['fetch']
+        except Exception as e:
+            return {'url': property_url, 'error': f"HTTP fetch failed: {e}"}, ['fetch']
+        if looks_throttled(html_text[:5000]) and 'ListingStatusBannerSection' not in html_text:
+            return {'url': property_url, 'error': THROTTLED_ERROR}, ['fetch']
+        return parse_property_html(html_text, property_url)
+
+    def close(self):
+        self.session.close()
+
+
+if __name__ == "__main__":
+    # Offline check against saved pages: python http_extractor.py fixtures/property_sold.html
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as fh:
+            data, missing = parse_property_html(fh.read(), path)
+        print(f"{path}:")
+        for key, value in data.items():
+            print(f"   {key}: {value}")
+        print(f"   missing: {missing or 'none'}")
@@ -1,20 +1,167 @@
 import time
-import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import os
 import subprocess
+import sys
+import threading
 from datetime import datetime
 import re
 
+from browser import create_chrome_driver, apply_resource_blocking, DEFAULT_BLOCK_PRESETS, ResourceStats
+from waits import (
+    WaitStats, wait_for, document_ready, new_tab_opened, homecards_rendered,
+    results_count_present, interior_entries_present, url_changed, element_present
+)
+from http_extractor import HttpPropertyExtractor
+from discovery import SearchApiDiscovery, parse_price
+from price_planner import PricePlanner
+from probe_cache import ProbeCountCache, DEFAULT_CACHE_FILE
+from phase_runner import ParallelPhaseRunner
+from checkpoint import Checkpoint, checkpoint_path_for
+from run_config import build_parser, resolve_settings, is_unattended
+from dom_snapshot import expand_interior, take_snapshot, homecard_summaries
+from parsing import parse_snapshot
+from storage import open_store, open_sinks, DedupIndex, BatchedWriter
+from worker_pool import DetailWorkerPool
+from rate_limiter import AdaptiveRateLimiter, SharedRateBucket, THROTTLED_ERROR, looks_throttled
+from metrics import RunMetrics
+from pipeline import ScrapePipeline
+from property_store import PropertyStore, listing_summary
+
+# Scraper attributes written to the checkpoint and restored by --resume
+CHECKPOINT_FIELDS = [
+    'storage_backend', 'base_url', 'base_filter', 'use_auto_phases', 'min_price', 'max_price',
+    'continue_after_manual', 'manual_range_max', 'phase_planning', 'phase_plan',
+    'current_phase', 'phases_completed', 'current_page_num', 'page_url',
+    'properties_saved_count', 'discovery_mode', 'detail_engine', 'detail_workers',
+    'phase_workers', 'use_http_fast_path', 'use_pipeline', 'headless', 'parquet_dir',
+    'property_db', 'incremental',
+    # The rest of the run's settings, so a resumed cron run stays a cron run
+    'interactive', 'remote_debugging_port', 'auto_phases_setting', 'target_max_results',
+    'target_min_results', 'save_batch_size', 'save_flush_seconds', 'excel_export_seconds',
+    'async_concurrency', 'requests_per_second', 'max_requests_per_second', 'max_pages_per_browser',
+    'metrics_file', 'metrics_port',
+]
+
+# Non-oil visits between checkpoints; the .seen sidecar (DedupIndex) journals
+# each visit as it happens, so a resume skips the ones not checkpointed yet
+CHECKPOINT_EVERY = 50
+
+
+def ask_number(prompt, default, parse=int):
+    """Prompt for a number; empty or unreadable input gives the default"""
+    text = input(prompt).strip()
+    if not text:
+        return default
+    try:
+        return parse(text)
+    except ValueError:
+        print(f"⚠ '{text}' is not a valid number, using the default ({default})")
+        return default
+
+def ask_advanced_options(scraper):
+    """Prompt for the speed/engine settings (the same ones as the command-line flags)"""
+    fast_input = input("\nTry HTTP fast path before opening the browser? (y/n, default: n): ").strip().lower()
+    discovery_input = input("\nDiscover listings via browser pages or search api (default: browser): ").strip().lower()
+    engine_input = input("\nDetail page engine - selenium or async (default: selenium): ").strip().lower()
+    detail_workers = ask_number("\nParallel browser workers for property pages (default: 1): ", 1)
+    phase_workers = ask_number("\nParallel phase workers in auto-phase mode (default: 1): ", 1)
+    pipeline_input = input("\nExtract/save in the background while the next page loads? (y/n, default: n): ").strip().lower()
+    incremental_input = input("\nOnly revisit new listings and ones whose price/status changed? (y/n, default: n): ").strip().lower()
+    
+    scraper.detail_workers = max(1, detail_workers)
+    scraper.phase_workers = max(1, phase_workers)
+    scraper.use_http_fast_path = fast_input == 'y'
+    scraper.use_pipeline = pipeline_input == 'y'
+    scraper.incremental = incremental_input == 'y'
+    scraper.detail_engine = 'async' if engine_input == 'async' else 'selenium'
+    scraper.discovery_mode = 'api' if discovery_input == 'api' else 'browser'
+
 class RedfinScraperComplete:
-    def __init__(self, excel_file="redfin_properties.xlsx"):
+    def __init__(self, excel_file="redfin_properties.xlsx", storage_backend="jsonl"):
         self.excel_file = excel_file
         self.driver = None
+        
+        # Append-only journal; the Excel file is only rebuilt at phase/run end
+        self.storage_backend = storage_backend
+        self.store = None
+        self.dedup = None
+        
+        # Background writer: group commit every save_batch_size records or
+        # save_flush_seconds, Excel export off the scraping thread (also every
+        # excel_export_seconds if set)
+        self.save_batch_size = 25
+        self.save_flush_seconds = 2.0
+        self.excel_export_seconds = None
+        self.writer = None
+        
+        # Extra outputs fed by the writer's commits: partitioned Parquet
+        # dataset (needs pyarrow) and SQLite listing store with history
+        self.parquet_dir = None
+        self.property_db = None
+        self.listings = None  # PropertyStore, shared with the writer as a sink
+        
+        # Incremental: known listings are only revisited when their homecard /
+        # search summary (price, status badge) differs from the stored one
+        self.incremental = False
+        self.listing_summaries = {}  # url -> summary, stored once the visit is done
+        self.refresh_urls = set()  # Known listings whose summary changed
+        
+        # Parallel detail extraction (1 = original one-tab-at-a-time flow)
+        self.detail_workers = 1
+        
+        # Pipeline: listing pages are discovered on self.driver while
+        # detail_workers extract and a writer thread saves in the background
+        self.use_pipeline = False
+        self.pipeline = None
+        
+        # Adaptive per-host pacing shared by all workers: starts at
+        # requests_per_second and moves between the min and max with feedback
+        self.requests_per_second = 1.0
+        self.min_requests_per_second = 0.2
+        self.max_requests_per_second = 4.0
+        self.rate_limiter = None
+        self.rate_bucket = None  # SharedRateBucket handed to phase workers
+        self.detail_pool = None
+        
+        # Detail-page engine: 'selenium' (tabs in self.driver) or 'async'
+        # (many concurrent tabs over CDP through Playwright)
+        self.detail_engine = 'selenium'
+        self.async_concurrency = 8
+        self.async_runner = None
+        
+        # Listing discovery: 'browser' pages through home cards, 'api' reads
+        # the CSV search endpoint for the filter and price window
+        self.discovery_mode = 'browser'
+        self.discovery_batch_size = 40
+        
+        # Browser-free fast path; Selenium is only used when a field is missing
+        self.use_http_fast_path = False
+        self.http_extractor = None
+        
+        # Browser lifecycle: headless mode, one reusable detail tab per browser,
+        # and a restart every max_pages_per_browser pages to cap memory growth
+        self.headless = False
+        self.max_pages_per_browser = 150
+        self.pages_since_restart = 0
+        self.detail_handle = None
+        self.driver_factory = None
+        self.remote_debugging_port = 9222
+        
+        # Request blocking (names from browser.BLOCK_PRESETS; [] disables it)
+        self.block_presets = list(DEFAULT_BLOCK_PRESETS)
+        self.resource_stats = ResourceStats(self.block_presets)
+        
+        # Measured durations of every condition-based wait
+        self.wait_stats = WaitStats()
+        
+        # Per-stage timings (p50/p95/p99), written to metrics_file at run end
+        # (default <excel name>.metrics.json; .prom for a Prometheus textfile)
+        self.metrics = RunMetrics(self.wait_stats)
+        self.metrics_file = None
+        self.metrics_port = None  # Serve live /metrics on this port
         self.base_url = "https://www.redfin.com/county/1974/NY/Nassau-County"
         self.properties_saved_count = 0
         self.start_element = 1
@@ -27,6 +174,14 @@ class RedfinScraperComplete:
         self.price_step = 50000  # $50k adjustment step
         self.target_max_results = 369  # Maximum we can scrape per phase
         self.target_min_results = 200  # Minimum to avoid too many phases
+        self.phase_planning = 'histogram'  # 'histogram' plans all phases up front, 'binary' is the old search
+        self.phase_workers = 1  # >1 scrapes planned phases in parallel processes
+        self.result_queue = None  # Set in phase worker processes; the parent saves
+        
+        # Result counts of probed price windows, reused across runs
+        self.probe_cache_file = DEFAULT_CACHE_FILE
+        self.probe_cache_ttl_days = 10
+        self.probe_cache = None
         
         # Phase tracking
         self.current_phase = 0
@@ -39,40 +194,204 @@ class RedfinScraperComplete:
         self.continue_after_manual = False
         self.manual_range_max = None
         
+        # Unattended runs (--config/--url) skip every prompt
+        self.interactive = True
+        self.auto_phases_setting = 'auto'  # True, False or 'auto' (> target_max_results)
+        
+        # Checkpoint rewritten per committed batch, every CHECKPOINT_EVERY
+        # other visits and at page/phase end; --resume continues from it
+        self.checkpoint = Checkpoint(checkpoint_path_for(excel_file))
+        self.visits_since_checkpoint = 0
+        self.resume = False
+        self.phase_plan = None
+        self.page_url = None
+        self.processed_urls = set()  # Done on the current page (normal) or phase (auto)
+        self._checkpoint_lock = threading.Lock()  # The writer thread checkpoints too
+        
     def kill_chrome_processes(self):
         """Kill any existing Chrome/ChromeDriver processes"""
         try:
-            subprocess.run(['taskkill', '/F', '/IM', 'chromedriver.exe'], 
-                         stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+            if sys.platform.startswith('win'):
+                subprocess.run(['taskkill', '/F', '/IM', 'chromedriver.exe'], 
+                             stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+            else:
+                # chromedriver plus the Chrome instances it launched (they all
+                # carry --test-type=webdriver, so a user's own browser survives)
+                subprocess.run(['pkill', '-f', 'chromedriver'],
+                             stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+                subprocess.run(['pkill', '-f', '--', '--test-type=webdriver'],
+                             stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
             time.sleep(1)
             print("Closed existing ChromeDriver processes")
         except:
             pass
         
+    def new_driver(self):
+        """Create a driver through driver_factory (or the default settings)"""
+        if self.driver_factory is not None:
+            return self.driver_factory()
+        return create_chrome_driver(headless=self.headless, block_presets=self.block_presets,
+                                    remote_debugging_port=self.remote_debugging_port)
+    
     def setup_driver(self):
         """Initialize Chrome driver"""
-        chrome_options = Options()
-        chrome_options.add_argument('--start-maximized')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--no-first-run')
-        chrome_options.add_argument('--no-service-autorun')
-        chrome_options.add_argument('--password-store=basic')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--remote-debugging-port=9222')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
+        with self.metrics.time('driver_startup'):
+            self.driver = self.new_driver()
         self.wait = WebDriverWait(self.driver, 20)
-        
-        self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.detail_handle = None
+        self.pages_since_restart = 0
         
         print("Browser opened")
         
+    def restart_driver(self):
+        """Restart the browser to release memory, returning to the same listing page"""
+        listing_url = None
+        try:
+            self.driver.switch_to.window(self.driver.window_handles[0])
+            listing_url = self.driver.current_url
+        except Exception:
+            pass
+        
+        print(f"\n♻ Restarting browser after {self.pages_since_restart} pages...")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.setup_driver()
+        
+        if listing_url and listing_url.startswith('http'):
+            self.driver.get(listing_url)
+            self.wait_until(homecards_rendered, 'homecards')
+    
+    def open_detail_tab(self):
+        """Switch to the reusable detail tab, creating it on first use"""
+        if self.detail_handle not in self.driver.window_handles:
+            # Open a blank tab first: CDP request blocking is per tab, so it
+            # has to be applied before any property page loads in it
+            handle_count = len(self.driver.window_handles)
+            self.driver.execute_script("window.open('about:blank', '_blank');")
+            self.wait_until(new_tab_opened(handle_count), 'new_tab')
+            self.detail_handle = self.driver.window_handles[-1]
+            self.driver.switch_to.window(self.detail_handle)
+            apply_resource_blocking(self.driver, self.block_presets)
+        else:
+            self.driver.switch_to.window(self.detail_handle)
+    
+    def make_detail_worker(self):
+        """Build an independent headless scraper used by a detail worker"""
+        worker = RedfinScraperComplete(excel_file=self.excel_file, storage_backend=self.storage_backend)
+        worker.driver_factory = lambda: create_chrome_driver(
+            headless=True, remote_debugging_port=None, block_presets=self.block_presets)
+        worker.max_pages_per_browser = self.max_pages_per_browser
+        worker.rate_limiter = self.get_rate_limiter()
+        worker.wait_stats = self.wait_stats
+        worker.metrics = self.metrics
+        worker.driver = worker.new_driver()
+        worker.resource_stats = self.resource_stats
+        worker.use_http_fast_path = self.use_http_fast_path
+        worker.http_extractor = self.http_extractor
+        return worker
+    
+    def get_detail_pool(self):
+        """Start the detail worker pool on first use"""
+        if self.detail_pool is None:
+            self.detail_pool = DetailWorkerPool(self.make_detail_worker, workers=self.detail_workers)
+            self.detail_pool.start()
+        return self.detail_pool
+    
+    def pipeline_active(self):
+        """True if property URLs go through the background pipeline"""
+        return self.use_pipeline and self.detail_engine != 'async'
+    
+    def get_pipeline(self):
+        """Start the discovery -> extraction -> writer pipeline on first use"""
+        if self.pipeline is None:
+            self.pipeline = ScrapePipeline(self.make_detail_worker, self.save_property_batch,
+                                           workers=self.detail_workers, metrics=self.metrics)
+            self.pipeline.start()
+        return self.pipeline
+    
+    def drain_pipeline(self):
+        """Wait for every queued property to be extracted and saved"""
+        if self.pipeline is not None:
+            with self.metrics.time('pipeline_drain'):
+                self.pipeline.drain()
+    
+    def pipeline_saved(self):
+        """Oil properties the pipeline's writer has saved so far (read after drain_pipeline)"""
+        return self.pipeline.saved if self.pipeline is not None else 0
+    
+    def stop_pipeline(self, discard_pending=False):
+        """Finish (or drop) queued pipeline work and stop its threads"""
+        if self.pipeline is None:
+            return
+        print("\n→ Stopping pipeline...")
+        pipeline, self.pipeline = self.pipeline, None
+        pipeline.close(discard_pending=discard_pending)
+        pipeline.report()
+    
+    def get_rate_limiter(self):
+        """Create the shared adaptive rate limiter on first use"""
+        if self.rate_limiter is None:
+            self.rate_limiter = AdaptiveRateLimiter(rate=self.requests_per_second,
+                                                    min_rate=self.min_requests_per_second,
+                                                    max_rate=self.max_requests_per_second)
+        return self.rate_limiter
+    
+    def use_shared_rate_bucket(self, bucket):
+        """Draw from a rate bucket shared with other processes (phase/scheduler workers)"""
+        limiter = AdaptiveRateLimiter(rate=self.requests_per_second,
+                                      min_rate=self.min_requests_per_second,
+                                      max_rate=self.max_requests_per_second,
+                                      shared=bucket)
+        if self.rate_limiter is not None:
+            limiter.counts = self.rate_limiter.counts
+            limiter.backoff_seconds = self.rate_limiter.backoff_seconds
+        self.rate_limiter = limiter
+    
+    def shared_rate_bucket(self, context):
+        """Bucket this process shares with the worker processes it starts"""
+        if self.rate_bucket is None:
+            self.rate_bucket = SharedRateBucket(self.requests_per_second, context=context)
+            self.use_shared_rate_bucket(self.rate_bucket)
+        return self.rate_bucket
+    
+    def page_throttled(self):
+        """True if the current page is a block/captcha page"""
+        try:
+            text = self.driver.execute_script(
+                "return document.title + ' ' + (document.body ? document.body.innerText.slice(0, 3000) : '')")
+            return looks_throttled(text)
+        except Exception:
+            return False
+    
+    def record_page_load(self, url, started, loaded):
+        """Report a listing/probe page load to the rate limiter"""
+        if loaded:
+            self.get_rate_limiter().record(url, time.monotonic() - started, 'ok')
+        else:
+            self.get_rate_limiter().record(url, outcome='throttled' if self.page_throttled() else 'error')
+    
+    def get_async_runner(self):
+        """Start the async CDP engine on first use (Playwright is optional)"""
+        if self.async_runner is None:
+            from async_engine import AsyncEngineRunner
+            self.async_runner = AsyncEngineRunner(concurrency=self.async_concurrency,
+                                                  wait_stats=self.wait_stats,
+                                                  resource_stats=self.resource_stats,
+                                                  rate_limiter=self.get_rate_limiter())
+        return self.async_runner
+    
+    def close(self):
+        """Quit this scraper's browser"""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+        
+    def wait_until(self, predicate, label, timeout=None):
+        """Wait for a readiness predicate within its budget (None on timeout)"""
+        return wait_for(self.driver, predicate, label, timeout=timeout, stats=self.wait_stats)
+    
     def start_and_wait_for_user(self):
         """Open browser and let user apply filters manually"""
         print("\n" + "="*60)
@@ -97,7 +416,7 @@ class RedfinScraperComplete:
         input("\nPress ENTER when you have applied all filters and can see the property listings...")
         
         # Check how many results we have
-        time.sleep(2)
+        self.wait_until(results_count_present, 'results_count')
         total_results = self.get_results_count()
         
         print(f"\n📊 Total results found: {total_results} homes")
@@ -144,24 +463,15 @@ class RedfinScraperComplete:
                 print()
                 
                 # Ask for min price
-                min_input = input("Enter minimum price (e.g., 50k, 500k, 1m) [default: 50k]: ").strip().lower()
-                if min_input:
-                    if 'm' in min_input:
-                        self.min_price = int(float(min_input.replace('m', '')) * 1000000)
-                    elif 'k' in min_input:
-                        self.min_price = int(float(min_input.replace('k', '')) * 1000)
-                    else:
-                        self.min_price = int(min_input)
+                self.min_price = ask_number("Enter minimum price (e.g., 50k, 500k, 1m) [default: 50k]: ",
+                                            self.min_price, parse_price)
                 
                 # Ask for max price
-                max_input = input("Enter maximum price (e.g., 450k, 1m, 5m) [default: 10m]: ").strip().lower()
-                if max_input:
-                    if 'm' in max_input:
-                        self.max_price = int(float(max_input.replace('m', '')) * 1000000)
-                    elif 'k' in max_input:
-                        self.max_price = int(float(max_input.replace('k', '')) * 1000)
-                    else:
-                        self.max_price = int(max_input)
+                self.max_price = ask_number("Enter maximum price (e.g., 450k, 1m, 5m) [default: 10m]: ",
+                                            self.max_price, parse_price)
+                if self.max_price <= self.min_price:
+                    self.max_price = max(10000000, self.min_price + self.price_step)
+                    print(f"⚠ Maximum price must be above the minimum, using ${self.format_price_for_url(self.max_price)}")
                 
                 print(f"\n✓ Price range set: ${self.format_price_for_url(self.min_price)} - ${self.format_price_for_url(self.max_price)}")
                 
@@ -174,7 +484,7 @@ class RedfinScraperComplete:
                 print(f"\n→ Testing your price range...")
                 url = self.build_url_with_price_range(self.min_price, self.max_price)
                 self.driver.get(url)
-                time.sleep(3)
+                self.wait_until(results_count_present, 'results_count')
                 
                 range_results = self.get_results_count()
                 print(f"   ${self.format_price_for_url(self.min_price)}-${self.format_price_for_url(self.max_price)} = {range_results} homes")
@@ -219,8 +529,7 @@ class RedfinScraperComplete:
         print("STARTING POSITION:")
         print("-"*60)
         
-        start_page_input = input("What page should we start from? (default: 1): ").strip()
-        self.current_page_num = int(start_page_input) if start_page_input else 1
+        self.current_page_num = max(1, ask_number("What page should we start from? (default: 1): ", 1))
         
         # Navigate to starting page if needed
         if self.current_page_num > 1:
@@ -233,17 +542,13 @@ class RedfinScraperComplete:
                 new_url = f"{current_url}/page-{self.current_page_num}"
             
             self.driver.get(new_url)
-            time.sleep(3)
             print(f"✓ On page {self.current_page_num}")
         
         # Wait for page to fully load and count ACTUAL elements
-        time.sleep(2)
         total_elements = 0
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.bp-Homecard'))
-            )
-            time.sleep(1)
+            if not self.wait_until(homecards_rendered, 'homecards'):
+                raise TimeoutException("Home cards did not render")
             
             property_links = self.driver.find_elements(By.CSS_SELECTOR, 'a.bp-Homecard__Address')
             property_urls = [link.get_attribute('href') for link in property_links if link.get_attribute('href')]
@@ -256,11 +561,9 @@ class RedfinScraperComplete:
         
         # Ask which element to start from
         if total_elements > 0:
-            start_element_input = input(f"Which property should we start from? (1-{total_elements}, default: 1): ").strip()
+            self.start_element = ask_number(f"Which property should we start from? (1-{total_elements}, default: 1): ", 1)
         else:
-            start_element_input = input(f"Which property should we start from? (default: 1): ").strip()
-            
-        self.start_element = int(start_element_input) if start_element_input else 1
+            self.start_element = ask_number(f"Which property should we start from? (default: 1): ", 1)
         
         if self.start_element < 1:
             self.start_element = 1
@@ -277,6 +580,41 @@ class RedfinScraperComplete:
         print("STARTING SCRAPING...")
         print("="*60 + "\n")
     
+    def apply_settings(self, settings):
+        """Apply resolved CLI/config settings (see run_config.CONFIG_KEYS)"""
+        for name, value in settings.items():
+            if name == 'auto_phases':
+                self.auto_phases_setting = value
+            elif name != 'excel_file':
+                setattr(self, name, value)
+        self.interactive = False
+        # Several configured runs may share the machine: no fixed debugging port
+        self.remote_debugging_port = None
+    
+    def start_unattended(self):
+        """Open the configured filter and choose the mode without prompts"""
+        print("\n" + "="*60)
+        print("REDFIN SCRAPER - CONFIGURED RUN")
+        print("="*60)
+        print(f"Region: {self.base_url}")
+        print(f"Filter: {self.base_filter or '(none)'}")
+        print(f"Price range: ${self.format_price_for_url(self.min_price)} - ${self.format_price_for_url(self.max_price)}")
+        
+        self.driver.get(self.build_url_with_price_range(self.min_price, self.max_price))
+        self.wait_until(results_count_present, 'results_count')
+        total_results = self.get_results_count()
+        print(f"\n📊 Total results found: {total_results} homes")
+        
+        if self.auto_phases_setting == 'auto':
+            self.use_auto_phases = total_results > self.target_max_results
+        else:
+            self.use_auto_phases = bool(self.auto_phases_setting)
+        print(f"✓ Mode: {'automatic phases' if self.use_auto_phases else 'normal'}")
+        
+        print("\n" + "="*60)
+        print("STARTING SCRAPING...")
+        print("="*60 + "\n")
+    
     def get_results_count(self):
         """Extract number of homes from page"""
         try:
@@ -324,17 +662,59 @@ class RedfinScraperComplete:
         url = f"{self.base_url}/filter/{full_filter}"
         return url
     
+    def get_probe_cache(self):
+        """Open the probe count cache on first use"""
+        if self.probe_cache is None:
+            self.probe_cache = ProbeCountCache(self.probe_cache_file, ttl_days=self.probe_cache_ttl_days)
+        return self.probe_cache
+    
+    def probe_results_count(self, min_price, max_price, label=""):
+        """Result count for a price window: probe cache first, then a page load"""
+        cache = self.get_probe_cache()
+        scope = ProbeCountCache.scope_for(self.base_url, self.base_filter)
+        window = f"${self.format_price_for_url(min_price)}-${self.format_price_for_url(max_price)}"
+        
+        results = cache.lookup(scope, min_price, max_price)
+        if results is not None:
+            print(f"   {label}{window} = {results} homes (cached)")
+            return results
+        
+        url = self.build_url_with_price_range(min_price, max_price)
+        self.get_rate_limiter().acquire(url)
+        started = time.monotonic()
+        self.driver.get(url)
+        loaded = self.wait_until(results_count_present, 'results_count')
+        self.record_page_load(url, started, loaded)
+        self.metrics.observe('probe', time.monotonic() - started)
+        self.metrics.count('probes')
+        
+        results = self.get_results_count()
+        print(f"   {label}{window} = {results} homes")
+        if results > 0:
+            # 0 also comes back when the count element never rendered
+            cache.put(scope, min_price, max_price, results)
+        return results
+    
+    def plan_price_phases(self, min_price, max_price):
+        """Compute every phase boundary up front from a cumulative count curve"""
+        print(f"\n→ Planning phases for ${self.format_price_for_url(min_price)}-${self.format_price_for_url(max_price)}...")
+        planner = PricePlanner(self.probe_results_count, min_price, max_price,
+                               target_max=self.target_max_results, step=self.price_step)
+        scope = ProbeCountCache.scope_for(self.base_url, self.base_filter)
+        planner.seed(self.get_probe_cache().curve(scope, min_price))
+        phases = planner.plan()
+        
+        print(f"   ✓ {len(phases)} phases planned with {planner.probes} probes:")
+        for i, (phase_min, phase_max, count) in enumerate(phases, 1):
+            print(f"      {i}. ${self.format_price_for_url(phase_min)}-${self.format_price_for_url(phase_max)} (~{count} homes)")
+        return phases
+    
     def find_optimal_price_range(self, start_min, start_max):
         """Find optimal price range using smart binary search"""
         print(f"\n→ Finding optimal range starting from ${self.format_price_for_url(start_min)}-${self.format_price_for_url(start_max)}...")
         
         # First check the full range
-        url = self.build_url_with_price_range(start_min, start_max)
-        self.driver.get(url)
-        time.sleep(3)
-        
-        results = self.get_results_count()
-        print(f"   ${self.format_price_for_url(start_min)}-${self.format_price_for_url(start_max)} = {results} homes")
+        results = self.probe_results_count(start_min, start_max)
         
         if results == 0:
             print(f"   ✗ No results, price range exhausted")
@@ -374,12 +754,7 @@ class RedfinScraperComplete:
                 mid_max = start_min + 50000
             
             # Test this range
-            url = self.build_url_with_price_range(start_min, mid_max)
-            self.driver.get(url)
-            time.sleep(3)
-            
-            results = self.get_results_count()
-            print(f"   [{iteration}] ${self.format_price_for_url(start_min)}-${self.format_price_for_url(mid_max)} = {results} homes")
+            results = self.probe_results_count(start_min, mid_max, label=f"[{iteration}] ")
             
             if results <= self.target_max_results and results >= self.target_min_results:
                 # Found optimal range
@@ -403,12 +778,7 @@ class RedfinScraperComplete:
             # Try expanding a bit
             test_max = best_max + 100000
             if test_max <= start_max:
-                url = self.build_url_with_price_range(start_min, test_max)
-                self.driver.get(url)
-                time.sleep(3)
-                
-                results = self.get_results_count()
-                print(f"   [expand] ${self.format_price_for_url(start_min)}-${self.format_price_for_url(test_max)} = {results} homes")
+                results = self.probe_results_count(start_min, test_max, label="[expand] ")
                 
                 if results <= self.target_max_results:
                     best_max = test_max
@@ -425,60 +795,103 @@ class RedfinScraperComplete:
         
         oil_count_phase = 0
         page_num = 1
+        saved_before = self.pipeline_saved()
         
-        # Navigate to first page of this phase
-        url = self.build_url_with_price_range(phase_min, phase_max)
-        self.driver.get(url)
-        time.sleep(3)
-        
-        while True:
-            print(f"\n→ Page {page_num} of Phase {self.current_phase}...")
-            
-            # Scrape current page
-            oil_count = self.scrape_current_page()
-            oil_count_phase += oil_count
-            
-            print(f"   Oil properties on this page: {oil_count}")
-            print(f"   Phase total so far: {oil_count_phase}")
-            
-            # Check for next page
-            if not self.has_next_page():
-                print(f"   ✓ No more pages in this phase")
-                break
+        if self.discovery_mode == 'api':
+            # No paging through home cards: the search endpoint lists the phase
+            oil_count_phase = self.scrape_via_search_api(phase_min, phase_max)
+        else:
+            # Navigate to first page of this phase
+            url = self.build_url_with_price_range(phase_min, phase_max)
+            self.get_rate_limiter().acquire(url)
+            self.driver.get(url)
             
-            # Go to next page automatically (no user prompt)
-            if not self.go_to_next_page():
-                print(f"   ✗ Failed to navigate to next page")
-                break
+            while True:
+                print(f"\n→ Page {page_num} of Phase {self.current_phase}...")
+                
+                # Scrape current page
+                oil_count = self.scrape_current_page()
+                oil_count_phase += oil_count
+                
+                if not self.pipeline_active():
+                    print(f"   Oil properties on this page: {oil_count}")
+                    print(f"   Phase total so far: {oil_count_phase}")
+                
+                # Check for next page
+                if not self.has_next_page():
+                    print(f"   ✓ No more pages in this phase")
+                    break
+                
+                # Go to next page automatically (no user prompt)
+                if not self.go_to_next_page():
+                    print(f"   ✗ Failed to navigate to next page")
+                    break
+                
+                page_num += 1
             
-            page_num += 1
-            time.sleep(2)
+            if self.pipeline_active():
+                # The phase is only complete once its last page is saved
+                self.drain_pipeline()
+                oil_count_phase = self.pipeline_saved() - saved_before
         
         print(f"\n✓ Phase {self.current_phase} complete:")
         print(f"   Price range: ${self.format_price_for_url(phase_min)} - ${self.format_price_for_url(phase_max)}")
         print(f"   Oil properties: {oil_count_phase}")
         
+        self.export_excel()
+        
         self.phases_completed.append({
             'phase': self.current_phase,
             'min_price': phase_min,
             'max_price': phase_max,
             'oil_count': oil_count_phase
         })
+        self.processed_urls.clear()
+        self.save_checkpoint()
         
         return oil_count_phase
     
-    def close_popup_if_exists(self):
-        """Close any popup that appears"""
-        try:
-            close_button = WebDriverWait(self.driver, 3).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.bp-CloseButton"))
-            )
-            close_button.click()
-            time.sleep(1)
-            print("✓ Popup closed")
-            return True
-        except:
-            return False
+    def extract_property(self, property_url):
+        """Extract a property (paced by the rate limiter) and report how it went"""
+        limiter = self.get_rate_limiter()
+        with self.metrics.time('rate_limit_wait'):
+            limiter.acquire(property_url)
+        started = time.monotonic()
+        
+        property_data = self.extract_property_once(property_url)
+        retry_after = property_data.pop('retry_after', None)
+        self.metrics.observe('property', time.monotonic() - started)
+        self.metrics.count('properties_extracted')
+        
+        error = property_data.get('error')
+        if not error:
+            limiter.record(property_url, time.monotonic() - started, 'ok')
+        elif error.startswith(THROTTLED_ERROR):
+            limiter.record(property_url, outcome='throttled', retry_after=retry_after)
+            self.metrics.count('throttled')
+        else:
+            limiter.record(property_url, outcome='error')
+            self.metrics.count('extract_errors')
+        return property_data
+    
+    def extract_property_once(self, property_url):
+        """Extract a property over plain HTTP, falling back to the browser"""
+        if self.use_http_fast_path:
+            if self.http_extractor is None:
+                self.http_extractor = HttpPropertyExtractor()
+            
+            with self.metrics.time('http_fetch'):
+                property_data, missing = self.http_extractor.extract(property_url)
+            if not missing:
+                print(f"  ⚡ HTTP: {property_data.get('full_address')} - Oil: {property_data['has_oil_heating']}")
+                return property_data
+            if property_data.get('error', '').startswith(THROTTLED_ERROR):
+                # The browser would only hit the same block page
+                print(f"  ⚠ {property_data['error']}")
+                return property_data
+            print(f"  ℹ HTTP fast path missing {', '.join(missing)} - using browser")
+        
+        return self.extract_property_details(property_url)
     
     def extract_property_details(self, property_url):
         """Extract detailed property information from property page"""
@@ -489,372 +902,47 @@ class RedfinScraperComplete:
         }
         
         try:
-            # Open in new tab with the URL directly
-            self.driver.execute_script(f"window.open('{property_url}', '_blank');")
-            time.sleep(2)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Navigate if not already on the page
-            if self.driver.current_url != property_url:
+            with self.metrics.time('navigation'):
+                # Reuse one detail tab per browser instead of a tab per property
+                self.open_detail_tab()
                 self.driver.get(property_url)
-                time.sleep(3)
-            
-            # Wait for page to load properly
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(2)
-            
-            # Close popup if exists
-            self.close_popup_if_exists()
-            
-            # Detect listing status dynamically from the banner
-            try:
-                status_banner = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div.ListingStatusBannerSection'))
-                )
-                banner_text = status_banner.text.upper()
-                
-                if 'SOLD' in banner_text:
-                    property_data['listing_status'] = 'sold'
-                    # Extract sold date
-                    if 'ON' in banner_text:
-                        sold_date = banner_text.split('ON')[1].strip()
-                        property_data['sold_date'] = sold_date
-                    else:
-                        property_data['sold_date'] = banner_text.replace('SOLD', '').strip()
-                    print(f"  ℹ Status: SOLD on {property_data['sold_date']}")
-                elif 'FOR SALE' in banner_text:
-                    property_data['listing_status'] = 'for-sale'
-                    property_data['sold_date'] = '-'
-                    print(f"  ℹ Status: FOR SALE")
-                else:
-                    property_data['listing_status'] = 'unknown'
-                    property_data['sold_date'] = '-'
-                    print(f"  ⚠ Status: Unknown ({banner_text})")
-                    
-            except Exception as e:
-                print(f"  ⚠ Could not detect listing status: {e}")
-                property_data['listing_status'] = 'unknown'
-                property_data['sold_date'] = '-'
-            
-            # Get address - try multiple selectors for both sold and for-sale
-            try:
-                # Method 1: Try the standard full address (works for SOLD)
-                try:
-                    address_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.full-address')
-                    full_address_text = address_elem.text.strip()
-                    
-                    # Parse the address - SOLD format: "25 Schooner Ln, Port Washington, NY 11050"
-                    if ',' in full_address_text:
-                        parts = [p.strip() for p in full_address_text.split(',')]
-                        
-                        if len(parts) >= 3:
-                            # Format: Street, City, State Zip
-                            property_data['street_address'] = parts[0]
-                            property_data['city'] = parts[1]
-                            
-                            # Parse "NY 11050"
-                            state_zip = parts[2].split()
-                            if len(state_zip) >= 2:
-                                property_data['state'] = state_zip[0]
-                                property_data['zip_code'] = state_zip[1]
-                            else:
-                                property_data['state'] = parts[2]
-                                property_data['zip_code'] = '-'
-                                
-                        elif len(parts) == 2:
-                            # Format: Street, City State Zip
-                            property_data['street_address'] = parts[0]
-                            
-                            # Parse "Port Washington NY 11050"
-                            remainder = parts[1].split()
-                            if len(remainder) >= 3:
-                                property_data['zip_code'] = remainder[-1]
-                                property_data['state'] = remainder[-2]
-                                property_data['city'] = ' '.join(remainder[:-2])
-                            elif len(remainder) == 2:
-                                property_data['state'] = remainder[0]
-                                property_data['zip_code'] = remainder[1]
-                                property_data['city'] = '-'
-                            else:
-                                property_data['city'] = parts[1]
-                                property_data['state'] = '-'
-                                property_data['zip_code'] = '-'
-                        else:
-                            property_data['street_address'] = parts[0]
-                            property_data['city'] = '-'
-                            property_data['state'] = '-'
-                            property_data['zip_code'] = '-'
-                    else:
-                        # Single line address
-                        property_data['street_address'] = full_address_text
-                        property_data['city'] = '-'
-                        property_data['state'] = '-'
-                        property_data['zip_code'] = '-'
-                    
-                    property_data['full_address'] = full_address_text
-                    print(f"  ✓ Address: {property_data['full_address']}")
-                    
-                except:
-                    # Method 2: For FOR SALE properties with different structure
-                    try:
-                        # Try street-address class specifically
-                        street_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.street-address')
-                        full_address_text = street_elem.text.strip()
-                        
-                        # Parse: "166 N Oak St, Massapequa, NY 11758"
-                        if ',' in full_address_text:
-                            parts = [p.strip() for p in full_address_text.split(',')]
-                            
-                            if len(parts) >= 3:
-                                # Street, City, State ZIP
-                                property_data['street_address'] = parts[0]
-                                property_data['city'] = parts[1]
-                                
-                                # Parse "NY 11758"
-                                state_zip = parts[2].split()
-                                if len(state_zip) >= 2:
-                                    property_data['state'] = state_zip[0]
-                                    property_data['zip_code'] = state_zip[1]
-                                else:
-                                    property_data['state'] = parts[2]
-                                    property_data['zip_code'] = '-'
-                            elif len(parts) == 2:
-                                property_data['street_address'] = parts[0]
-                                # Try to parse city, state, zip from second part
-                                remainder = parts[1].split()
-                                if len(remainder) >= 2:
-                                    property_data['zip_code'] = remainder[-1]
-                                    property_data['state'] = remainder[-2]
-                                    property_data['city'] = ' '.join(remainder[:-2])
-                                else:
-                                    property_data['city'] = parts[1]
-                                    property_data['state'] = '-'
-                                    property_data['zip_code'] = '-'
-                            else:
-                                property_data['street_address'] = parts[0]
-                                property_data['city'] = '-'
-                                property_data['state'] = '-'
-                                property_data['zip_code'] = '-'
-                        else:
-                            property_data['street_address'] = full_address_text
-                            property_data['city'] = '-'
-                            property_data['state'] = '-'
-                            property_data['zip_code'] = '-'
-                        
-                        property_data['full_address'] = full_address_text
-                        print(f"  ✓ Address: {property_data['full_address']}")
-                        
-                    except Exception as e2:
-                        print(f"  ⚠ Both address methods failed: {e2}")
-                        property_data['street_address'] = '-'
-                        property_data['city'] = '-'
-                        property_data['state'] = '-'
-                        property_data['zip_code'] = '-'
-                        property_data['full_address'] = '-'
-                        
-            except Exception as e:
-                print(f"  ⚠ Error extracting address: {e}")
-                property_data['street_address'] = '-'
-                property_data['city'] = '-'
-                property_data['state'] = '-'
-                property_data['zip_code'] = '-'
-                property_data['full_address'] = '-'
-            
-            # Get price
-            try:
-                price_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.statsValue')
-                property_data['price'] = price_elem.text.strip()
-            except:
-                try:
-                    price_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.price')
-                    property_data['price'] = price_elem.text.strip()
-                except:
-                    property_data['price'] = '-'
-            
-            # Get beds
-            try:
-                beds_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.beds-section .statsValue')
-                property_data['beds'] = beds_elem.text.strip()
-            except:
-                property_data['beds'] = '-'
-            
-            # Get baths
-            try:
-                baths_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.baths-section .statsValue')
-                property_data['baths'] = baths_elem.text.strip()
-            except:
-                property_data['baths'] = '-'
-            
-            # Get sqft
-            try:
-                sqft_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.sqft-section .statsValue')
-                property_data['sqft'] = sqft_elem.text.strip()
-            except:
-                property_data['sqft'] = '-'
-            
-            # Get property type
-            try:
-                # Look for property type in key details
-                prop_type_elem = self.driver.find_element(By.XPATH, '//span[text()="Property Type"]/preceding-sibling::span[@class="valueText"]')
-                property_data['property_type'] = prop_type_elem.text.strip()
-            except:
-                property_data['property_type'] = '-'
-            
-            # Scroll down to find Interior section
-            try:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(1)
-            except:
-                pass
-            
-            # Find and click Interior section
-            property_data['has_oil_heating'] = 'No'
-            property_data['heating_type'] = '-'
-            property_data['cooling_type'] = '-'
-            
-            try:
-                # Scroll to property details section first
-                try:
-                    details_section = self.driver.find_element(By.ID, 'property-details-scroll')
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'start'});", details_section)
-                    time.sleep(1.5)
-                except:
-                    pass
                 
-                # Find the clickable Interior header
-                interior_header = None
-                
-                try:
-                    interior_header = self.driver.find_element(By.XPATH, 
-                        '//svg[contains(@class, "lightbulb-shine")]/ancestor::div[@class="sectionHeaderContainer"]')
-                    print("  ✓ Found Interior header (lightbulb)")
-                except:
-                    try:
-                        interior_header = self.driver.find_element(By.XPATH, 
-                            '//h3[contains(., "Interior")]/ancestor::div[@class="sectionHeaderContainer"]')
-                        print("  ✓ Found Interior header (h3)")
-                    except Exception as e:
-                        print(f"  ✗ Could not find Interior header: {e}")
-                
-                if interior_header:
-                    # Scroll to it
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", interior_header)
-                    time.sleep(1)
-                    
-                    # Check if collapsed
-                    parent_expandable = interior_header.find_element(By.XPATH, './ancestor::div[contains(@class, "expandableSection")]')
-                    parent_classes = parent_expandable.get_attribute('class')
-                    
-                    print(f"  ℹ Parent classes: {parent_classes}")
-                    
-                    # ALWAYS CLICK regardless of state - it might be showing wrong state
-                    print("  → Force clicking Interior section...")
-                    try:
-                        interior_header.click()
-                        time.sleep(3)
-                        print("  ✓ Clicked Interior section")
-                    except Exception as e:
-                        print(f"  ⚠ Click failed, trying JavaScript click: {e}")
-                        self.driver.execute_script("arguments[0].click();", interior_header)
-                        time.sleep(3)
-                        print("  ✓ JavaScript clicked Interior section")
-                    
-                    # Wait for content
-                    time.sleep(2)
-                    
-                    # Debug: Check if "Heating" text exists anywhere on page
-                    page_source = self.driver.page_source
-                    page_text = self.driver.find_element(By.TAG_NAME, 'body').text
-                    
-                    print(f"  ℹ 'Heating' in page source: {'Heating' in page_source}")
-                    print(f"  ℹ 'Heating:' in page text: {'Heating:' in page_text}")
-                    print(f"  ℹ 'Cooling' in page source: {'Cooling' in page_source}")
-                    
-                    # Try to find heating section in HTML
-                    heating_found = False
-                    
-                    # Method 1: Direct HTML search
-                    if 'Heating:' in page_source or 'Heating &amp;' in page_source:
-                        print("  ℹ Found Heating in HTML source")
-                        
-                        # Try to get all li elements with entryItem class
-                        try:
-                            all_items = self.driver.find_elements(By.CSS_SELECTOR, 'li.entryItem')
-                            print(f"  ℹ Found {len(all_items)} li.entryItem elements")
-                            
-                            for item in all_items:
-                                item_text = item.text
-                                
-                                if 'Heating:' in item_text or 'Heating :' in item_text:
-                                    print(f"  ✓ Found heating item: {item_text}")
-                                    heating_text = item_text.split('Heating')[1].replace(':', '').strip()
-                                    
-                                    if heating_text:
-                                        property_data['heating_type'] = heating_text
-                                        heating_found = True
-                                        
-                                        # Check for Oil (case insensitive)
-                                        if 'oil' in heating_text.lower():
-                                            property_data['has_oil_heating'] = 'Yes'
-                                            print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                        else:
-                                            print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                        break
-                                        
-                                if 'Cooling:' in item_text or 'Cooling :' in item_text:
-                                    cooling_text = item_text.split('Cooling')[1].replace(':', '').strip()
-                                    if cooling_text:
-                                        property_data['cooling_type'] = cooling_text
-                        except Exception as e:
-                            print(f"  ⚠ Error iterating items: {e}")
-                    
-                    # Method 2: Text-based fallback
-                    if not heating_found and 'Heating:' in page_text:
-                        print("  ℹ Trying text-based extraction...")
-                        lines = page_text.split('\n')
-                        for i, line in enumerate(lines):
-                            if 'Heating:' in line:
-                                heating_text = line.replace('Heating:', '').strip()
-                                
-                                if not heating_text and i + 1 < len(lines):
-                                    heating_text = lines[i + 1].strip()
-                                
-                                if heating_text:
-                                    property_data['heating_type'] = heating_text
-                                    heating_found = True
-                                    
-                                    if 'oil' in heating_text.lower():
-                                        property_data['has_oil_heating'] = 'Yes'
-                                        print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                    else:
-                                        print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                    break
-                    
-                    if not heating_found:
-                        print("  ⚠ Could not extract heating information after all methods")
-                        
-                else:
+                # Wait for page to load properly
+                self.wait_until(document_ready, 'document_ready')
+            
+            # Listing banner is server-rendered; wait for it before reading
+            if not self.wait_until(element_present('div.ListingStatusBannerSection'), 'listing_status'):
+                if self.page_throttled():
+                    raise Exception(THROTTLED_ERROR)
+                print("  ⚠ Listing status banner not found")
+            
+            # Close popup and expand Interior in one round-trip
+            with self.metrics.time('popup_and_interior'):
+                expand_result = expand_interior(self.driver)
+                if expand_result == 'clicked':
+                    if not self.wait_until(interior_entries_present, 'interior_entries'):
+                        print("  ⚠ Interior entries did not appear within budget")
+                elif expand_result is None:
                     print("  ⚠ Interior section not found on page")
-                    
-            except Exception as e:
-                print(f"  ⚠ Error accessing Interior section: {e}")
-                import traceback
-                traceback.print_exc()
             
-            # Get listing agent info
-            try:
-                listing_agent = self.driver.find_element(By.XPATH, '//span[contains(text(), "Listing by")]/span').text
-                property_data['listing_agent'] = listing_agent
-            except:
-                property_data['listing_agent'] = '-'
+            # Read every field in one round-trip and parse it in Python
+            with self.metrics.time('field_extraction'):
+                parse_snapshot(take_snapshot(self.driver), property_data)
             
-            try:
-                broker = self.driver.find_element(By.CSS_SELECTOR, 'span.agent-basic-details--broker').text
-                property_data['broker'] = broker.replace('•', '').strip()
-            except:
-                property_data['broker'] = '-'
+            if property_data['listing_status'] == 'sold':
+                print(f"  ℹ Status: SOLD on {property_data['sold_date']}")
+            elif property_data['listing_status'] == 'for-sale':
+                print(f"  ℹ Status: FOR SALE")
+            else:
+                print(f"  ⚠ Status: Unknown")
+            print(f"  ✓ Address: {property_data['full_address']}")
+            
+            if property_data['has_oil_heating'] == 'Yes':
+                print(f"  🔥 OIL HEATING FOUND: {property_data['heating_type']}")
+            elif property_data['heating_type'] != '-':
+                print(f"  ℹ Heating type: {property_data['heating_type']} (No oil)")
+            else:
+                print("  ⚠ Could not extract heating information")
             
             print(f"  ✓ Extracted: {property_data.get('street_address', 'Unknown')} - Oil: {property_data['has_oil_heating']}")
             
@@ -867,24 +955,101 @@ class RedfinScraperComplete:
             property_data['error'] = f"Browser error: {str(outer_e)}"
         
         finally:
-            # Safely close tab and switch back
+            # Count loaded/blocked requests for this page
+            self.resource_stats.collect(self.driver)
+            
+            # Keep the detail tab open for the next property; switch back
             try:
-                # Check if we have multiple windows before closing
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-                    time.sleep(1)
-            except Exception as close_error:
-                print(f"  ⚠ Error closing tab: {close_error}")
-                # Try to recover by switching to first window
+                self.driver.switch_to.window(self.driver.window_handles[0])
+            except Exception as switch_error:
+                print(f"  ⚠ Error switching back to listing tab: {switch_error}")
+                # The detail tab is recreated on the next property
+                self.detail_handle = None
+            
+            # Recycle the browser periodically to contain memory growth
+            self.pages_since_restart += 1
+            if self.max_pages_per_browser and self.pages_since_restart >= self.max_pages_per_browser:
                 try:
-                    if len(self.driver.window_handles) > 0:
-                        self.driver.switch_to.window(self.driver.window_handles[0])
-                except:
-                    pass
+                    self.restart_driver()
+                except Exception as restart_error:
+                    print(f"  ⚠ Browser restart failed: {restart_error}")
         
         return property_data
     
+    def open_store(self):
+        """Open the append-only journal for this run"""
+        if self.store is None:
+            self.store = open_store(self.excel_file, self.storage_backend)
+            print(f"✓ Journal: {self.store.path}")
+        return self.store
+    
+    def get_writer(self):
+        """Start the background journal writer on first use"""
+        if self.writer is None:
+            self.writer = BatchedWriter(self.open_store(), self.excel_file,
+                                        batch_size=self.save_batch_size,
+                                        flush_seconds=self.save_flush_seconds,
+                                        export_seconds=self.excel_export_seconds,
+                                        on_commit=self.records_committed, metrics=self.metrics,
+                                        # Refreshed listings replace their older Excel row
+                                        export_options={'keep': 'last'} if self.tracks_changes() else None,
+                                        sinks=open_sinks(self.base_url, self.parquet_dir))
+            if self.property_db_path():
+                self.writer.sinks.append(self.get_listings())
+        return self.writer
+    
+    def property_db_path(self):
+        """property_db, or one next to the Excel file in incremental mode"""
+        if self.property_db:
+            return self.property_db
+        if self.incremental:
+            return os.path.splitext(self.excel_file)[0] + '.properties.db'
+        return None
+    
+    def tracks_changes(self):
+        """Known listings get the price/status check instead of a plain dedup skip
+        
+        On whenever a property store is in use, so its history fills without
+        --incremental too.
+        """
+        return self.property_db_path() is not None
+    
+    def get_listings(self):
+        """Open the property store on first use"""
+        if self.listings is None:
+            self.listings = PropertyStore(self.property_db_path(), source=self.base_url)
+            print(f"✓ Property history: {self.listings.path}")
+        return self.listings
+    
+    def flush_writer(self):
+        """Wait until every saved property is committed to the journal"""
+        if self.writer is not None:
+            self.writer.flush()
+    
+    def export_excel(self):
+        """Commit the journal, then rebuild the Excel file in the background"""
+        if self.store is None:
+            return
+        self.get_writer().flush()
+        self.writer.request_export()
+    
+    def close_writer(self):
+        """Final journal flush and Excel export, then close the journal"""
+        if self.store is None:
+            return
+        print("\n→ Exporting journal to Excel...")
+        self.get_writer().close()
+        self.writer = None
+        self.listings = None  # Closed with the writer's sinks
+        self.store.close()
+    
+    def load_dedup_index(self):
+        """Load already-scraped URLs and addresses from the existing output"""
+        if self.store is None:
+            self.store = open_store(self.excel_file, self.storage_backend)
+        self.dedup = DedupIndex.load(self.excel_file, self.store)
+        print(f"✓ Dedup index loaded: {len(self.dedup.urls)} URLs, {len(self.dedup.addresses)} addresses")
+    
     def save_property_immediately(self, property_data):
         """Save single property immediately if it has oil heating"""
         # Only save if has oil heating
@@ -892,55 +1057,272 @@ class RedfinScraperComplete:
             print(f"  ⊗ Skipped (No oil heating)")
             return False
         
+        if self.dedup is not None and self.dedup.has_address(property_data.get('full_address')) \
+                and property_data.get('url') not in self.refresh_urls:
+            print(f"  ⊗ Skipped (Already saved: {property_data['full_address']})")
+            return False
+        
         try:
-            # Create DataFrame from single property
-            df_new = pd.DataFrame([property_data])
-            
-            # Remove unnecessary columns before saving
-            columns_to_remove = ['url', 'scrape_date', 'price', 'beds', 'baths', 
-                                'sqft', 'has_oil_heating', 'listing_agent', 'broker']
-            for col in columns_to_remove:
-                if col in df_new.columns:
-                    df_new = df_new.drop(col, axis=1)
-            
-            # Check if file exists
-            if os.path.exists(self.excel_file):
-                # Read existing data
-                df_existing = pd.read_excel(self.excel_file)
-                
-                # Append new data
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                
-                # Remove duplicates based on full_address
-                df_combined = df_combined.drop_duplicates(subset=['full_address'], keep='first')
-                
-                # Save back to file
-                df_combined.to_excel(self.excel_file, index=False)
-                
-                self.properties_saved_count += 1
-                print(f"  ✓ SAVED to Excel (Total oil properties: {self.properties_saved_count})")
-            else:
-                # Create new file
-                df_new.to_excel(self.excel_file, index=False)
-                self.properties_saved_count += 1
-                print(f"  ✓ Created Excel file and saved property (Total: {self.properties_saved_count})")
-            
+            # Queued for the writer's next group commit; Excel is written at phase/run end
+            with self.metrics.time('save'):
+                self.get_writer().put(property_data)
+            self.metrics.count('properties_saved')
+            self.properties_saved_count += 1
+            print(f"  ✓ SAVED to journal (Total oil properties: {self.properties_saved_count})")
             return True
             
         except Exception as e:
             print(f"  ✗ Error saving property: {e}")
             return False
     
+    def save_checkpoint(self, status='running'):
+        """Write the run position atomically (not from phase worker processes)"""
+        if self.result_queue is not None:
+            return
+        with self._checkpoint_lock:
+            self.visits_since_checkpoint = 0
+            state = {name: getattr(self, name) for name in CHECKPOINT_FIELDS}
+            state['processed_urls'] = sorted(self.processed_urls)
+            state['status'] = status
+            try:
+                self.checkpoint.save(state)
+            except Exception as e:
+                print(f"  ⚠ Could not write checkpoint: {e}")
+    
+    def load_checkpoint(self):
+        """Restore run state from the checkpoint; False if there is nothing to resume"""
+        state = self.checkpoint.load()
+        if not state:
+            print(f"✗ No checkpoint found: {self.checkpoint.path}")
+            return False
+        if state.get('status') == 'complete':
+            print(f"✓ The run in {self.checkpoint.path} already completed, nothing to resume")
+            return False
+        
+        for name in CHECKPOINT_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if self.phase_plan:
+            self.phase_plan = [tuple(phase) for phase in self.phase_plan]
+        self.processed_urls = set(state.get('processed_urls', []))
+        self.resume = True
+        print(f"✓ Checkpoint loaded ({state.get('updated', 'unknown time')}): {self.checkpoint.path}")
+        return True
+    
+    def resume_from_checkpoint(self):
+        """Go back to where the checkpointed run stopped instead of asking the user"""
+        print("\n" + "="*60)
+        print("RESUMING FROM CHECKPOINT")
+        print("="*60)
+        print(f"✓ Oil properties saved so far: {self.properties_saved_count}")
+        print(f"✓ Already processed in the interrupted page/phase: {len(self.processed_urls)}")
+        self.start_element = 1
+        
+        if self.use_auto_phases:
+            print(f"✓ Phases completed: {len(self.phases_completed)}")
+            self.current_phase = len(self.phases_completed)
+            return
+        
+        if self.discovery_mode != 'api':
+            self.driver.get(self.page_url or self.base_url)
+            print(f"✓ Back on page {self.current_page_num}: {self.page_url}")
+    
+    def handle_property_result(self, property_data, checkpoint=True):
+        """Save an extracted property and record the visit; True if saved"""
+        if self.result_queue is not None:
+            # Phase worker process: hand the record to the parent (single writer)
+            self.result_queue.put(('property', property_data))
+            return property_data.get('has_oil_heating') == 'Yes'
+        
+        # Save immediately if has oil heating
+        saved = self.save_property_immediately(property_data)
+        
+        # A saved property is only remembered once the writer has committed
+        # it (records_committed), so a crash can't mark it done unsaved
+        if not saved:
+            self.remember_visit(property_data)
+            self.visits_since_checkpoint += 1
+            if checkpoint and self.visits_since_checkpoint >= CHECKPOINT_EVERY:
+                self.save_checkpoint()
+        
+        return saved
+    
+    def remember_visit(self, property_data):
+        """Mark a property as done unless extraction failed (retry next run)"""
+        if 'error' in property_data:
+            return
+        if self.dedup is not None:
+            self.dedup.add(property_data)
+        if property_data.get('url'):
+            self.processed_urls.add(property_data['url'])
+        summary = self.listing_summaries.pop(property_data.get('url'), None)
+        if summary is not None:
+            self.get_listings().remember_summaries({property_data['url']: summary})
+    
+    def records_committed(self, records):
+        """Writer thread: properties are durable in the journal"""
+        for property_data in records:
+            self.remember_visit(property_data)
+        self.save_checkpoint()
+    
+    def save_property_batch(self, records):
+        """Pipeline writer: save a batch of properties, then checkpoint once; returns the oil count"""
+        oil_count = 0
+        for property_data in records:
+            print(f"   Done: {property_data.get('url')}")
+            try:
+                if self.handle_property_result(property_data, checkpoint=False):
+                    oil_count += 1
+            except Exception as e:
+                print(f"  ✗ Error processing property: {e}")
+        self.save_checkpoint()
+        return oil_count
+    
+    def track_summaries(self, pending, seen=None, refresh=()):
+        """Note discovery summaries: pending ones are stored once their visit is
+        done (remember_visit), seen ones right away"""
+        self.refresh_urls.update(refresh)
+        if self.result_queue is not None:
+            # Worker process: the parent owns the property store
+            self.result_queue.put(('summaries', (pending, seen, list(refresh))))
+            return
+        self.listing_summaries.update(pending)
+        if seen:
+            self.get_listings().remember_summaries(seen)
+    
+    def select_changed_listings(self, property_urls, summaries):
+        """Keep new listings and known ones whose summary changed (see tracks_changes)"""
+        stored = self.get_listings().summaries(property_urls)
+        selected, pending, seen, refresh = [], {}, {}, []
+        for url in property_urls:
+            summary = summaries.get(url)
+            if summary is None:
+                selected.append(url)  # No summary to compare: the usual dedup applies
+            elif url in stored:
+                if stored[url] != summary:
+                    selected.append(url)
+                    pending[url] = summary
+                    refresh.append(url)
+            elif self.dedup is not None and self.dedup.has_url(url):
+                # Scraped before incremental mode: keep skipping, compare from now on
+                seen[url] = summary
+            else:
+                selected.append(url)
+                pending[url] = summary
+        
+        self.track_summaries(pending, seen, refresh)
+        unchanged = len(property_urls) - len(selected)
+        self.metrics.count('listings_unchanged', unchanged)
+        self.metrics.count('listings_changed', len(refresh))
+        if unchanged or refresh:
+            print(f"   ⊗ Change check: {unchanged} unchanged, {len(refresh)} changed since the last visit")
+        return selected
+    
+    def process_property_urls(self, property_urls, summaries=None):
+        """Extract and save a batch of property URLs; returns the oil count
+        
+        summaries ({url: listing_summary}) enables the change check.
+        """
+        oil_count = 0
+        
+        if self.tracks_changes() and summaries:
+            property_urls = self.select_changed_listings(property_urls, summaries)
+        
+        # Skip listings already scraped in a previous run
+        if self.dedup is not None:
+            known = [url for url in property_urls if self.dedup.has_url(url) and url not in self.refresh_urls]
+            if known:
+                print(f"   ⊗ Skipping {len(known)} already-scraped properties")
+                property_urls = [url for url in property_urls
+                                 if not self.dedup.has_url(url) or url in self.refresh_urls]
+        
+        # Skip what the interrupted run already finished (--resume)
+        if self.processed_urls:
+            done = [url for url in property_urls if url in self.processed_urls]
+            if done:
+                print(f"   ⊗ Skipping {len(done)} properties finished before the checkpoint")
+                property_urls = [url for url in property_urls if url not in self.processed_urls]
+        
+        if self.pipeline_active():
+            # Extraction and saving continue in the background (see drain_pipeline)
+            pipeline = self.get_pipeline()
+            queued = sum(1 for url in property_urls if pipeline.submit(url))
+            print(f"   → Queued {queued} properties for extraction")
+            return 0
+        
+        if self.detail_engine == 'async' and property_urls:
+            # All detail pages load concurrently as tabs of one browser
+            for i, property_data in enumerate(self.get_async_runner().extract_many(property_urls), 1):
+                print(f"   [{i}/{len(property_urls)}] Done: {property_data.get('url')}")
+                try:
+                    if self.handle_property_result(property_data):
+                        oil_count += 1
+                except Exception as e:
+                    print(f"  ✗ Error processing property: {e}")
+        elif self.detail_workers > 1 and len(property_urls) > 1:
+            # Workers extract in parallel; this thread is the single writer
+            for i, property_data in enumerate(self.get_detail_pool().map(property_urls), 1):
+                print(f"   [{i}/{len(property_urls)}] Done: {property_data.get('url')}")
+                try:
+                    if self.handle_property_result(property_data):
+                        oil_count += 1
+                except Exception as e:
+                    print(f"  ✗ Error processing property: {e}")
+        else:
+            # Process each property
+            for i, url in enumerate(property_urls, 1):
+                print(f"   [{i}/{len(property_urls)}] Processing: {url}")
+                
+                try:
+                    property_data = self.extract_property(url)
+                    
+                    if self.handle_property_result(property_data):
+                        oil_count += 1
+                    
+                except Exception as e:
+                    print(f"  ✗ Error processing property: {e}")
+                    # Continue to next property instead of stopping
+                    continue
+        
+        return oil_count
+    
+    def scrape_via_search_api(self, min_price=None, max_price=None):
+        """Discover listings through the search endpoint and scrape them in batches"""
+        oil_count = 0
+        saved_before = self.pipeline_saved()
+        discovery = SearchApiDiscovery(self.base_url, self.base_filter)
+        
+        batch = []
+        summaries = {}
+        total = 0
+        for listing in discovery.iter_listings(min_price, max_price):
+            batch.append(listing['url'])
+            summaries[listing['url']] = listing_summary(listing['price'], listing['status'])
+            total += 1
+            if len(batch) >= self.discovery_batch_size:
+                print(f"\n   📋 Discovered {total} properties so far (API)")
+                oil_count += self.process_property_urls(batch, summaries)
+                batch, summaries = [], {}
+        
+        if batch:
+            print(f"\n   📋 Discovered {total} properties (API)")
+            oil_count += self.process_property_urls(batch, summaries)
+        
+        print(f"   ✓ API discovery: {total} properties in {discovery.requests_made} requests")
+        if self.pipeline_active():
+            self.drain_pipeline()
+            oil_count = self.pipeline_saved() - saved_before
+        return oil_count
+    
     def scrape_current_page(self):
         """Scrape all properties on current page"""
         oil_properties_on_page = 0
         
         try:
             # Wait for property cards to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.bp-Homecard'))
-            )
-            time.sleep(1)  # Extra wait for all to render
+            if not self.wait_until(homecards_rendered, 'homecards'):
+                self.record_page_load(self.driver.current_url, None, False)
+                raise TimeoutException("Home cards did not render")
             
             # Get all property links
             property_links = self.driver.find_elements(By.CSS_SELECTOR, 'a.bp-Homecard__Address')
@@ -962,25 +1344,15 @@ class RedfinScraperComplete:
             
             print()
             
-            # Process each property
-            for i, url in enumerate(property_urls, 1):
-                print(f"   [{i}/{properties_to_scrape}] Processing: {url}")
-                
-                try:
-                    property_data = self.extract_property_details(url)
-                    
-                    # Save immediately if has oil heating
-                    if self.save_property_immediately(property_data):
-                        oil_properties_on_page += 1
-                    
-                    time.sleep(1)  # Be nice to the server
-                    
-                except Exception as e:
-                    print(f"  ✗ Error processing property: {e}")
-                    # Continue to next property instead of stopping
-                    continue
+            summaries = None
+            if self.tracks_changes():
+                summaries = {url: listing_summary(price, status)
+                             for url, price, status in homecard_summaries(self.driver)}
+            
+            oil_properties_on_page = self.process_property_urls(property_urls, summaries)
             
-            print(f"\n   ✓ Oil properties found on this page: {oil_properties_on_page}")
+            if not self.pipeline_active():
+                print(f"\n   ✓ Oil properties found on this page: {oil_properties_on_page}")
             
         except Exception as e:
             print(f"   ✗ Error scraping page: {e}")
@@ -1017,7 +1389,9 @@ class RedfinScraperComplete:
             
             # Scroll to it
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-            time.sleep(1)
+            old_url = self.driver.current_url
+            self.get_rate_limiter().acquire(old_url)
+            started = time.monotonic()
             
             # Click it
             try:
@@ -1026,12 +1400,14 @@ class RedfinScraperComplete:
                 # Try JavaScript click if normal click fails
                 self.driver.execute_script("arguments[0].click();", next_button)
             
-            time.sleep(3)
-            
-            # Wait for new page to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.bp-Homecard'))
-            )
+            # Wait for the URL to change and the new page's cards to render
+            if not self.wait_until(url_changed(old_url), 'url_changed'):
+                raise TimeoutException("URL did not change after clicking next")
+            loaded = self.wait_until(homecards_rendered, 'homecards')
+            self.record_page_load(old_url, started, loaded)
+            self.metrics.observe('next_page', time.monotonic() - started)
+            if not loaded:
+                raise TimeoutException("Home cards did not render on next page")
             
             return True
             
@@ -1039,37 +1415,67 @@ class RedfinScraperComplete:
             print(f"  ✗ Error navigating to next page: {e}")
             return False
     
+    def print_page_summary(self, oil_count):
+        print(f"\n📊 Page {self.current_page_num} Summary:")
+        print(f"   • Oil properties on this page: {oil_count}")
+        print(f"   • Total oil properties saved: {self.properties_saved_count}")
+    
+    def finish_pipelined_page(self, saved_before):
+        """Pipeline: wait for the page's properties before the checkpoint moves on"""
+        if not self.pipeline_active():
+            return
+        self.drain_pipeline()
+        self.print_page_summary(self.pipeline_saved() - saved_before)
+    
     def run_normal_mode(self):
         """Run in normal mode (original functionality)"""
-        # Continue scraping until no more pages or user stops
-        while True:
-            print("\n" + "="*60)
-            print(f"SCRAPING PAGE {self.current_page_num}")
-            print("="*60)
-            
-            # Scrape current page (saves automatically)
-            oil_count = self.scrape_current_page()
-            
-            print(f"\n📊 Page {self.current_page_num} Summary:")
-            print(f"   • Oil properties on this page: {oil_count}")
-            print(f"   • Total oil properties saved: {self.properties_saved_count}")
-            
-            # Check for next page
-            print("\n→ Checking for next page...")
-            if not self.has_next_page():
+        if self.discovery_mode == 'api':
+            print("\n→ Discovering listings through the search API...")
+            if self.base_filter:
+                # Manual price range: filter was captured without the price
+                self.scrape_via_search_api(self.min_price, self.max_price)
+            else:
+                # The user's filter (including any price) comes from the browser URL
+                if '/filter/' in self.driver.current_url:
+                    self.base_filter = self.driver.current_url.split('/filter/')[1].split('/page-')[0]
+                self.scrape_via_search_api()
+        else:
+            # Continue scraping until no more pages or user stops
+            while True:
                 print("\n" + "="*60)
-                print("✓ NO MORE PAGES in current range")
+                print(f"SCRAPING PAGE {self.current_page_num}")
                 print("="*60)
-                break
-            
-            # Navigate automatically (no user prompt)
-            print("\n→ Navigating to next page automatically...")
-            if not self.go_to_next_page():
-                print("\n✗ Failed to navigate to next page - stopping")
-                break
-            
-            self.current_page_num += 1
-            time.sleep(2)  # Extra wait between pages
+                
+                # Scrape current page (saves automatically)
+                saved_before = self.pipeline_saved()
+                oil_count = self.scrape_current_page()
+                
+                if not self.pipeline_active():
+                    self.print_page_summary(oil_count)
+                
+                # Check for next page
+                print("\n→ Checking for next page...")
+                if not self.has_next_page():
+                    self.finish_pipelined_page(saved_before)
+                    print("\n" + "="*60)
+                    print("✓ NO MORE PAGES in current range")
+                    print("="*60)
+                    break
+                
+                # Navigate automatically (no user prompt); with the pipeline
+                # the next page loads while this one is still being extracted
+                print("\n→ Navigating to next page automatically...")
+                navigated = self.go_to_next_page()
+                self.finish_pipelined_page(saved_before)
+                if not navigated:
+                    print("\n✗ Failed to navigate to next page - stopping")
+                    break
+                
+                self.flush_writer()
+                self.current_page_num += 1
+                self.page_url = self.driver.current_url
+                self.processed_urls.clear()
+                self.save_checkpoint()
         
         # Check if we need to continue with remaining price ranges
         if self.continue_after_manual and self.manual_range_max:
@@ -1086,16 +1492,42 @@ class RedfinScraperComplete:
             self.use_auto_phases = True
             self.min_price = self.manual_range_max + 1
             self.max_price = 10000000
-            
-            # Small delay before continuing
-            time.sleep(3)
+            self.flush_writer()
+            self.processed_urls.clear()
+            self.save_checkpoint()
             
             # Run auto-phase for remaining ranges
             self.run_auto_phase_mode()
     
     def run_auto_phase_mode(self):
         """Run in automatic phase mode"""
+        if self.phase_planning == 'histogram':
+            if self.phase_plan is None:
+                self.phase_plan = self.plan_price_phases(self.min_price, self.max_price)
+                self.save_checkpoint()
+            
+            # Phases finished before a crash/Ctrl+C are not scraped again
+            done = {(phase['min_price'], phase['max_price']) for phase in self.phases_completed}
+            phases = [phase for phase in self.phase_plan if (phase[0], phase[1]) not in done]
+            if done:
+                print(f"\n✓ {len(done)} phases already complete, {len(phases)} remaining")
+            
+            if self.phase_workers > 1 and len(phases) > 1:
+                ParallelPhaseRunner(self, self.phase_workers).run(phases)
+                print(f"\n✓ Reached maximum price (${self.format_price_for_url(self.max_price)})")
+                return
+            
+            for phase_min, phase_max, result_count in phases:
+                self.current_phase += 1
+                self.scrape_phase(phase_min, phase_max)
+            
+            print(f"\n✓ Reached maximum price (${self.format_price_for_url(self.max_price)})")
+            return
+        
         current_min = self.min_price
+        if self.phases_completed:
+            # Resume after the last completed phase
+            current_min = max(phase['max_price'] for phase in self.phases_completed) + 1
         
         while current_min < self.max_price:
             self.current_phase += 1
@@ -1119,17 +1551,46 @@ class RedfinScraperComplete:
                 print(f"\n✓ Reached maximum price (${self.format_price_for_url(self.max_price)})")
                 break
     
+    def export_metrics(self):
+        """Print stage percentiles and write the metrics file"""
+        self.metrics.report()
+        path = self.metrics_file or os.path.splitext(self.excel_file)[0] + '.metrics.json'
+        try:
+            self.metrics.write(path)
+            print(f"✓ Metrics written to {path}")
+        except Exception as e:
+            print(f"⚠ Could not write metrics: {e}")
+    
     def run(self):
         """Main run method"""
+        if self.metrics_port:
+            try:
+                self.metrics.serve(self.metrics_port)
+            except Exception as e:
+                print(f"⚠ Could not start metrics endpoint: {e}")
         try:
-            # Kill any existing Chrome processes first
-            self.kill_chrome_processes()
+            # Kill any existing Chrome processes first (not in configured runs,
+            # which may be sharing the machine with other counties)
+            if self.interactive:
+                self.kill_chrome_processes()
+            
+            # Load the dedup index once, before any page is opened
+            self.load_dedup_index()
             
             # Setup browser
             self.setup_driver()
             
-            # Let user apply filters and choose mode
-            self.start_and_wait_for_user()
+            # Let user apply filters and choose mode (or pick up the checkpoint)
+            if self.resume:
+                self.resume_from_checkpoint()
+            elif not self.interactive:
+                self.start_unattended()
+                self.page_url = self.driver.current_url
+                self.save_checkpoint()
+            else:
+                self.start_and_wait_for_user()
+                self.page_url = self.driver.current_url
+                self.save_checkpoint()
             
             # Run appropriate mode
             if self.use_auto_phases:
@@ -1163,17 +1624,49 @@ class RedfinScraperComplete:
             
             print(f"✓ Data saved to: {self.excel_file}")
             print("="*60 + "\n")
+            self.flush_writer()
+            self.save_checkpoint(status='complete')
             
         except KeyboardInterrupt:
             print("\n\n⚠ Scraping interrupted by user (Ctrl+C)")
+            self.stop_pipeline(discard_pending=True)
+            self.save_checkpoint()
             print(f"✓ Data saved before interruption: {self.properties_saved_count} oil properties")
             print(f"✓ Check file: {self.excel_file}")
+            print(f"→ Continue with: python main.py --resume {self.excel_file}")
         except Exception as e:
             print(f"\n✗ Error during scraping: {e}")
+            self.save_checkpoint()
             print(f"✓ Data saved so far: {self.properties_saved_count} oil properties")
+            print(f"→ Continue with: python main.py --resume {self.excel_file}")
             import traceback
             traceback.print_exc()
         finally:
+            self.stop_pipeline()
+            # Final group commit + Excel export, also after Ctrl+C
+            self.close_writer()
+            self.wait_stats.report()
+            if self.probe_cache is not None:
+                self.probe_cache.report()
+            if self.rate_limiter is not None:
+                self.rate_limiter.report()
+            self.export_metrics()
+            self.metrics.stop()
+            if self.driver:
+                self.resource_stats.collect(self.driver)
+            self.resource_stats.report()
+            
+            if self.dedup is not None:
+                self.dedup.close()
+            
+            if self.detail_pool is not None:
+                print("\n→ Stopping detail workers...")
+                self.detail_pool.close()
+            
+            if self.async_runner is not None:
+                print("\n→ Stopping async engine...")
+                self.async_runner.close()
+            
             if self.driver:
                 print("\n→ Closing browser...")
                 try:
@@ -1185,6 +1678,30 @@ class RedfinScraperComplete:
 
 def main():
     """Run the scraper"""
+    args = build_parser().parse_args()
+    
+    if args.resume:
+        excel_file = args.resume if args.resume.endswith('.xlsx') else args.resume + '.xlsx'
+        scraper = RedfinScraperComplete(excel_file=excel_file)
+        if scraper.load_checkpoint():
+            # Flags and --config given with --resume override the checkpointed settings
+            overrides = resolve_settings(args)
+            if overrides:
+                interactive = scraper.interactive
+                scraper.apply_settings(overrides)
+                scraper.interactive = interactive
+                print(f"✓ Overriding checkpointed settings: {', '.join(sorted(overrides))}")
+            scraper.run()
+        return
+    
+    if is_unattended(args):
+        settings = resolve_settings(args)
+        scraper = RedfinScraperComplete(excel_file=settings.get('excel_file', "redfin_oil_properties.xlsx"))
+        scraper.apply_settings(settings)
+        print(f"✓ Will save to: {scraper.excel_file}")
+        scraper.run()
+        return
+    
     print("\n")
     print("╔" + "="*58 + "╗")
     print("║" + " "*15 + "REDFIN WEB SCRAPER" + " "*25 + "║")
@@ -1202,14 +1719,21 @@ def main():
     print(f"\n✓ Will save to: {excel_file}")
     print("✓ Only properties with OIL heating will be saved")
     print("✓ URL column will NOT be included")
-    print("✓ Data is saved after EACH property (safe from interruptions)")
+    print("✓ Data is journaled after EACH property (safe from interruptions)")
+    print("✓ Excel file is rebuilt from the journal at phase end and run end")
     print("✓ NO user prompts during scraping (fully automatic)")
     
+    scraper = RedfinScraperComplete(excel_file=excel_file)
+    
+    # Workers, engines etc. are normally set with flags or --config (see --help)
+    advanced_input = input("\nChange advanced options (workers, engine, fast path...)? (y/n, default: n): ").strip().lower()
+    if advanced_input == 'y':
+        ask_advanced_options(scraper)
+    
     if os.path.exists(excel_file):
         print(f"\n⚠ File already exists: {excel_file}")
         print("✓ New data will be APPENDED to existing file")
     
-    scraper = RedfinScraperComplete(excel_file=excel_file)
     scraper.run()
 
 
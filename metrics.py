@@ -0,0 +1,164 @@
+"""
+Redfin Property Scraper - Metrics
+Per-stage timings aggregated into percentiles, exported as JSON or a
+Prometheus textfile, and optionally served live over HTTP
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RunMetrics:
+    """Stage durations (seconds) and counters for one run, thread-safe
+
+    If wait_stats (a waits.WaitStats) is set, its waits are included as
+    wait.<label> stages.
+    """
+
+    def __init__(self, wait_stats=None):
+        self.wait_stats = wait_stats
+        self.durations = {}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """Set a point-in-time value (e.g. a queue depth)"""
+        with self._lock:
+            self.gauges[name] = value
+
+    @contextmanager
+    def time(self, stage):
+        """with metrics.time('navigation'): ... records the block's duration"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - start)
+
+    def summary(self):
+        """{stage: {count, sum, p50, p95, p99, max}} plus counters and gauges"""
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self.durations.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        if self.wait_stats is not None:
+            with self.wait_stats._lock:
+                for label, values in self.wait_stats.durations.items():
+                    durations[f"wait.{label}"] = sorted(values)
+
+        stages = {}
+        for stage, values in sorted(durations.items()):
+            stats = {'count': len(values), 'sum': round(sum(values), 4), 'max': round(values[-1], 4)}
+            for q in QUANTILES:
+                stats[f"p{int(q * 100)}"] = round(percentile(values, q), 4)
+            stages[stage] = stats
+        return {
+            'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            'elapsed_seconds': round(time.time() - self.started, 1),
+            'stages': stages,
+            'counters': counters,
+            'gauges': gauges,
+        }
+
+    def prometheus_text(self):
+        """Prometheus text exposition (summary per stage, counters, gauges)"""
+        data = self.summary()
+        lines = [
+            '# HELP redfin_stage_seconds Duration of each scraper stage',
+            '# TYPE redfin_stage_seconds summary',
+        ]
+        for stage, stats in data['stages'].items():
+            for q in QUANTILES:
+                lines.append(f'redfin_stage_seconds{{stage="{stage}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]}')
+            lines.append(f'redfin_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]}')
+            lines.append(f'redfin_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines.append('# HELP redfin_events_total Scraper event counters')
+        lines.append('# TYPE redfin_events_total counter')
+        for name, value in sorted(data['counters'].items()):
+            lines.append(f'redfin_events_total{{event="{name}"}} {value}')
+        lines.append('# HELP redfin_gauge Point-in-time scraper values (queue depths, throughput)')
+        lines.append('# TYPE redfin_gauge gauge')
+        for name, value in sorted(data['gauges'].items()):
+            lines.append(f'redfin_gauge{{name="{name}"}} {value}')
+        lines.append('# HELP redfin_run_elapsed_seconds Seconds since the run started')
+        lines.append('# TYPE redfin_run_elapsed_seconds gauge')
+        lines.append(f'redfin_run_elapsed_seconds {data["elapsed_seconds"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write JSON, or a Prometheus textfile if path ends in .prom"""
+        body = self.prometheus_text() if path.endswith('.prom') else json.dumps(self.summary(), indent=2)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            fh.write(body)
+        os.replace(tmp_path, path)
+
+    def report(self):
+        """Print p50/p95/p99 per stage"""
+        stages = self.summary()['stages']
+        if not stages:
+            return
+        print("\n📈 Stage timings (count, p50 / p95 / p99, total):")
+        for stage, stats in stages.items():
+            print(f"   {stage}: {stats['count']}x, {stats['p50']:.2f}s / {stats['p95']:.2f}s / "
+                  f"{stats['p99']:.2f}s, total {stats['sum']:.0f}s")
+
+    def serve(self, port, host='127.0.0.1'):
+        """Live endpoint: /metrics (Prometheus) and /metrics.json"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/metrics.json'):
+                    body, content_type = json.dumps(metrics.summary(), indent=2), 'application/json'
+                elif self.path.startswith('/metrics'):
+                    body, content_type = metrics.prometheus_text(), 'text/plain; version=0.0.4'
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"✓ Live metrics on http://{host}:{self._server.server_address[1]}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,173 @@
+"""
+Redfin Property Scraper - Mock Server
+Local HTTP server that serves saved fixture pages in place of redfin.com
+"""
+
+import csv
+import io
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Default routes: URL path -> fixture file
+DEFAULT_ROUTES = {
+    '/NY/Port-Washington/25-Schooner-Ln-11050/home/1001': 'property_sold.html',
+    '/NY/Massapequa/166-N-Oak-St-11758/home/1002': 'property_for_sale.html',
+}
+
+
+def search_csv_handler(fixture='search_results.csv', fixtures_dir=FIXTURES_DIR):
+    """Stub of the CSV search endpoint: filters the fixture by price and pages it"""
+    def handler(path, query):
+        params = {k: v[0] for k, v in parse_qs(query).items()}
+        min_price = int(params.get('min_price', 0))
+        max_price = int(params.get('max_price', 10 ** 12))
+        page_size = int(params.get('num_homes', 350))
+        page_number = int(params.get('page_number', 1))
+
+        with open(os.path.join(fixtures_dir, fixture), 'r', encoding='utf-8', newline='') as fh:
+            reader = csv.reader(fh)
+            header = next(reader)
+            price_col = header.index('PRICE')
+            rows = [row for row in reader
+                    if row[price_col].isdigit() and min_price <= int(row[price_col]) <= max_price]
+
+        page = rows[(page_number - 1) * page_size:page_number * page_size]
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(header)
+        writer.writerows(page)
+        return 200, 'text/csv', out.getvalue().encode('utf-8')
+    return handler
+
+
+def search_page_routes(base_path, listings, per_page=40, fixture='search_page.html', fixtures_dir=FIXTURES_DIR):
+    """Routes for paginated search results: base_path, base_path/page-2, ...
+
+    listings is a list of (href, address, price). Each page repeats the
+    fixture's <!--card--> block per listing and hides the next arrow on the
+    last page, like the live site.
+    """
+    with open(os.path.join(fixtures_dir, fixture), 'r', encoding='utf-8') as fh:
+        template = fh.read()
+    head, _, rest = template.partition('<!--card-->')
+    card, _, tail = rest.partition('<!--/card-->')
+    pages = max(1, -(-len(listings) // per_page))
+
+    def fill(text, values):
+        for key, value in values.items():
+            text = text.replace('{' + key + '}', str(value))
+        return text
+
+    def render(page):
+        chunk = listings[(page - 1) * per_page:page * per_page]
+        cards = ''.join(fill(card, {'href': href, 'address': address, 'price': price})
+                        for href, address, price in chunk)
+        values = {
+            'total': len(listings), 'page': page, 'pages': pages,
+            'hidden': ' PageArrow--hidden' if page >= pages else '',
+            'next_href': f"{base_path}/page-{page + 1}",
+        }
+        return (fill(head, values) + cards + fill(tail, values)).encode('utf-8')
+
+    routes = {}
+    for page in range(1, pages + 1):
+        path = base_path if page == 1 else f"{base_path}/page-{page}"
+        routes[path] = (lambda page: lambda path, query: (200, 'text/html; charset=utf-8', render(page)))(page)
+    return routes
+
+
+class MockRedfinServer:
+    """Serve fixture pages on 127.0.0.1 from a background thread
+
+    routes maps a URL path to a fixture file name or to a callable
+    handler(path, query) returning (status, content_type, body_bytes), optionally
+    followed by a dict of extra response headers.
+    """
+
+    def __init__(self, routes=None, port=0, fixtures_dir=FIXTURES_DIR):
+        self.routes = dict(DEFAULT_ROUTES)
+        self.routes['/stingray/api/gis-csv'] = search_csv_handler(fixtures_dir=fixtures_dir)
+        self.routes.update(routes or {})
+        self.fixtures_dir = fixtures_dir
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body, *extra = server.resolve(self.path)
+                with server._lock:
+                    server.requests_served += 1
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (extra[0] if extra else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def resolve(self, raw_path):
+        """Return (status, content_type, body) for a request path"""
+        path, _, query = raw_path.partition('?')
+        target = self.routes.get(path)
+
+        if callable(target):
+            return target(path, query)
+
+        if target is None:
+            # Fall back to serving fixtures by file name, e.g. /property_sold.html
+            name = os.path.basename(path)
+            if name and os.path.exists(os.path.join(self.fixtures_dir, name)):
+                target = name
+            else:
+                return 404, 'text/plain', b'Not found'
+
+        with open(os.path.join(self.fixtures_dir, target), 'rb') as fh:
+            body = fh.read()
+        content_type = 'text/csv' if target.endswith('.csv') else 'text/html; charset=utf-8'
+        return 200, content_type, body
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with MockRedfinServer(port=8765) as mock:
+        print(f"Mock Redfin server running on {mock.base_url}")
+        for path in mock.routes:
+            print(f"   {mock.url(path)}")
+        try:
+            mock.thread.join()
+        except KeyboardInterrupt:
+            pass
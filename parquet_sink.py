@@ -0,0 +1,131 @@
+"""
+Redfin Property Scraper - Parquet Sink
+Columnar output partitioned by region, scrape day and listing status, written
+in row groups as the journal commits (optional: pip install pyarrow)
+"""
+
+import os
+import re
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# property_data keys in the order the extractors fill them; listing_status is
+# a partition key, so it lives in the directory name rather than the file
+PROPERTY_COLUMNS = [
+    'url', 'scrape_date', 'sold_date', 'street_address', 'city', 'state', 'zip_code',
+    'full_address', 'price', 'beds', 'baths', 'sqft', 'property_type',
+    'heating_type', 'cooling_type', 'has_oil_heating', 'listing_agent', 'broker',
+]
+PARTITION_COLUMNS = ['region', 'scrape_day', 'listing_status']
+
+PROPERTY_SCHEMA = pa.schema([(column, pa.string()) for column in PROPERTY_COLUMNS])
+
+
+def region_from_url(base_url):
+    """'NY-Nassau-County' from https://www.redfin.com/county/1974/NY/Nassau-County"""
+    path = (base_url or '').split('://')[-1].split('/filter/')[0].rstrip('/')
+    parts = [p for p in path.split('/')[1:] if p]
+    return _partition_value('-'.join(parts[-2:]))
+
+
+def _partition_value(value):
+    value = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value or '').strip())
+    return value or 'unknown'
+
+
+class ParquetSink:
+    """Hive-partitioned Parquet dataset: region=/scrape_day=/listing_status=
+
+    write() buffers records per partition and appends a row group once a
+    partition has row_group_size rows. Every file_seconds the open files are
+    finished and published, so a slow run still shows up in the dataset
+    while it runs and a crash loses at most that window (the journal still
+    has it). Files are written under a hidden '.part-...' name, which
+    dataset readers skip, and renamed when finished.
+    """
+
+    def __init__(self, root, region, row_group_size=5000, compression='zstd', file_seconds=900):
+        self.root = root
+        self.region = _partition_value(region)
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.file_seconds = file_seconds
+        self.files_started = time.monotonic()
+        self.sequence = 0  # Files of this run per partition so far
+        self.files_written = 0
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.run_day = time.strftime('%Y-%m-%d')  # For records without a scrape_date
+        self.buffers = {}  # partition dir -> [row dicts]
+        self.writers = {}  # partition dir -> (ParquetWriter, tmp path, final path)
+        self.rows_written = 0
+        self.row_groups = 0
+        self.ignored_columns = set()
+
+    def _partition(self, record):
+        return os.path.join(
+            self.root,
+            f"region={self.region}",
+            f"scrape_day={_partition_value(str(record.get('scrape_date') or self.run_day)[:10])}",
+            f"listing_status={_partition_value(record.get('listing_status'))}",
+        )
+
+    def write(self, records):
+        """Buffer records; full row groups go to disk right away"""
+        for record in records:
+            extra = set(record) - set(PROPERTY_COLUMNS) - {'listing_status'}
+            if extra - self.ignored_columns:
+                print(f"  ⚠ Parquet schema has no column for {', '.join(sorted(extra - self.ignored_columns))}")
+                self.ignored_columns |= extra
+            partition = self._partition(record)
+            rows = self.buffers.setdefault(partition, [])
+            rows.append({column: _cell(record.get(column)) for column in PROPERTY_COLUMNS})
+            if len(rows) >= self.row_group_size:
+                self._write_row_group(partition)
+        if time.monotonic() - self.files_started >= self.file_seconds:
+            self.publish()
+
+    def _write_row_group(self, partition):
+        rows = self.buffers.pop(partition, [])
+        if not rows:
+            return
+        if partition not in self.writers:
+            os.makedirs(partition, exist_ok=True)
+            name = f"part-{self.run_id}-{self.sequence:04d}.parquet"
+            final_path = os.path.join(partition, name)
+            tmp_path = os.path.join(partition, f".{name}.tmp")
+            writer = pq.ParquetWriter(tmp_path, PROPERTY_SCHEMA, compression=self.compression)
+            self.writers[partition] = (writer, tmp_path, final_path)
+        self.writers[partition][0].write_table(pa.Table.from_pylist(rows, schema=PROPERTY_SCHEMA))
+        self.rows_written += len(rows)
+        self.row_groups += 1
+
+    def flush(self):
+        """Write every partially filled row group"""
+        for partition in list(self.buffers):
+            self._write_row_group(partition)
+
+    def publish(self):
+        """Flush, finish each open file's footer and move it into place"""
+        self.flush()
+        for writer, tmp_path, final_path in self.writers.values():
+            writer.close()
+            os.replace(tmp_path, final_path)
+        self.files_written += len(self.writers)
+        if self.writers:
+            self.sequence += 1
+        self.writers = {}
+        self.files_started = time.monotonic()
+
+    def close(self):
+        self.publish()
+        if self.files_written:
+            print(f"✓ Parquet: {self.rows_written} rows in {self.row_groups} row groups, "
+                  f"{self.files_written} files under {self.root}")
+
+
+def _cell(value):
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
@@ -0,0 +1,242 @@
+"""
+Redfin Property Scraper - Parsing
+Parsing of address, listing banner and Interior entries, per property or in
+batches (lists / pandas Series) for reprocessing stored records
+"""
+
+import re
+
+import pandas as pd
+
+ADDRESS_FIELDS = ['street_address', 'city', 'state', 'zip_code']
+
+# "25 Schooner Ln, Port Washington, NY 11050" (anything after a third comma is ignored)
+# (greedy classes that end on a non-space keep backtracking, and so batch runs, cheap)
+_ADDRESS_3_PARTS = re.compile(
+    r'^\s*(?P<street_address>[^,]*[^\s,])?\s*,\s*(?P<city>[^,]*[^\s,])?\s*,\s*'
+    r'(?P<state>[^\s,]+)?(?:\s+(?P<zip_code>[^\s,]+))?')
+# "166 N Oak St, Massapequa NY 11758", "1 Main St, NY 11758" or "1 Main St, Massapequa"
+_ADDRESS_2_PARTS = re.compile(
+    r'^\s*(?P<street_address>[^,]*[^\s,])?\s*,\s*(?:(?:(?P<city>[^,]*?)\s+)?(?P<state>[^\s,]+)\s+'
+    r'(?P<zip_code>[^\s,]+)|(?P<city_only>[^,]*[^\s,])?)\s*$')
+# Batch form: the empty 'matched' group is '' on a match and NaN otherwise
+_ADDRESS_3_BATCH = re.compile(_ADDRESS_3_PARTS.pattern + r'(?P<matched>)')
+
+# Value of an Interior entry: first "Heating:" / "Heating :" with a non-empty value
+# on the same line, or on the next line unless that is the other label
+_ENTRY_VALUE = r' ?:[^\S\n]*(?:\n(?!\s*(?:Heating|Cooling) ?:)\s*)?([^\n]*[^\s:][^\n]*)'
+_HEATING_ENTRY = re.compile(r'Heating' + _ENTRY_VALUE)
+_COOLING_ENTRY = re.compile(r'Cooling' + _ENTRY_VALUE)
+# Page text fallback: the rest of the "Heating:" line, or the next line if that is empty
+_HEATING_LINE = re.compile(r'Heating:[^\S\n]*(?:\n[^\S\n]*)?([^\n]*\S)')
+_OIL = re.compile(r'oil', re.IGNORECASE)
+
+
+def _clean_entry(value):
+    return value.replace(':', '').strip()
+
+
+def parse_address(full_address_text):
+    """Split "25 Schooner Ln, Port Washington, NY 11050" into its parts"""
+    full_address_text = (full_address_text or '').strip()
+    address = {
+        'street_address': '-',
+        'city': '-',
+        'state': '-',
+        'zip_code': '-',
+        'full_address': full_address_text or '-',
+    }
+    if not full_address_text:
+        return address
+
+    if ',' not in full_address_text:
+        # Single line address
+        address['street_address'] = full_address_text
+        return address
+
+    match = _ADDRESS_3_PARTS.match(full_address_text) or _ADDRESS_2_PARTS.match(full_address_text)
+    parts = match.groupdict()
+    parts['city'] = parts['city'] or parts.pop('city_only', None)
+    for field in ADDRESS_FIELDS:
+        if parts.get(field):
+            address[field] = parts[field]
+    return address
+
+
+def parse_listing_banner(banner_text):
+    """Return (listing_status, sold_date) from the listing status banner"""
+    banner_text = (banner_text or '').upper()
+
+    if 'SOLD' in banner_text:
+        if 'ON' in banner_text:
+            return 'sold', banner_text.split('ON')[1].strip()
+        return 'sold', banner_text.replace('SOLD', '').strip()
+    if 'FOR SALE' in banner_text:
+        return 'for-sale', '-'
+    return 'unknown', '-'
+
+
+def parse_interior_entries(item_texts):
+    """Find heating/cooling in li.entryItem texts
+
+    Returns dict with heating_type, cooling_type and has_oil_heating.
+    """
+    interior = {'heating_type': '-', 'cooling_type': '-', 'has_oil_heating': 'No'}
+
+    # One entry may hold both ("Heating: Oil\nCooling: Central")
+    for item_text in item_texts:
+        if interior['heating_type'] == '-':
+            match = _HEATING_ENTRY.search(item_text)
+            if match:
+                interior['heating_type'] = _clean_entry(match.group(1))
+        if interior['cooling_type'] == '-':
+            match = _COOLING_ENTRY.search(item_text)
+            if match:
+                interior['cooling_type'] = _clean_entry(match.group(1))
+
+    if _OIL.search(interior['heating_type']):
+        interior['has_oil_heating'] = 'Yes'
+    return interior
+
+
+def parse_heating_from_text(page_text):
+    """Text-based fallback: the value after a 'Heating:' line (or the next line)"""
+    match = _HEATING_LINE.search(page_text or '')
+    return match.group(1).strip() if match else None
+
+
+def parse_snapshot(snapshot, property_data):
+    """Fill property_data from a DOM snapshot dict (see dom_snapshot.SNAPSHOT_JS)
+
+    The snapshot may come from the browser or be built from static HTML, so
+    any field can be None.
+    """
+    if snapshot.get('banner'):
+        property_data['listing_status'], property_data['sold_date'] = parse_listing_banner(snapshot['banner'])
+    else:
+        property_data['listing_status'] = 'unknown'
+        property_data['sold_date'] = '-'
+
+    property_data.update(parse_address(snapshot.get('full_address') or snapshot.get('street_address')))
+
+    for field in ['price', 'beds', 'baths', 'sqft', 'property_type', 'listing_agent']:
+        value = snapshot.get(field)
+        property_data[field] = value.strip() if value else '-'
+
+    broker = snapshot.get('broker')
+    property_data['broker'] = broker.replace('•', '').strip() if broker else '-'
+
+    interior = parse_interior_entries(snapshot.get('entries') or [])
+    if interior['heating_type'] == '-' and snapshot.get('body_text'):
+        heating_text = parse_heating_from_text(snapshot['body_text'])
+        if heating_text:
+            interior['heating_type'] = heating_text
+            interior['has_oil_heating'] = 'Yes' if 'oil' in heating_text.lower() else 'No'
+    property_data.update(interior)
+
+    return property_data
+
+
+def _as_series(values):
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    return series.fillna('').astype(str)
+
+
+def _unique(series):
+    """(codes, uniques) for a Series: weekly journals repeat most values"""
+    # Object dtype: hashing Python strings beats factorizing an Arrow string column
+    codes, uniques = pd.factorize(series.astype(object))
+    return codes, pd.Series(uniques, dtype=object)
+
+
+def _present(series):
+    """Extracted group with missing or empty matches as NaN"""
+    return series.where(series.notna() & (series != ''))
+
+
+def parse_addresses(values):
+    """Batch parse_address over a list or Series of full addresses
+
+    Returns a DataFrame (same index) with street_address, city, state,
+    zip_code and full_address, exactly as parse_address per row. Distinct
+    addresses are parsed once, with str.extract on the same named-group
+    patterns as parse_address.
+    """
+    series = _as_series(values).str.strip()
+    codes, texts = _unique(series)
+
+    has_comma = texts.str.contains(',', regex=False)
+    parts = texts[has_comma].str.extract(_ADDRESS_3_BATCH)
+    two_parts = parts.index[parts.pop('matched').isna()]
+    if len(two_parts):
+        two = texts[two_parts].str.extract(_ADDRESS_2_PARTS)
+        two['city'] = _present(two['city']).fillna(two.pop('city_only'))
+        parts.loc[two_parts, ADDRESS_FIELDS] = two[ADDRESS_FIELDS]
+    parts = parts.reindex(texts.index)
+
+    parsed = pd.DataFrame(index=texts.index)
+    for field in ADDRESS_FIELDS:
+        parsed[field] = _present(parts[field].astype(object)).fillna('-').astype(object)
+    # No comma: the whole text is the street address
+    parsed.loc[~has_comma & (texts != ''), 'street_address'] = texts
+    parsed['full_address'] = texts.where(texts != '', '-')
+
+    frame = parsed.take(codes)
+    frame.index = series.index
+    return frame
+
+
+def _entry_values(texts, pattern):
+    values = texts.str.extract(pattern)[0]
+    return _present(values.str.replace(':', '', regex=False).str.strip())
+
+
+def parse_interior_batch(values):
+    """Batch parse_interior_entries over Interior entries per property
+
+    Each value is a property's list of entry texts. Returns a DataFrame
+    with heating_type, cooling_type and has_oil_heating, exactly as
+    parse_interior_entries per property: every distinct entry text is
+    matched once and each property keeps its first non-empty value.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    entries = pd.Series([item_texts or [] for item_texts in values], dtype=object)
+    exploded = entries.explode().dropna().astype(str)
+    codes, texts = _unique(exploded)
+
+    frame = pd.DataFrame(index=entries.index)
+    for field, pattern in (('heating_type', _HEATING_ENTRY), ('cooling_type', _COOLING_ENTRY)):
+        found = _entry_values(texts, pattern).take(codes)
+        found.index = exploded.index
+        # '-' is what parse_interior_entries keeps looking past
+        found = found.where(found != '-')
+        frame[field] = found.groupby(level=0).first().reindex(entries.index).fillna('-').astype(object)
+    frame['has_oil_heating'] = oil_flags(frame['heating_type']).astype(object)
+    if index is not None:
+        frame.index = index
+    return frame
+
+
+def oil_flags(heating_types):
+    """'Yes'/'No' per heating type, as has_oil_heating"""
+    has_oil = _as_series(heating_types).str.contains(_OIL)
+    return has_oil.map({True: 'Yes', False: 'No'})
+
+
+def reparse_records(records):
+    """Re-derive the parsed columns of stored records (list of dicts or DataFrame)
+
+    Address parts come from full_address and has_oil_heating from
+    heating_type, so journals written by older parsing code can be
+    corrected offline without scraping again.
+    """
+    df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+    if df.empty:
+        return df
+    if 'full_address' in df.columns:
+        parsed = parse_addresses(df['full_address'])
+        for column in ADDRESS_FIELDS + ['full_address']:
+            df[column] = parsed[column]
+    if 'heating_type' in df.columns:
+        df['has_oil_heating'] = oil_flags(df['heating_type'])
+    return df
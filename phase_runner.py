@@ -0,0 +1,153 @@
+"""
+Redfin Property Scraper - Phase Runner
+Scrape planned price phases in parallel, one browser per worker process
+"""
+
+import multiprocessing
+import queue
+
+# Scraper attributes copied into every phase worker
+WORKER_SETTINGS = [
+    'excel_file', 'storage_backend', 'base_url', 'base_filter', 'headless',
+    'block_presets', 'discovery_mode', 'discovery_batch_size', 'detail_engine',
+    'async_concurrency', 'detail_workers', 'requests_per_second', 'max_requests_per_second',
+    'use_http_fast_path', 'use_pipeline', 'max_pages_per_browser', 'property_db', 'incremental',
+]
+
+
+def run_phase_worker(worker_id, settings, phases, results, rate_bucket=None):
+    """Worker process: scrape phases from the queue, forward every property"""
+    from main import RedfinScraperComplete
+
+    scraper = RedfinScraperComplete(excel_file=settings['excel_file'],
+                                    storage_backend=settings['storage_backend'])
+    for name, value in settings.items():
+        setattr(scraper, name, value)
+    # Several browsers run side by side: no fixed debugging port
+    scraper.remote_debugging_port = None
+    scraper.result_queue = results
+    if rate_bucket is not None:
+        # One request rate for all workers, not one per process
+        scraper.use_shared_rate_bucket(rate_bucket)
+
+    try:
+        # Read-only view of what earlier runs saved; the parent records visits
+        # and owns the journal, so the worker never writes or exports
+        scraper.load_dedup_index()
+        scraper.store.close()
+        scraper.store = None
+        scraper.setup_driver()
+        while True:
+            task = phases.get()
+            if task is None:
+                break
+            phase_number, phase_min, phase_max = task
+            scraper.current_phase = phase_number
+            try:
+                scraper.scrape_phase(phase_min, phase_max)
+                results.put(('phase', scraper.phases_completed[-1]))
+            except Exception as e:
+                print(f"  ✗ [worker {worker_id}] Phase {phase_number} failed: {e}")
+                results.put(('phase_failed', {'phase': phase_number, 'min_price': phase_min,
+                                              'max_price': phase_max, 'error': str(e)}))
+    except Exception as e:
+        print(f"  ✗ [worker {worker_id}] Could not start: {e}")
+    finally:
+        for closer in (scraper.detail_pool, scraper.async_runner, scraper):
+            if closer is not None:
+                try:
+                    closer.close()
+                except Exception:
+                    pass
+        if scraper.dedup is not None:
+            scraper.dedup.close()
+        if scraper.listings is not None:
+            scraper.listings.close()
+        results.put(('done', worker_id))
+
+
+class ParallelPhaseRunner:
+    """Hand planned phases to worker processes; the calling scraper writes
+
+    Workers push ('property', data) messages for every extracted listing,
+    ('summaries', ...) for incremental runs and ('phase', summary) when a
+    phase finishes. The parent saves properties
+    through its own journal and dedup index, so there is one writer.
+    """
+
+    def __init__(self, scraper, workers=2):
+        self.scraper = scraper
+        self.workers = max(1, workers)
+        self.context = multiprocessing.get_context('spawn')
+        self.processes = []
+
+    def run(self, phases):
+        """Scrape [(phase_min, phase_max, count), ...]; returns the oil count"""
+        settings = {name: getattr(self.scraper, name) for name in WORKER_SETTINGS}
+        rate_bucket = self.scraper.shared_rate_bucket(self.context)
+        phase_queue = self.context.Queue()
+        results = self.context.Queue()
+
+        first_phase = self.scraper.current_phase + 1
+        for offset, (phase_min, phase_max, _count) in enumerate(phases):
+            phase_queue.put((first_phase + offset, phase_min, phase_max))
+        self.scraper.current_phase += len(phases)
+
+        workers = min(self.workers, len(phases))
+        for _ in range(workers):
+            phase_queue.put(None)
+        for worker_id in range(1, workers + 1):
+            process = self.context.Process(target=run_phase_worker,
+                                           args=(worker_id, settings, phase_queue, results, rate_bucket),
+                                           daemon=True)
+            process.start()
+            self.processes.append(process)
+        print(f"✓ Started {workers} phase workers for {len(phases)} phases")
+
+        oil_count = 0
+        finished = 0
+        running = workers
+        try:
+            while running:
+                try:
+                    kind, payload = results.get(timeout=5)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in self.processes):
+                        print("⚠ All phase workers exited early")
+                        break
+                    continue
+
+                if kind == 'property':
+                    try:
+                        if self.scraper.handle_property_result(payload):
+                            oil_count += 1
+                    except Exception as e:
+                        print(f"  ✗ Error processing property: {e}")
+                elif kind == 'summaries':
+                    self.scraper.track_summaries(*payload)
+                elif kind == 'phase':
+                    # The phase's properties must be committed before it counts as done
+                    self.scraper.flush_writer()
+                    self.scraper.phases_completed.append(payload)
+                    finished += 1
+                    self.scraper.save_checkpoint()
+                    print(f"✓ Phase {payload['phase']} finished ({finished}/{len(phases)})")
+                    self.scraper.export_excel()
+                elif kind == 'phase_failed':
+                    print(f"✗ Phase {payload['phase']} failed: {payload['error']}")
+                elif kind == 'done':
+                    running -= 1
+        finally:
+            self.close()
+
+        if finished < len(phases):
+            print(f"⚠ {len(phases) - finished} of {len(phases)} phases did not complete")
+        self.scraper.phases_completed.sort(key=lambda phase: phase['phase'])
+        return oil_count
+
+    def close(self):
+        for process in self.processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
@@ -0,0 +1,202 @@
+"""
+Redfin Property Scraper - Pipeline
+Discovery, extraction and persistence as stages joined by bounded queues, so
+the next search page loads while the current one is still being extracted
+"""
+
+import queue
+import threading
+import time
+
+
+class StageStats:
+    """Items through one stage and the queue feeding it"""
+
+    def __init__(self, name, in_queue=None):
+        self.name = name
+        self.queue = in_queue
+        self.items = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, count=1):
+        with self._lock:
+            self.items += count
+
+    def snapshot(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'queue_capacity': self.queue.maxsize if self.queue is not None else 0,
+            'items': self.items,
+            'per_minute': round(self.items / elapsed * 60, 1),
+        }
+
+
+class ScrapePipeline:
+    """discover -> extract (N workers) -> write (one thread, batched)
+
+    submit(url) blocks while the URL queue is full and extraction workers
+    block while the record queue is full, so memory stays flat however far
+    discovery runs ahead. make_extractor is as for DetailWorkerPool (called
+    once per worker thread); write_batch(records) only ever runs on the
+    writer thread, which takes whatever records are waiting, up to
+    batch_size, per call. write_batch returns how many records it saved;
+    saved totals that, so callers count saves without shared counters.
+    """
+
+    def __init__(self, make_extractor, write_batch, workers=2, url_queue_size=None,
+                 record_queue_size=None, batch_size=20, metrics=None):
+        self.make_extractor = make_extractor
+        self.write_batch = write_batch
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.metrics = metrics
+        # About two search pages of URLs in flight by default
+        self.urls = queue.Queue(maxsize=url_queue_size or 80)
+        self.records = queue.Queue(maxsize=record_queue_size or max(self.batch_size * 2, self.workers * 2))
+        self.stages = {
+            'discover': StageStats('discover'),
+            'extract': StageStats('extract', self.urls),
+            'write': StageStats('write', self.records),
+        }
+        self.batches = 0
+        self.saved = 0  # Sum of write_batch results; only the writer thread adds
+        self.submitted = set()
+        self.threads = []
+
+    def start(self):
+        """Start the extraction workers and the writer"""
+        if self.threads:
+            return
+        for worker_id in range(1, self.workers + 1):
+            thread = threading.Thread(target=self._extract_worker, args=(worker_id,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        writer = threading.Thread(target=self._writer, daemon=True)
+        writer.start()
+        self.threads.append(writer)
+        print(f"✓ Pipeline started: {self.workers} extraction workers, "
+              f"queues {self.urls.maxsize} URLs / {self.records.maxsize} records")
+
+    def submit(self, url):
+        """Queue a discovered URL (blocks while extraction is behind); False if already queued"""
+        if url in self.submitted:
+            return False
+        self.start()
+        self.submitted.add(url)
+        self.urls.put(url)
+        self.stages['discover'].add()
+        return True
+
+    def _extract_worker(self, worker_id):
+        try:
+            extractor = self.make_extractor()
+        except Exception as e:
+            print(f"  ✗ Pipeline worker {worker_id} could not start a browser: {e}")
+            extractor = None
+
+        try:
+            while True:
+                url = self.urls.get()
+                if url is None:
+                    self.urls.task_done()
+                    break
+
+                if extractor is None:
+                    property_data = {'url': url, 'error': 'Worker browser unavailable'}
+                else:
+                    try:
+                        property_data = extractor.extract_property(url)
+                    except Exception as e:
+                        property_data = {'url': url, 'error': str(e)}
+                self.records.put(property_data)
+                self.stages['extract'].add()
+                self.urls.task_done()
+        finally:
+            if extractor is not None:
+                try:
+                    extractor.close()
+                except Exception:
+                    pass
+
+    def _writer(self):
+        while True:
+            record = self.records.get()
+            if record is None:
+                self.records.task_done()
+                break
+
+            # Take what is already waiting: batches grow only when writes fall behind
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    record = self.records.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self.records.put(None)
+                    self.records.task_done()
+                    break
+                batch.append(record)
+
+            try:
+                self.saved += self.write_batch(batch) or 0
+            except Exception as e:
+                print(f"  ✗ Pipeline writer error: {e}")
+            self.batches += 1
+            self.stages['write'].add(len(batch))
+            for _ in batch:
+                self.records.task_done()
+            self.publish()
+
+    def drain(self):
+        """Wait until every submitted URL has been extracted and written"""
+        self.urls.join()
+        self.records.join()
+        self.publish()
+
+    def stats(self):
+        """{stage: {queue_depth, queue_capacity, items, per_minute}}"""
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
+
+    def publish(self):
+        """Copy queue depths and throughput into the run metrics"""
+        if self.metrics is None:
+            return
+        for name, stats in self.stats().items():
+            self.metrics.gauge(f"pipeline_{name}_queue_depth", stats['queue_depth'])
+            self.metrics.gauge(f"pipeline_{name}_per_minute", stats['per_minute'])
+
+    def report(self):
+        if not self.stages['discover'].items:
+            return
+        print("\n🔀 Pipeline (queue depth / capacity, items, per minute):")
+        for name, stats in self.stats().items():
+            print(f"   {name}: {stats['queue_depth']}/{stats['queue_capacity']}, "
+                  f"{stats['items']} items, {stats['per_minute']}/min")
+        print(f"   Writer batches: {self.batches}")
+
+    def close(self, discard_pending=False):
+        """Finish queued work (or drop unstarted URLs), then stop the workers and the writer"""
+        if not self.threads:
+            return
+        if discard_pending:
+            # Dropped URLs never reach processed_urls, so --resume redoes them
+            dropped = 0
+            while True:
+                try:
+                    self.urls.get_nowait()
+                except queue.Empty:
+                    break
+                self.urls.task_done()
+                dropped += 1
+            if dropped:
+                print(f"  ⚠ Dropped {dropped} queued URLs that were not extracted yet")
+        for _ in range(self.workers):
+            self.urls.put(None)
+        for thread in self.threads[:-1]:
+            thread.join(timeout=60)
+        self.records.put(None)
+        self.threads[-1].join(timeout=60)
+        self.threads = []
@@ -0,0 +1,105 @@
+"""
+Redfin Property Scraper - Price Planner
+Plan every price phase up front from a cumulative result-count curve
+"""
+
+
+class PricePlanner:
+    """Split [min_price, max_price] into phases of at most target_max results
+
+    count_fn(min_price, price) returns the number of homes between the run's
+    min_price and price, i.e. one point of the cumulative count curve. The
+    planner probes a coarse geometric grid once, refines only the intervals
+    that hold more than target_max homes, then cuts phases greedily.
+    Points seeded from an earlier run (seed) are reused without probing.
+    """
+
+    def __init__(self, count_fn, min_price, max_price, target_max=369, step=50000, grid_points=12):
+        self.count_fn = count_fn
+        self.min_price = min_price
+        self.max_price = max_price
+        self.target_max = target_max
+        self.step = step
+        self.grid_points = grid_points
+        self.curve = {}  # price -> cumulative count from min_price
+        self.probes = 0
+
+    def _round(self, price):
+        return max(self.min_price, min(self.max_price, (price // self.step) * self.step))
+
+    def initial_grid(self):
+        """Geometric grid: prices are skewed, so points are denser at the low end"""
+        ratio = (self.max_price / max(self.min_price, self.step)) ** (1.0 / max(1, self.grid_points - 1))
+        grid = {self.min_price, self.max_price}
+        price = max(self.min_price, self.step)
+        for _ in range(self.grid_points):
+            grid.add(self._round(int(price)))
+            price *= ratio
+        return sorted(grid)
+
+    def seed(self, points):
+        """Preload known {price: cumulative count} points, e.g. from ProbeCountCache"""
+        for price, count in points.items():
+            if self.min_price <= price <= self.max_price:
+                self.curve.setdefault(price, count)
+
+    def covered(self, price):
+        """True if known neighbours already bracket price within target_max homes"""
+        below = [p for p in self.curve if p < price]
+        above = [p for p in self.curve if p > price]
+        if not below or not above:
+            return False
+        return self.curve[min(above)] - self.curve[max(below)] <= self.target_max
+
+    def cumulative(self, price):
+        if price not in self.curve:
+            self.curve[price] = self.count_fn(self.min_price, price)
+            self.probes += 1
+        return self.curve[price]
+
+    def refine(self):
+        """Probe midpoints of intervals that hold more than target_max homes"""
+        while True:
+            points = sorted(self.curve)
+            dense = [(a, b) for a, b in zip(points, points[1:])
+                     if self.curve[b] - self.curve[a] > self.target_max and b - a > self.step]
+            if not dense:
+                return
+            for a, b in dense:
+                mid = self._round((a + b) // 2)
+                if mid <= a:
+                    mid = a + self.step
+                if mid >= b:
+                    continue
+                self.cumulative(mid)
+
+    def plan(self):
+        """Return [(phase_min, phase_max, expected_count), ...] covering the range"""
+        for price in self.initial_grid():
+            if price in (self.min_price, self.max_price) or not self.covered(price):
+                self.cumulative(price)
+        self.refine()
+
+        points = sorted(self.curve)
+        phases = []
+        start_index = 0
+        phase_min = self.min_price
+        while start_index < len(points) - 1:
+            base = self.curve[points[start_index]] if phases else 0
+            end_index = start_index + 1
+            # Extend the phase as far as the curve allows
+            while (end_index + 1 < len(points)
+                   and self.curve[points[end_index + 1]] - base <= self.target_max):
+                end_index += 1
+            phase_max = points[end_index]
+            count = self.curve[phase_max] - base
+            if count > 0 or not phases:
+                phases.append((phase_min, phase_max, count))
+            elif phases:
+                # Empty stretch: fold it into the previous phase
+                prev_min, _, prev_count = phases[-1]
+                phases[-1] = (prev_min, phase_max, prev_count)
+            phase_min = phase_max + 1
+            start_index = end_index
+
+        return phases
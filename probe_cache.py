@@ -0,0 +1,126 @@
+"""
+Redfin Property Scraper - Probe Cache
+Disk-backed cache of search result counts per (filter, price window) so
+reruns on the same region skip most probe page loads
+"""
+
+import json
+import os
+import time
+
+DEFAULT_CACHE_FILE = 'redfin_probe_cache.json'
+
+
+class ProbeCountCache:
+    """Result counts keyed by search URL + filter and a min/max price window
+
+    Entries older than ttl_days are ignored and dropped on the next save.
+    Windows sharing a min price form a cumulative count curve, so a count
+    can also be interpolated between cached neighbours when they bracket it
+    tightly enough (see lookup).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl_days=10):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.entries = {}  # scope -> {"min:max": [count, timestamp]}
+        self.hits = 0
+        self.interpolated = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def scope_for(base_url, base_filter):
+        """Cache scope: the region URL plus the filter without its price parts"""
+        parts = [p for p in (base_filter or '').split(',')
+                 if p and not p.startswith('min-price') and not p.startswith('max-price')]
+        return f"{base_url.rstrip('/')}|{','.join(sorted(parts))}"
+
+    def _fresh(self, stamp, now=None):
+        return ((now or time.time()) - stamp) <= self.ttl_seconds
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                return json.load(fh)
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable probe cache {self.path}: {e}")
+            return {}
+
+    def load(self):
+        now = time.time()
+        for scope, windows in self._read().items():
+            fresh = {key: value for key, value in windows.items() if self._fresh(value[1], now)}
+            if fresh:
+                self.entries[scope] = fresh
+
+    def save(self):
+        """Write the cache atomically (tmp file + rename)"""
+        # Merge what other processes saved meanwhile; our own entries win
+        merged = self._read()
+        for scope, windows in self.entries.items():
+            merged.setdefault(scope, {}).update(windows)
+
+        now = time.time()
+        data = {}
+        for scope, windows in merged.items():
+            fresh = {key: value for key, value in windows.items() if self._fresh(value[1], now)}
+            if fresh:
+                data[scope] = fresh
+
+        # Per-process tmp name: scheduler workers may save at the same time
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
+
+    def put(self, scope, min_price, max_price, count):
+        self.entries.setdefault(scope, {})[f"{min_price}:{max_price}"] = [int(count), time.time()]
+        self.save()
+
+    def curve(self, scope, min_price):
+        """{max_price: count} of every fresh window starting at min_price"""
+        now = time.time()
+        points = {}
+        for key, (count, stamp) in self.entries.get(scope, {}).items():
+            lo, hi = (int(x) for x in key.split(':'))
+            if lo == min_price and self._fresh(stamp, now):
+                points[hi] = count
+        return points
+
+    def lookup(self, scope, min_price, max_price, max_gap=5):
+        """Cached count for the window, or None
+
+        Exact windows are returned as-is. Otherwise the count is interpolated
+        linearly between the nearest cached windows with the same min price,
+        provided they differ by at most max_gap homes (the curve is monotone,
+        so the error is bounded by that gap).
+        """
+        entry = self.entries.get(scope, {}).get(f"{min_price}:{max_price}")
+        if entry and self._fresh(entry[1]):
+            self.hits += 1
+            return entry[0]
+
+        points = self.curve(scope, min_price)
+        below = [p for p in points if p < max_price]
+        above = [p for p in points if p > max_price]
+        if below and above:
+            lo, hi = max(below), min(above)
+            if 0 <= points[hi] - points[lo] <= max_gap:
+                self.interpolated += 1
+                fraction = (max_price - lo) / (hi - lo)
+                return int(round(points[lo] + fraction * (points[hi] - points[lo])))
+
+        self.misses += 1
+        return None
+
+    def report(self):
+        total = self.hits + self.interpolated + self.misses
+        if not total:
+            return
+        print(f"\n💾 Probe cache: {self.hits} hits, {self.interpolated} interpolated, "
+              f"{self.misses} probed ({self.path})")
@@ -0,0 +1,269 @@
+"""
+Redfin Property Scraper - Property Store
+Latest state of every listing in SQLite, keyed by the Redfin listing ID,
+with a price/status history row per change, "changed since" queries and
+the discovery summaries used by incremental runs
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# Fields whose changes get a history row
+TRACKED_FIELDS = ('price', 'listing_status')
+
+# Fields that differ on every visit and don't count as a change
+VOLATILE_FIELDS = {'scrape_date'}
+
+# Status badge / search status words that matter for a listing's summary;
+# anything else ('NEW', 'OPEN SAT 1-3PM', 'Active') is an active listing
+STATUS_WORDS = ('sold', 'pending', 'contingent', 'coming soon', 'under contract', 'off market')
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'run_id INTEGER PRIMARY KEY AUTOINCREMENT, started TEXT, finished TEXT, source TEXT)',
+    'CREATE TABLE IF NOT EXISTS properties ('
+    'listing_id TEXT PRIMARY KEY, url TEXT, status TEXT, price TEXT, heating_type TEXT, '
+    'zip_code TEXT, scrape_date TEXT, first_run INTEGER, last_run INTEGER, changed_run INTEGER, '
+    'data TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS properties_status ON properties (status)',
+    'CREATE INDEX IF NOT EXISTS properties_heating_type ON properties (heating_type)',
+    'CREATE INDEX IF NOT EXISTS properties_zip_code ON properties (zip_code)',
+    'CREATE INDEX IF NOT EXISTS properties_scrape_date ON properties (scrape_date)',
+    'CREATE INDEX IF NOT EXISTS properties_changed_run ON properties (changed_run)',
+    'CREATE TABLE IF NOT EXISTS history ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, listing_id TEXT NOT NULL, run_id INTEGER, '
+    'scrape_date TEXT, price TEXT, status TEXT, change TEXT)',
+    'CREATE INDEX IF NOT EXISTS history_listing ON history (listing_id, run_id)',
+    'CREATE TABLE IF NOT EXISTS summaries ('
+    'listing_id TEXT PRIMARY KEY, summary TEXT NOT NULL, run_id INTEGER)',
+]
+
+
+def listing_id(url):
+    """'12345678' from .../home/12345678, else the URL without query string"""
+    url = (url or '').split('?')[0].split('#')[0].rstrip('/')
+    match = re.search(r'/home/(\d+)$', url)
+    return match.group(1) if match else url
+
+
+def listing_summary(price, status):
+    """'450000|sold' from a homecard ('$450,000', 'SOLD OCT 3, 2026') or a search row
+
+    Only the price digits and a coarse status are kept, so relative badges
+    ('NEW 3 HRS AGO', open house times) don't look like changes.
+    """
+    digits = re.sub(r'\D', '', str(price or ''))
+    text = ' '.join(str(status or '').lower().split())
+    status = next((word for word in STATUS_WORDS if word in text), 'active')
+    return f"{digits or '-'}|{status}"
+
+
+class PropertyStore:
+    """One row per listing (latest values) plus its price/status history
+
+    upsert_many() looks each listing up by primary key, so a save costs
+    O(log n) however many properties the database holds. Changed fields are
+    merged into the stored record; a new listing or a new price or status
+    also appends a history row. Every scraper process that writes is one
+    run, so changed_since() can answer "what changed since the last run".
+    Also usable as a BatchedWriter sink (write/close).
+    """
+
+    def __init__(self, path, source=None):
+        self.path = path
+        self.source = source
+        self.run_id = None  # Started on the first write
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        # The writer thread upserts on a connection opened here
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        """Register this process's run (done automatically on the first write)"""
+        with self._lock:
+            if self.run_id is None:
+                cursor = self.conn.execute('INSERT INTO runs (started, source) VALUES (?, ?)',
+                                           (time.strftime('%Y-%m-%d %H:%M:%S'), self.source))
+                self.conn.commit()
+                self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def get(self, url):
+        """Latest stored record for a listing, or None"""
+        with self._lock:
+            row = self.conn.execute('SELECT data FROM properties WHERE listing_id = ?',
+                                    (listing_id(url),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def upsert_many(self, records):
+        """Insert or update records in one transaction; returns {'new', 'changed', 'unchanged'}"""
+        run_id = self.start_run()
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        with self._lock:
+            for record in records:
+                if 'error' in record or not record.get('url'):
+                    continue
+                counts[self._upsert(record, run_id)] += 1
+            self.conn.commit()
+        for key, value in counts.items():
+            self.counts[key] += value
+        return counts
+
+    def _upsert(self, record, run_id):
+        key = listing_id(record['url'])
+        row = self.conn.execute('SELECT data FROM properties WHERE listing_id = ?', (key,)).fetchone()
+        if row is None:
+            self.conn.execute(
+                'INSERT INTO properties (listing_id, url, status, price, heating_type, zip_code, '
+                'scrape_date, first_run, last_run, changed_run, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, record['url'], record.get('listing_status'), record.get('price'),
+                 record.get('heating_type'), record.get('zip_code'), record.get('scrape_date'),
+                 run_id, run_id, run_id, json.dumps(record, ensure_ascii=False)))
+            self._add_history(key, run_id, record, 'new')
+            return 'new'
+
+        stored = json.loads(row[0])
+        changed = [field for field, value in record.items()
+                   if value is not None and field not in VOLATILE_FIELDS and stored.get(field) != value]
+        merged = {**stored, **{field: value for field, value in record.items() if value is not None}}
+        self.conn.execute(
+            'UPDATE properties SET url = ?, status = ?, price = ?, heating_type = ?, zip_code = ?, '
+            'scrape_date = ?, last_run = ?, changed_run = CASE WHEN ? THEN ? ELSE changed_run END, '
+            'data = ? WHERE listing_id = ?',
+            (merged['url'], merged.get('listing_status'), merged.get('price'), merged.get('heating_type'),
+             merged.get('zip_code'), merged.get('scrape_date'), run_id, bool(changed), run_id,
+             json.dumps(merged, ensure_ascii=False), key))
+        tracked = [field for field in TRACKED_FIELDS if field in changed]
+        if tracked:
+            self._add_history(key, run_id, merged, ','.join(tracked))
+        return 'changed' if changed else 'unchanged'
+
+    def _add_history(self, key, run_id, record, change):
+        self.conn.execute(
+            'INSERT INTO history (listing_id, run_id, scrape_date, price, status, change) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (key, run_id, record.get('scrape_date'), record.get('price'), record.get('listing_status'), change))
+
+    def previous_run(self):
+        """Run before the newest one (0 if there is none): the default for changed_since"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT MAX(run_id) FROM runs WHERE run_id < (SELECT MAX(run_id) FROM runs)').fetchone()
+        return row[0] or 0
+
+    def changed_since(self, run_id=None):
+        """Listings new or changed after run_id (default: in the newest run)
+
+        Each record carries 'change' ('new', 'price', 'listing_status',
+        'price,listing_status' or 'details') and the price and status it had
+        at run_id as 'previous_price' / 'previous_status'.
+        """
+        since = self.previous_run() if run_id is None else run_id
+        results = []
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT listing_id, first_run, data FROM properties WHERE changed_run > ? '
+                'ORDER BY changed_run, listing_id', (since,)).fetchall()
+            for key, first_run, data in rows:
+                record = json.loads(data)
+                previous = self.conn.execute(
+                    'SELECT price, status FROM history WHERE listing_id = ? AND run_id <= ? '
+                    'ORDER BY id DESC LIMIT 1', (key, since)).fetchone()
+                if first_run > since or previous is None:
+                    change = 'new'
+                else:
+                    change = ','.join(field for field, old in zip(TRACKED_FIELDS, previous)
+                                      if record.get(field) != old) or 'details'
+                record['change'] = change
+                record['previous_price'] = previous[0] if previous else None
+                record['previous_status'] = previous[1] if previous else None
+                results.append(record)
+        return results
+
+    def summaries(self, urls):
+        """{url: stored discovery summary} for the listings that have one"""
+        found = {}
+        with self._lock:
+            for url in urls:
+                row = self.conn.execute('SELECT summary FROM summaries WHERE listing_id = ?',
+                                        (listing_id(url),)).fetchone()
+                if row:
+                    found[url] = row[0]
+        return found
+
+    def remember_summaries(self, summaries):
+        """Store {url: summary} for listings whose details are saved or known"""
+        run_id = self.start_run()
+        with self._lock:
+            self.conn.executemany(
+                'INSERT INTO summaries (listing_id, summary, run_id) VALUES (?, ?, ?) '
+                'ON CONFLICT (listing_id) DO UPDATE SET summary = excluded.summary, run_id = excluded.run_id',
+                [(listing_id(url), summary, run_id) for url, summary in summaries.items()])
+            self.conn.commit()
+
+    def history(self, url):
+        """[{run_id, scrape_date, price, status, change}] for one listing, oldest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT run_id, scrape_date, price, status, change FROM history '
+                'WHERE listing_id = ? ORDER BY id', (listing_id(url),)).fetchall()
+        return [dict(zip(('run_id', 'scrape_date', 'price', 'status', 'change'), row)) for row in rows]
+
+    def write(self, records):
+        """BatchedWriter sink hook"""
+        self.upsert_many(records)
+
+    def close(self):
+        """Mark the run finished and close the database"""
+        try:
+            with self._lock:
+                if self.run_id is not None:
+                    self.conn.execute('UPDATE runs SET finished = ? WHERE run_id = ?',
+                                      (time.strftime('%Y-%m-%d %H:%M:%S'), self.run_id))
+                    self.conn.commit()
+                    print(f"✓ Property store: {self.counts['new']} new, {self.counts['changed']} changed, "
+                          f"{self.counts['unchanged']} unchanged (run {self.run_id}, {self.path})")
+                self.conn.close()
+        except Exception:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listings that changed since the last run")
+    parser.add_argument('db', help='property database (--property-db of the scraper)')
+    parser.add_argument('--since', type=int, help='run id (default: the run before the newest)')
+    parser.add_argument('--excel', help='also write the changes to this Excel file')
+    args = parser.parse_args()
+
+    store = PropertyStore(args.db)
+    try:
+        changes = store.changed_since(args.since)
+    finally:
+        store.close()
+
+    print(f"{len(changes)} listings new or changed")
+    for record in changes:
+        was = ''
+        if record['change'] not in ('new', 'details'):
+            was = f" (was {record['previous_price']}, {record['previous_status']})"
+        print(f"   {record['change']}: {record.get('full_address') or record['url']} "
+              f"{record.get('price')}, {record.get('listing_status')}{was}")
+
+    if args.excel and changes:
+        pd.DataFrame(changes).to_excel(args.excel, index=False)
+        print(f"✓ Changes written to {args.excel}")
+
+
+if __name__ == "__main__":
+    main()
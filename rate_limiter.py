@@ -0,0 +1,204 @@
+"""
+Redfin Property Scraper - Rate Limiter
+Per-host token bucket whose rate adapts to how the site responds (AIMD),
+with exponential backoff and jitter after throttling; the bucket can live in
+shared memory so worker processes share one rate
+"""
+
+import multiprocessing
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Error prefix used when a page turns out to be a block/captcha page
+THROTTLED_ERROR = 'Blocked or captcha page'
+
+# Lower-case text fragments of block/captcha pages
+THROTTLE_MARKERS = [
+    'captcha', 'unusual traffic', 'are you a robot', 'access denied',
+    'access to this page has been denied', 'request blocked', 'too many requests',
+]
+
+
+def looks_throttled(text):
+    text = (text or '').lower()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class _HostState:
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.tokens = burst
+        self.last_refill = now
+        self.latency = None  # EWMA of successful request latency
+        self.failures = 0  # Consecutive throttled/failed requests
+        self.backoff_until = 0.0
+
+
+class SharedRateBucket:
+    """One bucket's state in shared memory, for limiters in several processes
+
+    Create it in the parent and pass it to each worker process (Process
+    args), then give it to AdaptiveRateLimiter(shared=...): every process
+    draws from the same tokens and backs off together.
+    """
+
+    def __init__(self, rate, burst=2, context=None):
+        context = context or multiprocessing.get_context('spawn')
+        self.lock = context.Lock()
+        # rate, tokens, last_refill, latency (-1: none yet), failures, backoff_until
+        self.values = context.Array('d', [rate, burst, time.time(), -1.0, 0.0, 0.0], lock=False)
+
+
+class _SharedHostState:
+    """_HostState view of a SharedRateBucket (timestamps are time.time())"""
+
+    _INDEX = {'rate': 0, 'tokens': 1, 'last_refill': 2, 'latency': 3, 'failures': 4, 'backoff_until': 5}
+
+    def __init__(self, values):
+        object.__setattr__(self, 'values', values)
+
+    def __getattr__(self, name):
+        value = self.values[self._INDEX[name]]
+        if name == 'latency':
+            return None if value < 0 else value
+        return int(value) if name == 'failures' else value
+
+    def __setattr__(self, name, value):
+        if name == 'latency' and value is None:
+            value = -1.0
+        self.values[self._INDEX[name]] = value
+
+
+class AdaptiveRateLimiter:
+    """Token bucket per host, shared by every worker thread of a process
+
+    Each success adds `increase` requests/s to the host's rate (up to
+    max_rate); a throttled, failed or much slower than usual request
+    multiplies it by `decrease` (down to min_rate). Throttling also starts an
+    exponential backoff with jitter before the host's next request.
+
+    With shared (a SharedRateBucket) all hosts use that one bucket, so N
+    worker processes together stay at the configured rate instead of N
+    times it. Counts in report() are still this process's own.
+
+    clock and sleep default to the real ones; tests pass a fake pair.
+    """
+
+    def __init__(self, rate=1.0, min_rate=0.2, max_rate=4.0, burst=2,
+                 increase=0.05, decrease=0.5, slow_factor=2.5,
+                 backoff_base=5.0, backoff_cap=300.0, shared=None, clock=None, sleep=time.sleep):
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hosts = {}
+        self.counts = {'ok': 0, 'slow': 0, 'throttled': 0, 'error': 0}
+        self.backoff_seconds = 0.0
+        self.shared = shared
+        self._sleep = sleep
+        if shared is not None:
+            # Cross-process lock and a clock that means the same in every process
+            self._lock = shared.lock
+            self._clock = clock or time.time
+            self.hosts['shared'] = _SharedHostState(shared.values)
+        else:
+            self._lock = threading.Lock()
+            self._clock = clock or time.monotonic
+
+    def _host(self, url):
+        if self.shared is not None:
+            return self.hosts['shared']
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = _HostState(self.initial_rate, self.burst, self._clock())
+        return self.hosts[host]
+
+    def backoff_delay(self, attempt):
+        """Exponential delay with equal jitter: half fixed, half random"""
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** max(0, attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def acquire(self, url):
+        """Block until the host's bucket has a token (and any backoff is over)"""
+        while True:
+            with self._lock:
+                state = self._host(url)
+                now = self._clock()
+                state.tokens = min(self.burst, state.tokens + max(0.0, now - state.last_refill) * state.rate)
+                state.last_refill = now
+
+                if state.backoff_until > now:
+                    delay = state.backoff_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                else:
+                    delay = (1 - state.tokens) / state.rate
+            self._sleep(delay)
+
+    def record(self, url, latency=None, outcome='ok', retry_after=None):
+        """Feed back one request: outcome is 'ok', 'throttled' or 'error'
+
+        retry_after (seconds, from the server's Retry-After header) replaces
+        the computed backoff of a throttled request.
+        """
+        with self._lock:
+            state = self._host(url)
+
+            if outcome == 'ok' and latency is not None and state.latency is not None \
+                    and latency > state.latency * self.slow_factor:
+                outcome = 'slow'
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+            if outcome == 'ok':
+                state.failures = 0
+                state.rate = min(self.max_rate, state.rate + self.increase)
+                if latency is not None:
+                    state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            elif outcome == 'slow':
+                state.rate = max(self.min_rate, state.rate * (1 + self.decrease) / 2)
+            else:
+                state.failures += 1
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                if outcome == 'throttled' or state.failures >= 3:
+                    if outcome == 'throttled' and retry_after is not None:
+                        delay = retry_after
+                    else:
+                        delay = self.backoff_delay(state.failures)
+                    state.backoff_until = max(state.backoff_until, self._clock() + delay)
+                    self.backoff_seconds += delay
+                    print(f"  ⚠ Backing off {delay:.0f}s ({outcome}, rate now {state.rate:.2f}/s)")
+
+    def report(self):
+        if not any(self.counts.values()):
+            return
+        print("\n🚦 Rate limiter:")
+        print(f"   Requests: {self.counts['ok']} ok, {self.counts['slow']} slow, "
+              f"{self.counts['throttled']} throttled, {self.counts['error']} failed")
+        print(f"   Backoff: {self.backoff_seconds:.0f}s total")
+        for host, state in sorted(self.hosts.items()):
+            if host == 'shared':
+                host = 'all hosts, shared with other processes'
+            latency = f", latency ~{state.latency:.1f}s" if state.latency is not None else ""
+            print(f"   {host}: {state.rate:.2f} requests/s{latency}")
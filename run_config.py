@@ -0,0 +1,199 @@
+"""
+Redfin Property Scraper - Run Configuration
+Command-line options and TOML config files for unattended (cron) runs
+"""
+
+import argparse
+import tomllib
+
+from discovery import parse_price
+
+# Config keys -> (TOML section, key). Flat keys at the top level work too.
+CONFIG_KEYS = {
+    'url': ('search', 'url'),
+    'base_url': ('search', 'base_url'),
+    'base_filter': ('search', 'base_filter'),
+    'incremental': ('search', 'incremental'),
+    'min_price': ('prices', 'min'),
+    'max_price': ('prices', 'max'),
+    'auto_phases': ('prices', 'auto_phases'),
+    'target_max_results': ('prices', 'target_max'),
+    'target_min_results': ('prices', 'target_min'),
+    'phase_planning': ('prices', 'planning'),
+    'excel_file': ('output', 'excel_file'),
+    'storage_backend': ('output', 'storage'),
+    'save_batch_size': ('output', 'batch_size'),
+    'save_flush_seconds': ('output', 'flush_seconds'),
+    'excel_export_seconds': ('output', 'export_every'),
+    'parquet_dir': ('output', 'parquet_dir'),
+    'property_db': ('output', 'property_db'),
+    'discovery_mode': ('concurrency', 'discovery'),
+    'detail_engine': ('concurrency', 'engine'),
+    'detail_workers': ('concurrency', 'workers'),
+    'phase_workers': ('concurrency', 'phase_workers'),
+    'async_concurrency': ('concurrency', 'async_tabs'),
+    'requests_per_second': ('concurrency', 'requests_per_second'),
+    'max_requests_per_second': ('concurrency', 'max_requests_per_second'),
+    'use_http_fast_path': ('concurrency', 'http_fast_path'),
+    'use_pipeline': ('concurrency', 'pipeline'),
+    'headless': ('browser', 'headless'),
+    'max_pages_per_browser': ('browser', 'max_pages_per_browser'),
+    'metrics_file': ('metrics', 'file'),
+    'metrics_port': ('metrics', 'port'),
+}
+
+EXAMPLE_CONFIG = """\
+# python main.py --config nassau.toml
+[search]
+url = "https://www.redfin.com/county/1974/NY/Nassau-County/filter/property-type=house,include=sold-1yr"
+incremental = true     # revisit known listings only when price or status changed
+
+[prices]
+min = "50k"
+max = "10m"
+auto_phases = "auto"   # true, false or "auto" (phases only when > target_max)
+target_max = 369
+
+[output]
+excel_file = "nassau_oil.xlsx"
+storage = "jsonl"      # or "sqlite"
+batch_size = 25        # journal group commit: every 25 properties or
+flush_seconds = 2.0    # 2 seconds, whichever comes first
+# export_every = 300   # also rewrite the xlsx every 5 minutes (default: phase/run end)
+# parquet_dir = "parquet"  # also append to a partitioned Parquet dataset (needs pyarrow)
+# property_db = "nassau.properties.db"  # latest state + price/status history per listing
+
+[concurrency]
+discovery = "api"      # or "browser"
+engine = "selenium"    # or "async"
+workers = 2
+phase_workers = 2
+http_fast_path = true
+pipeline = true        # extract/save in the background while the next page loads
+
+[browser]
+headless = true
+
+[metrics]
+file = "nassau.prom"   # default: <excel name>.metrics.json
+# port = 9108          # live /metrics endpoint
+"""
+
+
+def load_config(path):
+    """Read a TOML config into a flat {setting: value} dict"""
+    with open(path, 'rb') as fh:
+        data = tomllib.load(fh)
+    return settings_from_table(data, path)
+
+
+def settings_from_table(data, source='config', extra_keys=()):
+    """Flatten one TOML table (sections or flat setting names) into settings"""
+    settings = {}
+    for name, (section, key) in CONFIG_KEYS.items():
+        if name in data:
+            settings[name] = data[name]
+        elif key in data.get(section, {}):
+            settings[name] = data[section][key]
+
+    unknown = (set(data) - set(CONFIG_KEYS) - set(extra_keys)
+               - {section for section, _ in CONFIG_KEYS.values()})
+    for key in sorted(unknown):
+        print(f"⚠ Unknown config key '{key}' in {source}, ignoring")
+    return settings
+
+
+def split_search_url(url):
+    """('https://.../Nassau-County', 'a=b,c=d') from a Redfin search URL"""
+    url = url.split('?')[0].rstrip('/')
+    if '/filter/' not in url:
+        return url.split('/page-')[0], ''
+    base_url, _, base_filter = url.partition('/filter/')
+    return base_url, base_filter.split('/page-')[0]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Redfin scraper for oil-heated properties. Without --config or "
+                    "any setting flag it runs interactively.",
+        epilog="Example config:\n\n" + EXAMPLE_CONFIG,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--resume', metavar='EXCEL_FILE',
+                        help="continue the interrupted run recorded in EXCEL_FILE's checkpoint")
+    parser.add_argument('--config', metavar='FILE', help='TOML run configuration')
+    parser.add_argument('--url', help='search URL including /filter/... (replaces manual filter selection)')
+    parser.add_argument('--base-filter', dest='base_filter', help="filter segment, e.g. 'property-type=house,include=sold-1yr'")
+    parser.add_argument('--excel', dest='excel_file', help='output Excel file')
+    parser.add_argument('--storage', dest='storage_backend', choices=['jsonl', 'sqlite'], help='journal backend')
+    parser.add_argument('--parquet', dest='parquet_dir', metavar='DIR',
+                        help='also write a Parquet dataset partitioned by region/day/status')
+    parser.add_argument('--property-db', dest='property_db', metavar='FILE',
+                        help='SQLite store of every saved listing with price/status history')
+    parser.add_argument('--incremental', action='store_true', default=None,
+                        help='only open new listings and known ones whose price or status changed')
+    parser.add_argument('--min-price', dest='min_price', help='e.g. 50k')
+    parser.add_argument('--max-price', dest='max_price', help='e.g. 10m')
+    parser.add_argument('--auto-phases', dest='auto_phases', choices=['yes', 'no', 'auto'],
+                        help='split the price range into phases of at most --target-max homes')
+    parser.add_argument('--target-max', dest='target_max_results', type=int, help='homes per phase (default: 369)')
+    parser.add_argument('--discovery', dest='discovery_mode', choices=['browser', 'api'])
+    parser.add_argument('--engine', dest='detail_engine', choices=['selenium', 'async'])
+    parser.add_argument('--workers', dest='detail_workers', type=int, help='parallel detail-page browsers')
+    parser.add_argument('--phase-workers', dest='phase_workers', type=int, help='parallel phase processes')
+    parser.add_argument('--http-fast-path', dest='use_http_fast_path', action='store_true', default=None)
+    parser.add_argument('--pipeline', dest='use_pipeline', action='store_true', default=None,
+                        help='overlap page discovery, extraction and saving')
+    parser.add_argument('--headless', action='store_true', default=None)
+    parser.add_argument('--metrics-file', dest='metrics_file',
+                        help='stage timings at run end: .json, or .prom for a Prometheus textfile')
+    parser.add_argument('--metrics-port', dest='metrics_port', type=int, help='serve live /metrics on this port')
+    return parser
+
+
+def resolve_settings(args):
+    """Config file values overridden by command-line flags"""
+    settings = load_config(args.config) if args.config else {}
+    if args.base_filter is not None and args.url is None and settings.get('url'):
+        # --base-filter replaces the filter of the config's url, not the other way round
+        settings['base_url'] = split_search_url(settings.pop('url'))[0]
+    for name in CONFIG_KEYS:
+        value = getattr(args, name, None)
+        if value is not None:
+            settings[name] = value
+    return normalize_settings(settings)
+
+
+def normalize_settings(settings):
+    """Split the search URL, parse prices and the auto_phases choice"""
+    settings = dict(settings)
+    if settings.get('url'):
+        # The url carries both, so it replaces any separate base_url/base_filter
+        settings['base_url'], settings['base_filter'] = split_search_url(settings.pop('url'))
+
+    # A price range inside the filter is used unless one was given explicitly
+    for part in (settings.get('base_filter') or '').split(','):
+        key, _, value = part.partition('=')
+        if key == 'min-price':
+            settings.setdefault('min_price', value)
+        elif key == 'max-price':
+            settings.setdefault('max_price', value)
+
+    # Prices may be written as in the URL (50k, 1.5m) or as plain numbers
+    for name in ('min_price', 'max_price'):
+        if name in settings:
+            settings[name] = parse_price(str(settings[name]))
+
+    if 'auto_phases' in settings:
+        value = str(settings['auto_phases']).lower()
+        settings['auto_phases'] = 'auto' if value == 'auto' else value in ('yes', 'true', 'y', '1')
+
+    excel_file = settings.get('excel_file')
+    if excel_file and not excel_file.endswith('.xlsx'):
+        settings['excel_file'] = excel_file + '.xlsx'
+    return settings
+
+
+def is_unattended(args):
+    """Any config file or setting flag means a configured run without prompts"""
+    return bool(args.config) or any(getattr(args, name, None) is not None for name in CONFIG_KEYS)
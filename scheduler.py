@@ -0,0 +1,408 @@
+"""
+Redfin Property Scraper - Job Scheduler
+Scrape many regions/filters in one run: every job is split into price phases
+and the (job, phase) units are shared out across browser worker processes
+"""
+
+import argparse
+import multiprocessing
+import queue
+import time
+import tomllib
+from collections import deque
+
+from rate_limiter import SharedRateBucket
+from run_config import settings_from_table, normalize_settings, split_search_url
+
+JOB_KEYS = ('name', 'priority')
+
+# Tries per (job, unit) before it is given up for this run
+MAX_UNIT_ATTEMPTS = 3
+
+EXAMPLE_JOBS = """\
+# python scheduler.py counties.toml --workers 4
+[defaults]                 # any run_config setting, applied to every job
+discovery_mode = "api"
+headless = true
+
+[[jobs]]
+name = "nassau"
+url = "https://www.redfin.com/county/1974/NY/Nassau-County/filter/include=sold-1yr"
+excel_file = "nassau_oil.xlsx"
+priority = 2               # share of workers relative to other jobs
+
+[[jobs]]
+name = "suffolk"
+url = "https://www.redfin.com/county/1991/NY/Suffolk-County/filter/include=sold-1yr"
+excel_file = "suffolk_oil.xlsx"
+"""
+
+
+class TaggedQueue:
+    """Result queue handed to a worker's scraper: tags messages with the job"""
+
+    def __init__(self, results, worker_id, job):
+        self.results = results
+        self.worker_id = worker_id
+        self.job = job
+
+    def put(self, message):
+        kind, payload = message
+        self.results.put((kind, self.worker_id, self.job, payload))
+
+
+def run_scheduler_worker(worker_id, tasks, results, rate_bucket=None):
+    """Worker process: one browser, reconfigured whenever the job changes"""
+    from main import RedfinScraperComplete
+
+    scraper = None
+    try:
+        while True:
+            results.put(('ready', worker_id, None, None))
+            task = tasks.get()
+            if task is None:
+                break
+            kind, job, settings, payload = task
+
+            try:
+                if scraper is None or scraper.result_queue.job != job:
+                    previous = scraper
+                    scraper = RedfinScraperComplete(excel_file=settings['excel_file'])
+                    scraper.apply_settings(settings)
+                    scraper.result_queue = TaggedQueue(results, worker_id, job)
+                    if rate_bucket is not None:
+                        scraper.use_shared_rate_bucket(rate_bucket)
+                    # Read-only dedup view; the parent owns each job's journal
+                    scraper.load_dedup_index()
+                    scraper.store.close()
+                    scraper.store = None
+                    if previous is not None and previous.headless == scraper.headless:
+                        scraper.driver, scraper.wait = previous.driver, previous.wait
+                        scraper.detail_handle = previous.detail_handle
+                        previous.driver = None
+                    if previous is not None:
+                        _close_worker_scraper(previous)
+                    if scraper.driver is None:
+                        scraper.setup_driver()
+
+                if kind == 'plan':
+                    phases = scraper.plan_price_phases(scraper.min_price, scraper.max_price)
+                    results.put(('plan', worker_id, job, phases))
+                else:
+                    phase_number, phase_min, phase_max = payload
+                    scraper.current_phase = phase_number
+                    scraper.scrape_phase(phase_min, phase_max)
+                    results.put(('phase', worker_id, job, scraper.phases_completed[-1]))
+            except Exception as e:
+                print(f"  ✗ [worker {worker_id}] {job} {kind} failed: {e}")
+                results.put(('failed', worker_id, job, {'kind': kind, 'payload': payload, 'error': str(e)}))
+    finally:
+        if scraper is not None:
+            _close_worker_scraper(scraper)
+        results.put(('done', worker_id, None, None))
+
+
+def _close_worker_scraper(scraper):
+    for closer in (scraper.detail_pool, scraper.async_runner, scraper.listings, scraper):
+        if closer is not None:
+            try:
+                closer.close()
+            except Exception:
+                pass
+    if scraper.dedup is not None:
+        scraper.dedup.close()
+
+
+class Job:
+    """One region + filter + price range, and its progress"""
+
+    def __init__(self, name, settings, priority=1):
+        self.name = name
+        self.settings = settings
+        self.priority = max(1, priority)
+        self.writer = None
+        self.pending = deque()  # ('plan', None) or ('phase', (number, min, max))
+        self.phases_total = None
+        self.phases_done = 0
+        self.failed = 0
+        self.attempts = {}  # (kind, payload) -> failed tries
+        self.in_flight = 0
+        self.dispatched = 0
+        self.properties = 0
+        self.oil_saved = 0
+        self.started = None
+        self.finished = None
+
+    @property
+    def complete(self):
+        return not self.pending and not self.in_flight and self.phases_total is not None
+
+    def throughput(self):
+        """Properties per minute since the job's first unit started"""
+        if not self.started:
+            return 0.0
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.properties / elapsed * 60 if elapsed > 0 else 0.0
+
+    def progress_line(self):
+        phases = f"{self.phases_done}/{self.phases_total}" if self.phases_total is not None else "planning"
+        return (f"[{self.name}] phases {phases} · {self.properties} properties · "
+                f"{self.oil_saved} oil · {self.throughput():.1f}/min")
+
+
+class JobScheduler:
+    """Share (job, phase) units across worker processes
+
+    Planning units go first since they unlock the rest. Phase units go to
+    the job with the lowest dispatched/priority ratio, so a priority-2 job
+    gets about twice the workers of a priority-1 job and none starves.
+    The parent process is the only writer for every job's journal.
+    """
+
+    def __init__(self, jobs, workers=2, report_every=60):
+        self.jobs = {job.name: job for job in jobs}
+        self.workers = max(1, workers)
+        self.report_every = report_every
+        self.context = multiprocessing.get_context('spawn')
+        # Every job hits the same site: all workers draw from one bucket,
+        # starting at the most conservative job's rate
+        self.rate_bucket = SharedRateBucket(
+            min(job.settings.get('requests_per_second', 1.0) for job in jobs) if jobs else 1.0,
+            context=self.context)
+        self.processes = {}
+        self.task_queues = {}
+        self.assigned = {}
+        self.idle = deque()
+
+    def prepare(self, job):
+        """Open the job's writer and queue its plan (or the checkpointed plan)"""
+        from main import RedfinScraperComplete
+
+        writer = RedfinScraperComplete(excel_file=job.settings['excel_file'])
+        writer.apply_settings(job.settings)
+        writer.load_dedup_index()
+        job.writer = writer
+
+        state = writer.checkpoint.load()
+        if state and state.get('status') == 'running' and state.get('phase_plan'):
+            # Pick up an interrupted scheduler run of the same job
+            writer.phase_plan = [tuple(phase) for phase in state['phase_plan']]
+            writer.phases_completed = state.get('phases_completed', [])
+            writer.properties_saved_count = state.get('properties_saved_count', 0)
+            self.queue_phases(job, writer.phase_plan)
+            print(f"✓ [{job.name}] Resuming: {job.phases_done}/{job.phases_total} phases already done")
+        else:
+            job.pending.append(('plan', None))
+
+    def queue_phases(self, job, phases):
+        writer = job.writer
+        writer.phase_plan = [tuple(phase) for phase in phases]
+        done = {(phase['min_price'], phase['max_price']) for phase in writer.phases_completed}
+        job.phases_total = len(phases)
+        job.phases_done = len(done)
+        for number, (phase_min, phase_max, _count) in enumerate(phases, 1):
+            if (phase_min, phase_max) not in done:
+                job.pending.append(('phase', (number, phase_min, phase_max)))
+        writer.use_auto_phases = True
+        writer.save_checkpoint()
+
+    def next_unit(self):
+        """(job, kind, payload) to run next, or None if nothing is pending"""
+        ready = [job for job in self.jobs.values() if job.pending]
+        if not ready:
+            return None
+        planning = [job for job in ready if job.pending[0][0] == 'plan']
+        if planning:
+            job = max(planning, key=lambda j: j.priority)
+        else:
+            job = min(ready, key=lambda j: ((j.dispatched + j.in_flight) / j.priority, -j.priority))
+        kind, payload = job.pending.popleft()
+        return job, kind, payload
+
+    def dispatch(self):
+        while self.idle:
+            unit = self.next_unit()
+            if unit is None:
+                return
+            job, kind, payload = unit
+            worker_id = self.idle.popleft()
+            job.in_flight += 1
+            job.dispatched += 1
+            if job.started is None:
+                job.started = time.monotonic()
+            self.assigned[worker_id] = (job.name, kind, payload)
+            self.task_queues[worker_id].put((kind, job.name, job.settings, payload))
+
+    def finish_unit(self, worker_id, job):
+        self.assigned.pop(worker_id, None)
+        job.in_flight -= 1
+        if job.complete and job.finished is None:
+            job.finished = time.monotonic()
+            job.writer.export_excel()
+            if job.failed:
+                # Leave the checkpoint 'running' so a rerun retries the missing phases
+                job.writer.save_checkpoint()
+                print(f"\n⚠ Job finished with {job.failed} failed units "
+                      f"(rerun the job file to retry them): {job.progress_line()}")
+            else:
+                job.writer.save_checkpoint(status='complete')
+                print(f"\n✓ Job finished: {job.progress_line()}")
+
+    def handle(self, kind, worker_id, job_name, payload):
+        if kind == 'ready':
+            self.idle.append(worker_id)
+            return
+        job = self.jobs.get(job_name)
+
+        if kind == 'property':
+            job.properties += 1
+            try:
+                if job.writer.handle_property_result(payload):
+                    job.oil_saved += 1
+            except Exception as e:
+                print(f"  ✗ [{job.name}] Error processing property: {e}")
+        elif kind == 'summaries':
+            job.writer.track_summaries(*payload)
+        elif kind == 'plan':
+            self.queue_phases(job, payload)
+            print(f"✓ [{job.name}] Planned {job.phases_total} phases")
+            self.finish_unit(worker_id, job)
+        elif kind == 'phase':
+            job.phases_done += 1
+            job.writer.flush_writer()
+            job.writer.phases_completed.append(payload)
+            job.writer.processed_urls.clear()
+            job.writer.save_checkpoint()
+            job.writer.export_excel()
+            print(f"✓ {job.progress_line()}")
+            self.finish_unit(worker_id, job)
+        elif kind == 'failed':
+            unit = (payload['kind'], payload['payload'])
+            job.attempts[unit] = job.attempts.get(unit, 0) + 1
+            if job.attempts[unit] < MAX_UNIT_ATTEMPTS:
+                print(f"  → [{job.name}] Retrying {payload['kind']} "
+                      f"(attempt {job.attempts[unit] + 1}/{MAX_UNIT_ATTEMPTS})")
+                job.pending.append(unit)
+            else:
+                job.failed += 1
+                print(f"  ✗ [{job.name}] Giving up on {payload['kind']} {payload['payload'] or ''}: "
+                      f"{payload['error']}")
+                if payload['kind'] == 'plan':
+                    # No plan means no phases: the job ends, and is re-planned on rerun
+                    job.phases_total = job.phases_total or 0
+            self.finish_unit(worker_id, job)
+
+    def report(self):
+        print("\n📊 Job progress:")
+        for job in sorted(self.jobs.values(), key=lambda j: -j.priority):
+            print(f"   {job.progress_line()}" + (f" · {job.failed} failed" if job.failed else ""))
+
+    def reap_dead_workers(self):
+        """Count the unit of a crashed worker as failed; False if none are left"""
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            unit = self.assigned.pop(worker_id, None)
+            if unit is not None:
+                job = self.jobs[unit[0]]
+                print(f"✗ Worker {worker_id} died during {job.name} {unit[1]}")
+                self.handle('failed', worker_id, job.name, {'kind': unit[1], 'payload': unit[2], 'error': 'worker died'})
+            del self.processes[worker_id]
+        return bool(self.processes)
+
+    def run(self):
+        for job in self.jobs.values():
+            self.prepare(job)
+
+        for worker_id in range(1, self.workers + 1):
+            self.task_queues[worker_id] = self.context.Queue()
+        results = self.context.Queue()
+        for worker_id, tasks in self.task_queues.items():
+            process = self.context.Process(target=run_scheduler_worker,
+                                           args=(worker_id, tasks, results, self.rate_bucket), daemon=True)
+            process.start()
+            self.processes[worker_id] = process
+        print(f"✓ Started {self.workers} workers for {len(self.jobs)} jobs")
+
+        last_report = time.monotonic()
+        try:
+            while not all(job.complete for job in self.jobs.values()):
+                try:
+                    kind, worker_id, job_name, payload = results.get(timeout=5)
+                    self.handle(kind, worker_id, job_name, payload)
+                except queue.Empty:
+                    if not self.reap_dead_workers():
+                        print("⚠ All workers exited early")
+                        break
+                self.dispatch()
+
+                if time.monotonic() - last_report >= self.report_every:
+                    self.report()
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            print("\n\n⚠ Scheduler interrupted (Ctrl+C); rerun the same job file to resume")
+        finally:
+            self.close()
+            self.report()
+
+    def close(self):
+        for tasks in self.task_queues.values():
+            tasks.put(None)
+        for process in self.processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self.processes = {}
+        for job in self.jobs.values():
+            if job.writer is None:
+                continue
+            job.writer.close_writer()
+            if job.writer.dedup is not None:
+                job.writer.dedup.close()
+
+
+def load_jobs(path):
+    """Jobs from a TOML file with [defaults] and [[jobs]] tables"""
+    with open(path, 'rb') as fh:
+        data = tomllib.load(fh)
+
+    defaults = settings_from_table(data.get('defaults', {}), f"{path} [defaults]")
+    jobs = []
+    for i, table in enumerate(data.get('jobs', []), 1):
+        name = table.get('name') or f"job{i}"
+        settings = dict(defaults)
+        job_settings = settings_from_table(table, f"{path} job '{name}'", extra_keys=JOB_KEYS)
+        if 'url' not in job_settings and settings.get('url') and (
+                'base_url' in job_settings or 'base_filter' in job_settings):
+            # The job's own base_url/base_filter win over the defaults' url
+            settings['base_url'], settings['base_filter'] = split_search_url(settings.pop('url'))
+        settings.update(job_settings)
+        settings = normalize_settings(settings)
+        settings.setdefault('excel_file', f"{name}_oil_properties.xlsx")
+        if 'base_url' not in settings:
+            print(f"⚠ Job '{name}' has no url/base_url, skipping")
+            continue
+        jobs.append(Job(name, settings, priority=int(table.get('priority', 1))))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run scraping jobs for many regions/filters on a shared worker pool",
+        epilog="Example job file:\n\n" + EXAMPLE_JOBS,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('jobs_file', help='TOML file with [[jobs]] entries')
+    parser.add_argument('--workers', type=int, default=2, help='browser worker processes (default: 2)')
+    parser.add_argument('--report-every', type=int, default=60, help='seconds between progress reports')
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs_file)
+    if not jobs:
+        print("✗ No jobs to run")
+        return
+    JobScheduler(jobs, workers=args.workers, report_every=args.report_every).run()
+
+
+if __name__ == "__main__":
+    main()
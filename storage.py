@@ -0,0 +1,401 @@
+"""
+Redfin Property Scraper - Storage
+Append-only journals for scraped properties, a background group-commit
+writer, and Excel export at phase/run end
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# Columns removed before a property is written to the Excel output
+EXCEL_DROP_COLUMNS = ['url', 'scrape_date', 'price', 'beds', 'baths',
+                      'sqft', 'has_oil_heating', 'listing_agent', 'broker']
+
+
+def journal_path_for(excel_file, backend='jsonl'):
+    """Journal file that sits next to the Excel output"""
+    base = os.path.splitext(excel_file)[0]
+    return f"{base}.{'jsonl' if backend == 'jsonl' else 'db'}"
+
+
+class JsonlStore:
+    """Append-only JSON Lines journal (one record per line, fsynced)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(self.path, 'a', encoding='utf-8')
+
+    def append(self, record):
+        """Append one record in O(1) and flush it to disk"""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Append records with a single write and fsync (group commit)"""
+        self._fh.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def records(self):
+        """Yield every record in the journal, skipping a torn last line"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A crash mid-write can only damage the final line
+                    continue
+
+    def close(self):
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+
+class SqliteStore:
+    """Append-only SQLite journal in WAL mode"""
+
+    def __init__(self, path):
+        self.path = path
+        # The pipeline writer thread may append on a connection opened here
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)'
+        )
+        self.conn.commit()
+
+    def append(self, record):
+        """Insert one record and commit it"""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Insert records in one transaction (group commit)"""
+        self.conn.executemany('INSERT INTO records (data) VALUES (?)',
+                              [(json.dumps(record, ensure_ascii=False),) for record in records])
+        self.conn.commit()
+
+    def records(self):
+        """Yield every record in insertion order"""
+        for (data,) in self.conn.execute('SELECT data FROM records ORDER BY id'):
+            yield json.loads(data)
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+def open_store(excel_file, backend='jsonl'):
+    """Open the journal backend ('jsonl' or 'sqlite') for an Excel output file"""
+    path = journal_path_for(excel_file, backend)
+    if backend == 'sqlite':
+        return SqliteStore(path)
+    return JsonlStore(path)
+
+
+def open_sinks(search_url, parquet_dir=None, property_db=None):
+    """BatchedWriter sinks for the configured outputs (pyarrow is optional)"""
+    sinks = []
+    if property_db:
+        from property_store import PropertyStore
+        print(f"✓ Property history: {property_db}")
+        sinks.append(PropertyStore(property_db, source=search_url))
+    if parquet_dir:
+        try:
+            from parquet_sink import ParquetSink, region_from_url
+        except ImportError:
+            print("⚠ pyarrow is not installed (pip install pyarrow), skipping Parquet output")
+            return sinks
+        print(f"✓ Parquet output: {parquet_dir}")
+        sinks.append(ParquetSink(parquet_dir, region_from_url(search_url)))
+    return sinks
+
+
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Directories can't be fsynced on Windows
+    finally:
+        os.close(fd)
+
+
+def export_to_excel(store, excel_file, dedup_column='full_address', drop_columns=EXCEL_DROP_COLUMNS,
+                    keep='first'):
+    """Rewrite the Excel file from the existing workbook plus the journal
+
+    Rows already in the workbook come first so 'keep first' dedup matches the
+    behaviour of the old per-property save; keep='last' lets the newest
+    journal row replace an older one (e.g. for sale -> sold). The new workbook is fsynced under
+    a temporary name and renamed over the old one, so a crash leaves either
+    the old or the new file, never a truncated one.
+    """
+    df_new = pd.DataFrame(list(store.records()))
+    if df_new.empty and not os.path.exists(excel_file):
+        return 0
+
+    df_new = df_new.drop(columns=[c for c in drop_columns if c in df_new.columns])
+
+    if os.path.exists(excel_file):
+        df_existing = pd.read_excel(excel_file)
+        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
+    else:
+        df_combined = df_new
+
+    if dedup_column in df_combined.columns:
+        df_combined = df_combined.drop_duplicates(subset=[dedup_column], keep=keep)
+
+    tmp_file = excel_file + '.tmp.xlsx'
+    df_combined.to_excel(tmp_file, index=False)
+    _fsync_path(tmp_file)
+    os.replace(tmp_file, excel_file)
+    if os.name != 'nt':
+        _fsync_path(os.path.dirname(os.path.abspath(excel_file)))
+    return len(df_combined)
+
+
+class BatchedWriter:
+    """Background writer: group commit to the journal, Excel export off-thread
+
+    put() only queues a record. The writer thread appends everything queued
+    as one batch (one write + fsync for JSONL, one transaction for SQLite)
+    once batch_size records are waiting or flush_seconds have passed, then
+    calls on_commit(batch). Excel exports (export_to_excel with
+    export_options) run on the same thread when requested, and every
+    export_seconds if set, so the scraping thread never waits for
+    spreadsheet serialization. Each committed batch is also handed to every
+    sink (e.g. parquet_sink.ParquetSink) via sink.write(batch); sinks are
+    closed with the writer.
+    """
+
+    def __init__(self, store, excel_file, batch_size=25, flush_seconds=2.0, export_seconds=None,
+                 export_options=None, on_commit=None, metrics=None, sinks=()):
+        self.store = store
+        self.excel_file = excel_file
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.export_seconds = export_seconds
+        self.export_options = export_options or {}
+        self.on_commit = on_commit
+        self.metrics = metrics
+        self.sinks = list(sinks)
+        self.pending = []
+        self.queued = 0  # Records put so far
+        self.committed = 0  # Records committed (or given up on) so far
+        self.exports = 0
+        self.batches = 0
+        self._flush_wanted = False
+        self._export_wanted = False
+        self._dirty = False  # Committed records not in the workbook yet
+        self._last_export = time.monotonic()
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        """Queue a record for the next group commit (never blocks on disk)"""
+        with self._cond:
+            self.pending.append(record)
+            self.queued += 1
+            if len(self.pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def request_export(self):
+        """Rewrite the Excel file after the next commit, without waiting for it"""
+        with self._cond:
+            self._export_wanted = True
+            self._cond.notify_all()
+
+    def flush(self, export=False):
+        """Block until every record put so far is committed (and exported)"""
+        with self._cond:
+            target = self.queued
+            exports = self.exports
+            self._flush_wanted = True
+            self._export_wanted = self._export_wanted or export
+            self._cond.notify_all()
+            while self._thread.is_alive() and (
+                    self.committed < target or (export and self.exports <= exports)):
+                self._cond.wait(1.0)
+
+    def _export_due(self):
+        if self._export_wanted:
+            return True
+        return (self.export_seconds is not None and self._dirty
+                and time.monotonic() - self._last_export >= self.export_seconds)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_seconds
+                while not (self._closing or self._flush_wanted or self._export_due()
+                           or len(self.pending) >= self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self.pending = self.pending[:], []
+                export = self._export_due()
+                self._export_wanted = False
+                self._flush_wanted = False
+                closing = self._closing
+
+            if batch:
+                self._commit(batch, closing)
+            if export:
+                self._export()
+            with self._cond:
+                self._cond.notify_all()
+                if closing and not self.pending:
+                    return
+
+    def _commit(self, batch, closing):
+        started = time.monotonic()
+        try:
+            self.store.append_many(batch)
+        except Exception as e:
+            if not closing:
+                print(f"  ✗ Journal write failed, retrying {len(batch)} records: {e}")
+                with self._cond:
+                    self.pending[:0] = batch
+                time.sleep(1.0)
+                return
+            print(f"  ✗ Journal write failed, {len(batch)} records lost: {e}")
+        else:
+            self._dirty = True
+            self.batches += 1
+            if self.metrics is not None:
+                self.metrics.observe('journal_commit', time.monotonic() - started)
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(batch)
+                except Exception as e:
+                    print(f"  ⚠ After-commit hook failed: {e}")
+            for sink in self.sinks:
+                try:
+                    sink.write(batch)
+                except Exception as e:
+                    print(f"  ⚠ {type(sink).__name__} write failed: {e}")
+        with self._cond:
+            self.committed += len(batch)
+
+    def _export(self):
+        started = time.monotonic()
+        try:
+            total_rows = export_to_excel(self.store, self.excel_file, **self.export_options)
+            print(f"✓ Exported {total_rows} properties to {self.excel_file}")
+        except Exception as e:
+            print(f"✗ Error exporting to Excel: {e}")
+            print(f"✓ Data is still safe in journal: {self.store.path}")
+        if self.metrics is not None:
+            self.metrics.observe('export', time.monotonic() - started)
+        with self._cond:
+            self._dirty = False
+            self._last_export = time.monotonic()
+            self.exports += 1
+
+    def close(self, export=True):
+        """Final flush (and export); safe to call from a KeyboardInterrupt handler"""
+        if export:
+            self.request_export()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                print(f"  ⚠ {type(sink).__name__} close failed: {e}")
+        self.sinks = []
+
+
+class DedupIndex:
+    """Set-based index of already-scraped listings keyed on URL and full_address
+
+    Loaded once at startup from the Excel output, the journal and a '.seen'
+    sidecar that remembers every visited URL (including non-oil listings), so
+    known properties can be skipped before their page is opened.
+    """
+
+    def __init__(self, seen_file):
+        self.seen_file = seen_file
+        self.urls = set()
+        self.addresses = set()
+        self._fh = None
+        self._lock = threading.Lock()  # add() runs on the scraping and writer threads
+
+    @classmethod
+    def load(cls, excel_file, store=None):
+        """Build the index from everything already on disk"""
+        index = cls(os.path.splitext(excel_file)[0] + '.seen')
+
+        if os.path.exists(excel_file):
+            try:
+                df = pd.read_excel(excel_file)
+                if 'full_address' in df.columns:
+                    index.addresses.update(df['full_address'].dropna().astype(str))
+                if 'url' in df.columns:
+                    index.urls.update(df['url'].dropna().astype(str))
+            except Exception as e:
+                print(f"⚠ Could not read {excel_file} for dedup: {e}")
+
+        if store is not None:
+            for record in store.records():
+                index._remember(record)
+
+        if os.path.exists(index.seen_file):
+            with open(index.seen_file, 'r', encoding='utf-8') as fh:
+                index.urls.update(line.strip() for line in fh if line.strip())
+
+        index.addresses.discard('-')
+        return index
+
+    def _remember(self, record):
+        if record.get('url'):
+            self.urls.add(record['url'])
+        if record.get('full_address') and record['full_address'] != '-':
+            self.addresses.add(record['full_address'])
+
+    def has_url(self, url):
+        return url in self.urls
+
+    def has_address(self, full_address):
+        return bool(full_address) and full_address != '-' and full_address in self.addresses
+
+    def add(self, record):
+        """Remember a visited property and persist its URL"""
+        url = record.get('url')
+        with self._lock:
+            if url and url not in self.urls:
+                if self._fh is None:
+                    self._fh = open(self.seen_file, 'a', encoding='utf-8')
+                self._fh.write(url + '\n')
+                self._fh.flush()
+            self._remember(record)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def close(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
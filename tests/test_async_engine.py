@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+pytest.importorskip('playwright')
+
+from async_engine import AsyncEngineRunner
+from http_extractor import parse_property_html
+from mock_server import DEFAULT_ROUTES, FIXTURES_DIR, MockRedfinServer
+
+COMPARED_FIELDS = ['full_address', 'street_address', 'city', 'state', 'zip_code', 'listing_status',
+                   'heating_type', 'cooling_type', 'has_oil_heating', 'property_type']
+
+
+def fixture_record(path):
+    with open(os.path.join(FIXTURES_DIR, DEFAULT_ROUTES[path]), 'r', encoding='utf-8') as fh:
+        property_data, missing = parse_property_html(fh.read(), path)
+    assert missing == []
+    return property_data
+
+
+def test_async_engine_crawls_mock_server():
+    with MockRedfinServer() as mock:
+        runner = AsyncEngineRunner(concurrency=2)
+        try:
+            try:
+                records = runner.extract_many([mock.url(path) for path in DEFAULT_ROUTES])
+            except Exception as e:
+                pytest.skip(f"no Playwright browser: {e}")
+        finally:
+            runner.close()
+
+    assert len(records) == len(DEFAULT_ROUTES)
+    for path, record in zip(DEFAULT_ROUTES, records):
+        assert 'error' not in record
+        assert record['url'] == mock.url(path)
+        expected = fixture_record(path)
+        assert {name: record[name] for name in COMPARED_FIELDS} == {name: expected[name] for name in COMPARED_FIELDS}
+    assert [record['has_oil_heating'] for record in records] == ['Yes', 'No']
@@ -0,0 +1,53 @@
+from checkpoint import Checkpoint
+from main import CHECKPOINT_EVERY, RedfinScraperComplete
+
+
+def make_scraper(tmp_path):
+    scraper = RedfinScraperComplete(excel_file=str(tmp_path / 'oil.xlsx'))
+    scraper.checkpoint = CountingCheckpoint(scraper.checkpoint.path)
+    return scraper
+
+
+class CountingCheckpoint(Checkpoint):
+    def __init__(self, path):
+        super().__init__(path)
+        self.saves = 0
+
+    def save(self, state):
+        self.saves += 1
+        super().save(state)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    scraper = make_scraper(tmp_path)
+    scraper.apply_settings({'base_url': 'https://www.redfin.com/county/1974/NY/Nassau-County',
+                            'interactive': False, 'headless': True, 'phase_workers': 3})
+    scraper.phase_plan = [(100000, 500000, 320), (500000, 900000, 280)]
+    scraper.phases_completed = [{'min_price': 100000, 'max_price': 500000}]
+    scraper.processed_urls = {'https://www.redfin.com/NY/a/home/2', 'https://www.redfin.com/NY/a/home/1'}
+    scraper.properties_saved_count = 12
+    scraper.save_checkpoint()
+
+    resumed = RedfinScraperComplete(excel_file=str(tmp_path / 'oil.xlsx'))
+    assert resumed.load_checkpoint()
+    assert resumed.base_url == scraper.base_url
+    assert resumed.interactive is False and resumed.headless is True and resumed.phase_workers == 3
+    assert resumed.phase_plan == scraper.phase_plan
+    assert resumed.phases_completed == scraper.phases_completed
+    assert resumed.processed_urls == scraper.processed_urls
+    assert resumed.properties_saved_count == 12
+
+
+def test_completed_checkpoint_is_not_resumed(tmp_path):
+    scraper = make_scraper(tmp_path)
+    scraper.save_checkpoint(status='complete')
+    assert not RedfinScraperComplete(excel_file=str(tmp_path / 'oil.xlsx')).load_checkpoint()
+
+
+def test_non_oil_visits_checkpoint_every_k(tmp_path):
+    scraper = make_scraper(tmp_path)
+    for i in range(CHECKPOINT_EVERY * 2 + 5):
+        scraper.handle_property_result({'url': f'https://www.redfin.com/NY/a/home/{i}',
+                                        'has_oil_heating': 'No'})
+    assert scraper.checkpoint.saves == 2
+    assert len(Checkpoint(scraper.checkpoint.path).load()['processed_urls']) == CHECKPOINT_EVERY * 2
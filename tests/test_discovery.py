@@ -0,0 +1,40 @@
+import csv
+import os
+
+from discovery import SearchApiDiscovery
+from mock_server import FIXTURES_DIR, MockRedfinServer
+
+COUNTY = '/county/1974/NY/Nassau-County'
+
+
+def fixture_rows():
+    with open(os.path.join(FIXTURES_DIR, 'search_results.csv'), 'r', encoding='utf-8', newline='') as fh:
+        return [row for row in csv.DictReader(fh) if row['PRICE'].isdigit()]
+
+
+def test_pages_until_a_short_page():
+    rows = fixture_rows()
+    with MockRedfinServer() as mock:
+        discovery = SearchApiDiscovery(mock.url(COUNTY), 'include=sold-1yr', page_size=10)
+        listings = list(discovery.iter_listings())
+    assert len(listings) == len(rows)
+    assert len({listing['url'] for listing in listings}) == len(rows)
+    assert listings[0]['url'] == mock.url('/NY/Port-Washington/25-Schooner-Ln-11050/home/1001')
+    assert discovery.requests_made == len(rows) // 10 + 1
+
+
+def test_price_window():
+    rows = [row for row in fixture_rows() if 500000 <= int(row['PRICE']) <= 900000]
+    with MockRedfinServer() as mock:
+        discovery = SearchApiDiscovery(mock.url(COUNTY), page_size=350)
+        listings = list(discovery.iter_listings(500000, 900000))
+    assert sorted(int(listing['price']) for listing in listings) == sorted(int(row['PRICE']) for row in rows)
+    assert discovery.requests_made == 1
+
+
+def test_full_last_page_costs_one_empty_request():
+    count = len(fixture_rows())
+    with MockRedfinServer() as mock:
+        discovery = SearchApiDiscovery(mock.url(COUNTY), page_size=count)
+        assert len(list(discovery.iter_listings())) == count
+    assert discovery.requests_made == 2
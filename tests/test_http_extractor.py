@@ -0,0 +1,66 @@
+import os
+
+from lxml import html as lxml_html
+
+from http_extractor import HttpPropertyExtractor, _text, parse_property_html
+from mock_server import FIXTURES_DIR, MockRedfinServer
+from rate_limiter import THROTTLED_ERROR
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as fh:
+        return fh.read()
+
+
+def test_optional_fields_default_without_falling_back():
+    html = fixture('property_for_sale.html')
+    html = html.replace('<li class="entryItem"><span class="entryItemContent">Cooling: <span>None</span></span></li>', '')
+    html = html.replace('<span>Property Type</span>', '')
+    property_data, missing = parse_property_html(html, 'https://www.redfin.com/NY/a/home/1002')
+    assert missing == []
+    assert property_data['cooling_type'] == '-'
+    assert property_data['property_type'] == '-'
+    assert property_data['heating_type'] == 'Natural Gas, Forced Air'
+
+
+def test_collapsed_interior_needs_the_browser():
+    _, missing = parse_property_html(fixture('property_collapsed_interior.html'), 'https://www.redfin.com/NY/a/home/1003')
+    assert missing == ['heating_type']
+
+
+def test_extractor_against_mock_server():
+    busy_route = lambda path, query: (429, 'text/plain', b'Too many requests', {'Retry-After': '7'})
+    with MockRedfinServer(routes={'/busy': busy_route}) as mock:
+        extractor = HttpPropertyExtractor(pool_size=2, timeout=5)
+        try:
+            sold, missing = extractor.extract(mock.url('/NY/Port-Washington/25-Schooner-Ln-11050/home/1001'))
+            assert missing == []
+            assert sold['full_address'] == '25 Schooner Ln, Port Washington, NY 11050'
+            assert sold['listing_status'] == 'sold'
+            assert sold['has_oil_heating'] == 'Yes'
+
+            for_sale, missing = extractor.extract(mock.url('/NY/Massapequa/166-N-Oak-St-11758/home/1002'))
+            assert missing == [] and for_sale['has_oil_heating'] == 'No'
+
+            gone, missing = extractor.extract(mock.url('/NY/a/home/404'))
+            assert missing == ['fetch'] and gone['error'].startswith('HTTP fetch failed')
+
+            busy, missing = extractor.extract(mock.url('/busy'))
+            assert missing == ['fetch'] and busy['error'].startswith(THROTTLED_ERROR)
+            assert busy['retry_after'] == 7
+        finally:
+            extractor.close()
+
+
+def test_multiline_interior_entry_keeps_line_breaks():
+    property_data, missing = parse_property_html(fixture('property_multiline_interior.html'),
+                                                 'https://www.redfin.com/NY/a/home/1001')
+    assert missing == []
+    assert property_data['heating_type'] == 'Oil'
+    assert property_data['cooling_type'] == 'Central'
+    assert property_data['has_oil_heating'] == 'Yes'
+
+
+def test_text_breaks_lines_like_inner_text():
+    li = lxml_html.fromstring('<li> Heating:\n   <b>Oil</b>,  Hot Water<!-- x --><div>Cooling:</div><p>Central  Air</p></li>')
+    assert _text(li) == 'Heating: Oil, Hot Water\nCooling:\nCentral Air'
@@ -0,0 +1,85 @@
+import json
+import time
+import urllib.request
+
+import pytest
+
+from metrics import RunMetrics, percentile
+from waits import WaitStats
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(time, 'time', lambda: 1_700_000_000.0)
+    wait_stats = WaitStats()
+    wait_stats.record('listing_status', 0.25, False)
+    run = RunMetrics(wait_stats=wait_stats)
+    # 1..100 seconds in shuffled order: nearest-rank percentiles are exact
+    for seconds in list(range(100, 50, -1)) + list(range(1, 51)):
+        run.observe('property', float(seconds))
+    run.count('properties_extracted', 100)
+    run.count('throttled')
+    run.gauge('detail_queue', 3)
+    return run
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.95) == 4.0
+
+
+def test_summary_percentiles(metrics):
+    summary = metrics.summary()
+    assert summary['stages']['property'] == {'count': 100, 'sum': 5050.0, 'max': 100.0,
+                                             'p50': 50.0, 'p95': 95.0, 'p99': 99.0}
+    assert summary['stages']['wait.listing_status']['p99'] == 0.25
+    assert summary['counters'] == {'properties_extracted': 100, 'throttled': 1}
+    assert summary['gauges'] == {'detail_queue': 3}
+
+
+def test_json_snapshot(metrics, tmp_path):
+    path = str(tmp_path / 'metrics.json')
+    metrics.write(path)
+    with open(path, 'r', encoding='utf-8') as fh:
+        assert json.load(fh) == metrics.summary()
+
+
+def test_prometheus_text(metrics, tmp_path):
+    path = str(tmp_path / 'metrics.prom')
+    metrics.write(path)
+    with open(path, 'r', encoding='utf-8') as fh:
+        text = fh.read()
+    assert text == metrics.prometheus_text()
+    lines = text.splitlines()
+    assert lines[:2] == ['# HELP redfin_stage_seconds Duration of each scraper stage',
+                         '# TYPE redfin_stage_seconds summary']
+    for line in ['redfin_stage_seconds{stage="property",quantile="0.5"} 50.0',
+                 'redfin_stage_seconds{stage="property",quantile="0.95"} 95.0',
+                 'redfin_stage_seconds{stage="property",quantile="0.99"} 99.0',
+                 'redfin_stage_seconds_sum{stage="property"} 5050.0',
+                 'redfin_stage_seconds_count{stage="property"} 100',
+                 'redfin_stage_seconds_count{stage="wait.listing_status"} 1',
+                 '# TYPE redfin_events_total counter',
+                 'redfin_events_total{event="properties_extracted"} 100',
+                 'redfin_events_total{event="throttled"} 1',
+                 'redfin_gauge{name="detail_queue"} 3',
+                 'redfin_run_elapsed_seconds 0.0']:
+        assert line in lines
+    # Every sample line is "name{labels} value" or "name value"
+    for line in lines:
+        if not line.startswith('#'):
+            float(line.rsplit(' ', 1)[1])
+
+
+def test_serve_live_endpoint(metrics):
+    metrics.serve(0)
+    try:
+        port = metrics._server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.read().decode('utf-8') == metrics.prometheus_text()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json", timeout=5) as response:
+            assert json.load(response)['stages']['property']['p95'] == 95.0
+    finally:
+        metrics.stop()
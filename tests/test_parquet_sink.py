@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import pyarrow.dataset as ds
+
+from parquet_sink import PROPERTY_COLUMNS, ParquetSink, region_from_url
+
+
+def record(number, status='sold', day='2026-10-01'):
+    return {
+        'url': f"https://www.redfin.com/NY/a/home/{number}",
+        'scrape_date': f"{day} 12:00:00",
+        'listing_status': status,
+        'full_address': f"{number} Main St, Mineola, NY 11501",
+        'price': 500000 + number,
+        'has_oil_heating': 'Yes' if number % 2 else 'No',
+    }
+
+
+def files_under(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, names in os.walk(root) for f in names)
+
+
+def test_region_from_url():
+    assert region_from_url('https://www.redfin.com/county/1974/NY/Nassau-County/filter/include=sold-1yr') == \
+        'NY-Nassau-County'
+    assert region_from_url('') == 'unknown'
+
+
+def test_hive_layout_and_files_hidden_until_published(tmp_path):
+    root = str(tmp_path / 'dataset')
+    sink = ParquetSink(root, 'NY-Nassau-County', row_group_size=2, file_seconds=3600)
+    sink.write([record(1), record(2), record(3, status='for-sale'), record(4, day='2026-10-02')])
+
+    # A full row group is on disk, but only under a hidden name
+    files = files_under(root)
+    assert files == ['region=NY-Nassau-County/scrape_day=2026-10-01/listing_status=sold/'
+                     f".part-{sink.run_id}-0000.parquet.tmp"]
+    assert ds.dataset(root, format='parquet', partitioning='hive').count_rows() == 0
+
+    sink.publish()
+    assert files_under(root) == [
+        f"region=NY-Nassau-County/scrape_day=2026-10-01/listing_status=for-sale/part-{sink.run_id}-0000.parquet",
+        f"region=NY-Nassau-County/scrape_day=2026-10-01/listing_status=sold/part-{sink.run_id}-0000.parquet",
+        f"region=NY-Nassau-County/scrape_day=2026-10-02/listing_status=sold/part-{sink.run_id}-0000.parquet",
+    ]
+
+    # The next window starts new files next to the published ones
+    sink.write([record(5)])
+    sink.close()
+    assert f"region=NY-Nassau-County/scrape_day=2026-10-01/listing_status=sold/part-{sink.run_id}-0001.parquet" \
+        in files_under(root)
+    assert (sink.files_written, sink.rows_written) == (4, 5)
+
+
+def test_rows_read_back_equal_rows_written(tmp_path):
+    root = str(tmp_path / 'dataset')
+    written = [record(n, status='sold' if n % 3 else 'for-sale', day=f"2026-10-0{1 + n % 2}") for n in range(1, 21)]
+    sink = ParquetSink(root, 'NY-Nassau-County', row_group_size=4)
+    sink.write(written[:12])
+    sink.write(written[12:])
+    sink.close()
+
+    table = ds.dataset(root, format='parquet', partitioning='hive').to_table()
+    read = sorted(table.to_pylist(), key=lambda row: row['url'])
+    expected = sorted(written, key=lambda row: row['url'])
+    assert len(read) == len(expected)
+    for row, source in zip(read, expected):
+        assert row['region'] == 'NY-Nassau-County'
+        assert str(row['scrape_day']) == source['scrape_date'][:10]
+        assert row['listing_status'] == source['listing_status']
+        assert {column: row[column] for column in PROPERTY_COLUMNS} == \
+            {column: None if source.get(column) is None else str(source[column]) for column in PROPERTY_COLUMNS}
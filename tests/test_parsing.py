@@ -0,0 +1,96 @@
+import pandas as pd
+
+from parsing import (parse_address, parse_addresses, parse_interior_entries, parse_interior_batch,
+                     parse_snapshot, reparse_records)
+
+ADDRESSES = [
+    '25 Schooner Ln, Port Washington, NY 11050',
+    '166 N Oak St, Massapequa NY 11758',
+    '3 Elm Pl, NY 11501',
+    '1 Main St, Massapequa',
+    '1 Main St',
+    '  7 Bay Rd ,  Glen Cove , NY  11542 , USA ',
+    ', , ',
+    '',
+    None,
+]
+
+INTERIORS = [
+    ['Heating: Oil\nCooling: Central'],
+    ['Heating: Oil, Baseboard', 'Cooling: Central Air'],
+    ['Cooling: None', 'Heating : Natural Gas'],
+    ['Heating:', 'Heating: Hot Water, Oil'],
+    ['Heating & Cooling', 'Heating:\nOil'],
+    ['Heating: \nCooling: Wall Units'],
+    ['Fireplace: Yes'],
+    [],
+]
+
+
+def test_parse_addresses_matches_parse_address():
+    batch = parse_addresses(pd.Series(ADDRESSES, index=range(10, 10 + len(ADDRESSES))))
+    assert list(batch.index) == list(range(10, 10 + len(ADDRESSES)))
+    assert batch.to_dict('records') == [parse_address(text) for text in ADDRESSES]
+
+
+def test_parse_interior_batch_matches_parse_interior_entries():
+    batch = parse_interior_batch(INTERIORS)
+    assert batch.to_dict('records') == [parse_interior_entries(entries) for entries in INTERIORS]
+
+
+def test_batch_matches_scalar_on_repeated_and_generated_values():
+    # Journals repeat listings; factorized values must map back to every row
+    streets = ['25 Schooner Ln', '  7 Bay Rd ', '', '3 Elm Pl']
+    tails = [', Port Washington, NY 11050', ', Massapequa NY 11758', ', NY 11501', ', Glen Cove', '',
+             ', , ', ',  Oyster Bay ,NY,11771, USA']
+    addresses = [street + tail for street in streets for tail in tails] * 3 + [None, float('nan')]
+    batch = parse_addresses(pd.Series(addresses, index=range(len(addresses), 0, -1)))
+    assert list(batch.index) == list(range(len(addresses), 0, -1))
+    assert batch.to_dict('records') == [parse_address(text if isinstance(text, str) else None)
+                                        for text in addresses]
+
+    values = ['Oil', 'Hot Water, Oil', '-', '', 'Natural Gas']
+    interiors = [[f'Heating: {a}', f'Cooling: {b}'] for a in values for b in values] * 2 + \
+                [[f'Heating:\n{a}\nCooling: {b}'] for a in values for b in values] + [None]
+    batch = parse_interior_batch(pd.Series(interiors, index=range(100, 100 + len(interiors))))
+    assert list(batch.index) == list(range(100, 100 + len(interiors)))
+    assert batch.to_dict('records') == [parse_interior_entries(entries or []) for entries in interiors]
+
+
+def test_heating_and_cooling_in_one_entry():
+    interior = parse_interior_entries(['Heating: Oil\nCooling: Central'])
+    assert interior == {'heating_type': 'Oil', 'cooling_type': 'Central', 'has_oil_heating': 'Yes'}
+
+
+def test_heating_value_on_the_next_line():
+    assert parse_interior_entries(['Heating:\nOil, Baseboard\nCooling: None']) == \
+        {'heating_type': 'Oil, Baseboard', 'cooling_type': 'None', 'has_oil_heating': 'Yes'}
+    assert parse_interior_entries(['Heating :\n  Hot Water'])['heating_type'] == 'Hot Water'
+    # The next line is another label, not the value
+    assert parse_interior_entries(['Heating:\nCooling: Central']) == \
+        {'heating_type': '-', 'cooling_type': 'Central', 'has_oil_heating': 'No'}
+
+
+def test_snapshot_falls_back_to_body_text_when_entries_have_no_heating_value():
+    property_data = {}
+    parse_snapshot({'entries': ['Heating:', 'Cooling: Central'],
+                    'body_text': 'Interior\nHeating:\nOil\nCooling: Central'}, property_data)
+    assert property_data['heating_type'] == 'Oil'
+    assert property_data['has_oil_heating'] == 'Yes'
+
+
+def test_address_parts():
+    assert parse_address('166 N Oak St, Massapequa NY 11758') == {
+        'street_address': '166 N Oak St', 'city': 'Massapequa', 'state': 'NY',
+        'zip_code': '11758', 'full_address': '166 N Oak St, Massapequa NY 11758',
+    }
+    assert parse_address('1 Main St')['street_address'] == '1 Main St'
+
+
+def test_reparse_records_oil_flag():
+    records = reparse_records([
+        {'full_address': ADDRESSES[0], 'heating_type': 'Hot Water, OIL', 'has_oil_heating': 'No'},
+        {'full_address': ADDRESSES[1], 'heating_type': '-', 'has_oil_heating': 'Yes'},
+    ])
+    assert list(records['has_oil_heating']) == ['Yes', 'No']
+    assert list(records['city']) == ['Port Washington', 'Massapequa']
@@ -0,0 +1,40 @@
+import queue
+
+from main import RedfinScraperComplete
+from pipeline import ScrapePipeline
+
+
+class FakeExtractor:
+    def extract_property(self, url):
+        return {'url': url, 'has_oil_heating': 'Yes' if url.endswith(('0', '5')) else 'No'}
+
+    def close(self):
+        pass
+
+
+def test_pipeline_counts_what_the_writer_saved():
+    written = []
+
+    def write_batch(records):
+        written.extend(records)
+        return sum(record['has_oil_heating'] == 'Yes' for record in records)
+
+    pipeline = ScrapePipeline(FakeExtractor, write_batch, workers=3, batch_size=4)
+    for i in range(20):
+        pipeline.submit(f'https://www.redfin.com/NY/a/home/{i}')
+    pipeline.drain()
+    assert len(written) == 20
+    assert pipeline.saved == 4
+    pipeline.close()
+
+
+def test_worker_process_batch_returns_oil_count():
+    # In a phase worker nothing is saved locally, so properties_saved_count
+    # stays 0; the writer stage's result is the oil count
+    scraper = RedfinScraperComplete(excel_file='unused.xlsx')
+    scraper.result_queue = queue.Queue()
+    records = [{'url': f'https://www.redfin.com/NY/a/home/{i}', 'has_oil_heating': oil}
+               for i, oil in enumerate(['Yes', 'No', 'Yes'])]
+    assert scraper.save_property_batch(records) == 2
+    assert scraper.properties_saved_count == 0
+    assert scraper.result_queue.qsize() == 3
@@ -0,0 +1,59 @@
+import bisect
+import random
+
+from price_planner import PricePlanner
+
+MIN_PRICE, MAX_PRICE = 100000, 5000000
+
+
+def make_count_fn(prices):
+    prices = sorted(prices)
+
+    def count(low, high):
+        return bisect.bisect_right(prices, high) - bisect.bisect_left(prices, low)
+    return count
+
+
+def market(homes=4000, seed=7):
+    rng = random.Random(seed)
+    return [min(MAX_PRICE, max(MIN_PRICE, int(rng.lognormvariate(13.4, 0.6)))) for _ in range(homes)]
+
+
+def check_plan(phases, count, target_max, step):
+    assert phases[0][0] == MIN_PRICE and phases[-1][1] == MAX_PRICE
+    for (_, prev_max, _), (phase_min, _, _) in zip(phases, phases[1:]):
+        assert phase_min == prev_max + 1
+    for phase_min, phase_max, expected in phases:
+        assert expected == count(phase_min, phase_max)
+        # Only a single price step that can't be split may exceed the target
+        assert expected <= target_max or phase_max - phase_min < 2 * step
+    assert sum(expected for _, _, expected in phases) == count(MIN_PRICE, MAX_PRICE)
+
+
+def test_plan_covers_the_range_within_target():
+    count = make_count_fn(market())
+    planner = PricePlanner(count, MIN_PRICE, MAX_PRICE, target_max=369, step=10000)
+    check_plan(planner.plan(), count, 369, 10000)
+
+
+def test_dense_price_point_gets_its_own_phase():
+    prices = market(1000) + [650000] * 500
+    count = make_count_fn(prices)
+    planner = PricePlanner(count, MIN_PRICE, MAX_PRICE, target_max=369, step=10000)
+    check_plan(planner.plan(), count, 369, 10000)
+
+
+def test_empty_market_is_one_phase():
+    planner = PricePlanner(make_count_fn([]), MIN_PRICE, MAX_PRICE)
+    assert planner.plan() == [(MIN_PRICE, MAX_PRICE, 0)]
+
+
+def test_seeded_curve_skips_probes_and_keeps_the_plan():
+    count = make_count_fn(market())
+    first = PricePlanner(lambda low, high: count(low, high), MIN_PRICE, MAX_PRICE, step=10000)
+    phases = first.plan()
+
+    second = PricePlanner(count, MIN_PRICE, MAX_PRICE, step=10000)
+    second.seed(first.curve)
+    assert second.plan() == phases
+    assert second.probes == 0
@@ -0,0 +1,83 @@
+import json
+import time
+
+from probe_cache import ProbeCountCache
+
+SCOPE = ProbeCountCache.scope_for('https://www.redfin.com/county/1974/NY/Nassau-County', 'include=sold-1yr')
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, monkeypatch, ttl_days=10):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return ProbeCountCache(path=str(tmp_path / 'probe.json'), ttl_days=ttl_days), clock
+
+
+def test_exact_hit_and_persistence_on_reload(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put(SCOPE, 0, 500000, 120)
+    assert cache.lookup(SCOPE, 0, 500000) == 120
+
+    reloaded = ProbeCountCache(path=cache.path)
+    assert reloaded.lookup(SCOPE, 0, 500000) == 120
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_days=1)
+    cache.put(SCOPE, 0, 500000, 120)
+    clock.now += 86400 - 1
+    assert cache.lookup(SCOPE, 0, 500000) == 120
+
+    clock.now += 2
+    assert cache.lookup(SCOPE, 0, 500000) is None
+    assert ProbeCountCache(path=cache.path, ttl_days=1).entries == {}
+
+    # Expired entries are dropped from the file on the next save
+    cache.put(SCOPE, 0, 600000, 130)
+    with open(cache.path, 'r', encoding='utf-8') as fh:
+        assert list(json.load(fh)[SCOPE]) == ['0:600000']
+
+
+def test_interpolates_between_close_bounds(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put(SCOPE, 0, 400000, 100)
+    cache.put(SCOPE, 0, 500000, 104)
+    assert cache.lookup(SCOPE, 0, 450000) == 102
+    assert cache.lookup(SCOPE, 0, 475000) == 103
+    assert cache.interpolated == 2
+
+    # Neighbours too far apart in count are not trusted
+    cache.put(SCOPE, 0, 600000, 150)
+    assert cache.lookup(SCOPE, 0, 550000) is None
+
+
+def test_out_of_range_and_other_min_price_miss(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put(SCOPE, 0, 400000, 100)
+    cache.put(SCOPE, 0, 500000, 104)
+    assert cache.lookup(SCOPE, 0, 300000) is None
+    assert cache.lookup(SCOPE, 0, 700000) is None
+    assert cache.lookup(SCOPE, 100000, 450000) is None
+    assert cache.misses == 3
+
+
+def test_scope_separates_filters_but_ignores_prices(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    base_url = 'https://www.redfin.com/county/1974/NY/Nassau-County/'
+    assert ProbeCountCache.scope_for(base_url, 'include=sold-1yr,min-price=50k,max-price=1m') == SCOPE
+    assert ProbeCountCache.scope_for(base_url, 'property-type=house,include=sold-1yr') == \
+        ProbeCountCache.scope_for(base_url, 'include=sold-1yr,property-type=house')
+
+    houses = ProbeCountCache.scope_for(base_url, 'property-type=house,include=sold-1yr')
+    cache.put(SCOPE, 0, 500000, 120)
+    assert cache.lookup(houses, 0, 500000) is None
+    assert cache.lookup(ProbeCountCache.scope_for('https://www.redfin.com/county/1991/NY/Suffolk-County',
+                                                  'include=sold-1yr'), 0, 500000) is None
@@ -0,0 +1,34 @@
+import pytest
+
+from discovery import parse_price
+from main import RedfinScraperComplete, ask_advanced_options, ask_number
+
+
+@pytest.mark.parametrize('answer, parse, default, expected', [
+    ('', int, 1, 1),
+    ('4', int, 1, 4),
+    ('four', int, 1, 1),
+    ('2.5', int, 1, 1),
+    ('450k', parse_price, 50000, 450000),
+    ('1.5m', parse_price, 50000, 1500000),
+    ('lots', parse_price, 50000, 50000),
+])
+def test_ask_number_defaults_on_bad_input(monkeypatch, answer, parse, default, expected):
+    monkeypatch.setattr('builtins.input', lambda prompt='': answer)
+    assert ask_number('? ', default, parse) == expected
+
+
+def test_advanced_options_defaults_and_answers(monkeypatch):
+    scraper = RedfinScraperComplete()
+    answers = iter(['', '', '', '', '', '', ''])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    ask_advanced_options(scraper)
+    assert (scraper.use_http_fast_path, scraper.discovery_mode, scraper.detail_engine, scraper.detail_workers,
+            scraper.phase_workers, scraper.use_pipeline, scraper.incremental) == \
+        (False, 'browser', 'selenium', 1, 1, False, False)
+
+    answers = iter(['y', 'api', 'async', '4', '0', 'y', 'y'])
+    ask_advanced_options(scraper)
+    assert (scraper.use_http_fast_path, scraper.discovery_mode, scraper.detail_engine, scraper.detail_workers,
+            scraper.phase_workers, scraper.use_pipeline, scraper.incremental) == \
+        (True, 'api', 'async', 4, 1, True, True)
@@ -0,0 +1,41 @@
+from main import RedfinScraperComplete
+from property_store import PropertyStore, listing_summary
+from storage import DedupIndex
+
+OLD = 'https://www.redfin.com/NY/Massapequa/1-Main-St-11758/home/111'
+NEW = 'https://www.redfin.com/NY/Massapequa/2-Main-St-11758/home/222'
+
+
+def test_history_records_price_changes(tmp_path):
+    store = PropertyStore(str(tmp_path / 'p.db'))
+    store.upsert_many([{'url': OLD, 'price': '$500,000', 'listing_status': 'Active'}])
+    assert store.upsert_many([{'url': OLD, 'price': '$480,000', 'listing_status': 'Active'}]) == \
+        {'new': 0, 'changed': 1, 'unchanged': 0}
+    assert [row['change'] for row in store.history(OLD)] == ['new', 'price']
+    store.close()
+
+
+def test_property_db_without_incremental_rechecks_known_listings(tmp_path):
+    db = str(tmp_path / 'p.db')
+    store = PropertyStore(db)
+    store.remember_summaries({OLD: listing_summary('$500,000', 'Active')})
+    store.close()
+
+    scraper = RedfinScraperComplete(excel_file=str(tmp_path / 'oil.xlsx'))
+    scraper.property_db = db
+    scraper.dedup = DedupIndex(str(tmp_path / 'oil.seen'))
+    scraper.dedup.urls.add(OLD)
+    assert not scraper.incremental and scraper.tracks_changes()
+
+    unchanged = {OLD: listing_summary('$500,000', 'Active'), NEW: listing_summary('$300,000', 'Active')}
+    assert scraper.select_changed_listings([OLD, NEW], unchanged) == [NEW]
+
+    changed = {OLD: listing_summary('$480,000', 'Active')}
+    assert scraper.select_changed_listings([OLD], changed) == [OLD]
+    assert OLD in scraper.refresh_urls
+    scraper.listings.close()
+
+
+def test_no_property_store_means_plain_dedup(tmp_path):
+    scraper = RedfinScraperComplete(excel_file=str(tmp_path / 'oil.xlsx'))
+    assert not scraper.tracks_changes()
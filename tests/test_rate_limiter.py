@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from rate_limiter import AdaptiveRateLimiter, SharedRateBucket, parse_retry_after
+
+URL = 'https://www.redfin.com/NY/a/home/1'
+
+
+class FakeClock:
+    """Clock whose sleep() just moves time forward"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock, **kwargs):
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_additive_increase_up_to_max_rate():
+    limiter = make_limiter(FakeClock(), rate=1.0, max_rate=1.2, increase=0.05)
+    for _ in range(3):
+        limiter.record(URL, 0.5, 'ok')
+    assert limiter.hosts['www.redfin.com'].rate == pytest.approx(1.15)
+    for _ in range(5):
+        limiter.record(URL, 0.5, 'ok')
+    assert limiter.hosts['www.redfin.com'].rate == pytest.approx(1.2)
+
+
+@pytest.mark.parametrize('outcome', ['throttled', 'error'])
+def test_multiplicative_decrease_down_to_min_rate(monkeypatch, outcome):
+    monkeypatch.setattr('random.uniform', lambda a, b: 0.0)
+    limiter = make_limiter(FakeClock(), rate=2.0, min_rate=0.3, decrease=0.5)
+    limiter.record(URL, outcome=outcome)
+    assert limiter.hosts['www.redfin.com'].rate == pytest.approx(1.0)
+    for _ in range(3):
+        limiter.record(URL, outcome=outcome)
+    assert limiter.hosts['www.redfin.com'].rate == pytest.approx(0.3)
+
+
+def test_tokens_pace_requests_at_the_rate():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=2.0, burst=2)
+    for _ in range(4):
+        limiter.acquire(URL)
+    # The burst goes out at once, then one request every 1/rate seconds
+    assert clock.now - 1000.0 == pytest.approx(1.0)
+
+
+def test_throttled_request_honours_retry_after():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=4.0, backoff_base=5.0)
+    limiter.acquire(URL)
+    limiter.record(URL, outcome='throttled', retry_after=42)
+    assert limiter.backoff_seconds == 42
+
+    limiter.acquire(URL)
+    assert clock.now == pytest.approx(1042.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    in_a_minute = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 60))
+    assert 55 <= parse_retry_after(in_a_minute) <= 60
+
+
+def test_shared_bucket_is_one_rate_across_workers():
+    clock = FakeClock(now=time.time())
+    start = clock.now
+    bucket = SharedRateBucket(rate=2.0, burst=1)
+    workers = [make_limiter(clock, rate=2.0, burst=1, shared=bucket) for _ in range(3)]
+    for _ in range(2):
+        for worker in workers:
+            worker.acquire(URL)
+    # Six requests from three workers still take 5 / rate seconds
+    assert clock.now - start == pytest.approx(2.5, abs=0.01)
+
+    workers[0].record(URL, outcome='throttled', retry_after=30)
+    assert workers[1].hosts['shared'].rate == pytest.approx(1.0)
+    workers[2].acquire(URL)
+    assert clock.now - start == pytest.approx(32.5, abs=0.01)
@@ -0,0 +1,63 @@
+from run_config import build_parser, is_unattended, normalize_settings, resolve_settings
+from scheduler import load_jobs
+
+CONFIG = """\
+[search]
+url = "https://www.redfin.com/county/1974/NY/Nassau-County/filter/include=sold-1yr"
+base_url = "https://www.redfin.com/county/1974/NY/Nassau-County"
+
+[concurrency]
+workers = 2
+"""
+
+
+def resolve(tmp_path, *argv):
+    config = tmp_path / 'run.toml'
+    config.write_text(CONFIG)
+    return resolve_settings(build_parser().parse_args(['--config', str(config), *argv]))
+
+
+def test_cli_url_overrides_config_search(tmp_path):
+    settings = resolve(tmp_path, '--url', 'https://www.redfin.com/county/1991/NY/Suffolk-County/filter/'
+                                          'property-type=house,min-price=100k', '--workers', '4')
+    assert settings['base_url'] == 'https://www.redfin.com/county/1991/NY/Suffolk-County'
+    assert settings['base_filter'] == 'property-type=house,min-price=100k'
+    assert settings['min_price'] == 100000
+    assert settings['detail_workers'] == 4
+
+
+def test_cli_base_filter_overrides_config_url_filter(tmp_path):
+    settings = resolve(tmp_path, '--base-filter', 'include=forsale')
+    assert settings['base_url'] == 'https://www.redfin.com/county/1974/NY/Nassau-County'
+    assert settings['base_filter'] == 'include=forsale'
+
+
+def test_url_replaces_base_url_and_filter():
+    settings = normalize_settings({'base_url': 'https://www.redfin.com/city/1/NY/A', 'base_filter': 'x=y',
+                                   'url': 'https://www.redfin.com/city/2/NY/B/filter/include=sold-3mo'})
+    assert (settings['base_url'], settings['base_filter']) == ('https://www.redfin.com/city/2/NY/B', 'include=sold-3mo')
+
+
+def test_job_base_filter_beats_defaults_url(tmp_path):
+    jobs_file = tmp_path / 'jobs.toml'
+    jobs_file.write_text(CONFIG.replace('[search]', '[defaults]').replace('[concurrency]\nworkers = 2\n', '') + """
+[[jobs]]
+name = "forsale"
+base_filter = "include=forsale"
+
+[[jobs]]
+name = "suffolk"
+url = "https://www.redfin.com/county/1991/NY/Suffolk-County/filter/include=sold-1yr"
+""")
+    forsale, suffolk = load_jobs(str(jobs_file))
+    assert forsale.settings['base_filter'] == 'include=forsale'
+    assert forsale.settings['base_url'] == 'https://www.redfin.com/county/1974/NY/Nassau-County'
+    assert suffolk.settings['base_url'] == 'https://www.redfin.com/county/1991/NY/Suffolk-County'
+
+
+def test_any_setting_flag_means_unattended():
+    parser = build_parser()
+    assert not is_unattended(parser.parse_args([]))
+    assert is_unattended(parser.parse_args(['--workers', '3']))
+    assert is_unattended(parser.parse_args(['--headless']))
+    assert is_unattended(parser.parse_args(['--config', 'run.toml']))
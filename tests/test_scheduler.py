@@ -0,0 +1,57 @@
+from scheduler import MAX_UNIT_ATTEMPTS, Job, JobScheduler
+
+
+class FakeWriter:
+    def __init__(self):
+        self.checkpoints = []
+
+    def export_excel(self):
+        pass
+
+    def save_checkpoint(self, status='running'):
+        self.checkpoints.append(status)
+
+
+def start(job, scheduler, worker_id=1):
+    unit = job.pending.popleft()
+    job.in_flight += 1
+    scheduler.assigned[worker_id] = (job.name, *unit)
+    return unit
+
+
+def make_job():
+    job = Job('nassau', {'excel_file': 'nassau.xlsx', 'requests_per_second': 1.0})
+    job.writer = FakeWriter()
+    job.phases_total = 1
+    job.pending.append(('phase', (1, 100000, 500000)))
+    return job
+
+
+def fail(scheduler, job, unit):
+    scheduler.handle('failed', 1, job.name, {'kind': unit[0], 'payload': unit[1], 'error': 'boom'})
+
+
+def test_failed_phase_is_retried_then_left_running():
+    job = make_job()
+    scheduler = JobScheduler([job], workers=1)
+
+    for attempt in range(1, MAX_UNIT_ATTEMPTS):
+        fail(scheduler, job, start(job, scheduler))
+        assert list(job.pending) == [('phase', (1, 100000, 500000))]
+        assert not job.complete and job.failed == 0
+
+    fail(scheduler, job, start(job, scheduler))
+    assert job.complete and job.failed == 1
+    assert job.writer.checkpoints == ['running']
+
+
+def test_retried_phase_that_succeeds_completes_the_job():
+    job = make_job()
+    scheduler = JobScheduler([job], workers=1)
+
+    fail(scheduler, job, start(job, scheduler))
+    start(job, scheduler)
+    job.phases_done += 1
+    scheduler.finish_unit(1, job)
+    assert job.complete and job.failed == 0
+    assert job.writer.checkpoints == ['complete']
@@ -0,0 +1,94 @@
+import time
+
+import pandas as pd
+import pytest
+
+from storage import BatchedWriter, DedupIndex, open_store
+
+
+def record(i, address=None, oil='Yes'):
+    return {'url': f'https://www.redfin.com/NY/a/home/{i}', 'full_address': address or f'{i} Main St, Massapequa, NY 11758',
+            'price': f'${500000 + i:,}', 'has_oil_heating': oil}
+
+
+def test_dedup_index_round_trip(tmp_path):
+    excel_file = str(tmp_path / 'oil.xlsx')
+    pd.DataFrame([record(1)]).to_excel(excel_file, index=False)
+    store = open_store(excel_file)
+    store.append_many([record(2)])
+
+    index = DedupIndex.load(excel_file, store)
+    assert index.has_url(record(1)['url']) and index.has_address(record(2)['full_address'])
+    index.add(record(3, oil='No'))
+    index.add(record(3, oil='No'))
+    index.close()
+    store.close()
+
+    with open(index.seen_file, 'r', encoding='utf-8') as fh:
+        assert fh.read().splitlines() == [record(3)['url']]
+
+    reloaded = DedupIndex.load(excel_file, open_store(excel_file))
+    assert all(reloaded.has_url(record(i)['url']) for i in (1, 2, 3))
+    assert len(reloaded) == 3
+    assert not reloaded.has_address('-') and not reloaded.has_address(None)
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write(self, records):
+        self.batches.append(list(records))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize('backend', ['jsonl', 'sqlite'])
+def test_batched_writer_group_commits_and_round_trips(tmp_path, backend):
+    excel_file = str(tmp_path / 'oil.xlsx')
+    store = open_store(excel_file, backend)
+    committed, sink = [], ListSink()
+    writer = BatchedWriter(store, excel_file, batch_size=4, flush_seconds=60,
+                           on_commit=committed.extend, sinks=[sink])
+    for i in range(3):
+        writer.put(record(i))
+    time.sleep(0.2)
+    assert writer.committed == 0  # Below batch_size and flush_seconds away
+
+    writer.put(record(3))
+    deadline = time.monotonic() + 5
+    while writer.committed < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.committed == 4 and writer.batches == 1
+
+    for i in range(4, 10):
+        writer.put(record(i))
+    writer.flush()
+    assert writer.committed == 10
+    assert [r['url'] for batch in sink.batches for r in batch] == [record(i)['url'] for i in range(10)]
+    assert [r['url'] for r in committed] == [record(i)['url'] for i in range(10)]
+
+    writer.close()
+    assert sink.closed
+    assert list(pd.read_excel(excel_file)['full_address']) == [record(i)['full_address'] for i in range(10)]
+    store.close()
+
+    reopened = open_store(excel_file, backend)
+    assert [r['url'] for r in reopened.records()] == [record(i)['url'] for i in range(10)]
+    reopened.close()
+
+
+def test_batched_writer_keep_last_replaces_the_excel_row(tmp_path):
+    excel_file = str(tmp_path / 'oil.xlsx')
+    store = open_store(excel_file)
+    writer = BatchedWriter(store, excel_file, export_options={'keep': 'last'})
+    writer.put(dict(record(1), listing_status='for-sale'))
+    writer.flush(export=True)
+    writer.put(dict(record(1), listing_status='sold'))
+    writer.close()
+    store.close()
+
+    df = pd.read_excel(excel_file)
+    assert list(df['listing_status']) == ['sold']
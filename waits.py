@@ -0,0 +1,122 @@
+"""
+Redfin Property Scraper - Waits
+Condition-based waits with timeout budgets and measured durations
+"""
+
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+
+# Default timeout budgets in seconds, tuned from the WaitStats report
+WAIT_BUDGETS = {
+    'document_ready': 10,
+    'new_tab': 5,
+    'homecards': 10,
+    'results_count': 10,
+    'interior_entries': 6,
+    'url_changed': 10,
+    'listing_status': 5,
+}
+
+
+# ---------------------------------------------------------------------------
+# Readiness predicates: each takes the driver and returns a truthy value once
+# the page is ready. Exceptions count as "not ready yet".
+# ---------------------------------------------------------------------------
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+def new_tab_opened(handle_count):
+    def predicate(driver):
+        return len(driver.window_handles) > handle_count
+    return predicate
+
+
+def homecards_rendered(driver):
+    """Home cards are present and every address link has its href"""
+    cards = driver.find_elements(By.CSS_SELECTOR, 'div.bp-Homecard')
+    if not cards:
+        return False
+    links = driver.find_elements(By.CSS_SELECTOR, 'a.bp-Homecard__Address')
+    return bool(links) and all(link.get_attribute('href') for link in links)
+
+
+def results_count_present(driver):
+    elems = driver.find_elements(By.CSS_SELECTOR, 'div.homes.summary')
+    return bool(elems) and any(ch.isdigit() for ch in elems[0].text)
+
+
+def interior_entries_present(driver):
+    """Interior section expanded and its Heating/Cooling li.entryItem rendered"""
+    return driver.execute_script(
+        "return Array.from(document.querySelectorAll('li.entryItem'))"
+        ".some(li => /Heating|Cooling/.test(li.textContent));"
+    )
+
+
+def url_changed(old_url):
+    def predicate(driver):
+        return driver.current_url != old_url
+    return predicate
+
+
+def element_present(css_selector):
+    def predicate(driver):
+        elems = driver.find_elements(By.CSS_SELECTOR, css_selector)
+        return elems[0] if elems else False
+    return predicate
+
+
+class WaitStats:
+    """Measured wait durations per label, reported at run end"""
+
+    def __init__(self):
+        self.durations = {}
+        self.timeouts = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, duration, timed_out):
+        with self._lock:
+            self.durations.setdefault(label, []).append(duration)
+            if timed_out:
+                self.timeouts[label] = self.timeouts.get(label, 0) + 1
+
+    def report(self):
+        """Print count/avg/max per wait so budgets can be tuned"""
+        if not self.durations:
+            return
+        print("\n⏱ Wait timings (label: count, avg, max, timeouts / budget):")
+        for label in sorted(self.durations):
+            values = self.durations[label]
+            print(f"   {label}: {len(values)}x, avg {sum(values) / len(values):.2f}s, "
+                  f"max {max(values):.2f}s, timeouts {self.timeouts.get(label, 0)} "
+                  f"/ {WAIT_BUDGETS.get(label, '-')}s")
+
+
+def wait_for(driver, predicate, label, timeout=None, poll=0.1, stats=None):
+    """Poll predicate(driver) until truthy or the label's budget runs out
+
+    Returns the predicate's value, or None on timeout. The measured duration
+    is recorded in stats either way.
+    """
+    if timeout is None:
+        timeout = WAIT_BUDGETS.get(label, 10)
+
+    start = time.monotonic()
+    deadline = start + timeout
+    result = None
+    while True:
+        try:
+            result = predicate(driver)
+        except Exception:
+            result = None
+        if result or time.monotonic() >= deadline:
+            break
+        time.sleep(poll)
+
+    if stats is not None:
+        stats.record(label, time.monotonic() - start, not result)
+    return result or None
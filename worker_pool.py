@@ -0,0 +1,79 @@
+"""
+Redfin Property Scraper - Worker Pool
+Parallel detail-page extraction across independent browser workers
+"""
+
+import queue
+import threading
+
+
+class DetailWorkerPool:
+    """Pool of N browser workers pulling property URLs from a shared queue
+
+    make_extractor() is called once inside each worker thread and must return
+    an object with extract_property(url) and close(). Results come
+    back to the caller, which stays the single writer. Pacing is up to the
+    extractors (the scraper's workers share one AdaptiveRateLimiter).
+    """
+
+    def __init__(self, make_extractor, workers=4):
+        self.make_extractor = make_extractor
+        self.workers = max(1, workers)
+        self.tasks = queue.Queue()
+        self.results = queue.Queue()
+        self.threads = []
+
+    def start(self):
+        """Start the worker threads (each builds its own browser)"""
+        if self.threads:
+            return
+        for worker_id in range(1, self.workers + 1):
+            thread = threading.Thread(target=self._worker, args=(worker_id,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"✓ Started {self.workers} detail workers")
+
+    def _worker(self, worker_id):
+        try:
+            extractor = self.make_extractor()
+        except Exception as e:
+            print(f"  ✗ Worker {worker_id} could not start a browser: {e}")
+            extractor = None
+
+        try:
+            while True:
+                url = self.tasks.get()
+                if url is None:
+                    break
+
+                if extractor is None:
+                    self.results.put({'url': url, 'error': 'Worker browser unavailable'})
+                    continue
+
+                try:
+                    property_data = extractor.extract_property(url)
+                except Exception as e:
+                    property_data = {'url': url, 'error': str(e)}
+                self.results.put(property_data)
+        finally:
+            if extractor is not None:
+                try:
+                    extractor.close()
+                except Exception:
+                    pass
+
+    def map(self, urls):
+        """Queue all urls and yield property_data dicts as workers finish them"""
+        self.start()
+        for url in urls:
+            self.tasks.put(url)
+        for _ in range(len(urls)):
+            yield self.results.get()
+
+    def close(self):
+        """Stop the workers and close their browsers"""
+        for _ in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join(timeout=30)
+        self.threads = []
@@ -4,22 +4,30 @@ Allows user to select all filters manually
 """
 
 import time
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import os
+import argparse
 import subprocess
+import sys
 from datetime import datetime
 
+from parsing import parse_address, parse_interior_entries, parse_heating_from_text
+from storage import open_store, open_sinks, BatchedWriter
+
 class RedfinScraperInteractive:
     def __init__(self, excel_file="redfin_properties.xlsx"):
         self.excel_file = excel_file
         self.driver = None
+        self.writer = None  # Background journal + Excel writer
+        self.parquet_dir = None  # --parquet: also write a partitioned Parquet dataset
+        self.property_db = None  # --property-db: latest state + price/status history per listing
         self.base_url = "https://www.redfin.com/county/1974/NY/Nassau-County"
+        self.start_url = None  # --url: filtered listing page, skips manual selection
+        self.auto_continue = False  # --yes: don't ask before each page
         self.listing_status = None
     
     def kill_chrome_processes(self):
@@ -66,6 +74,15 @@ class RedfinScraperInteractive:
         print("REDFIN SCRAPER - MANUAL FILTER SELECTION")
         print("="*60)
         
+        if self.start_url:
+            # Unattended run: the filters are already in the URL
+            self.driver.get(self.start_url)
+            print(f"\nOpened: {self.start_url}")
+            self.listing_status = 'sold' if 'include=sold' in self.start_url else 'for-sale'
+            print(f"Listing Status: {self.listing_status}")
+            time.sleep(3)
+            return
+        
         self.driver.get(self.base_url)
         print(f"\nOpened: {self.base_url}")
         
@@ -175,24 +192,10 @@ class RedfinScraperInteractive:
                 # Try main address
                 address_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.full-address')
                 street = address_elem.text.split(',')[0].strip()
-                property_data['street_address'] = street
                 
                 # Get city, state, zip
-                city_state_zip_elem = self.driver.find_element(By.CSS_SELECTOR, 'span.bp-cityStateZip')
-                city_state_zip = city_state_zip_elem.text
-                
-                parts = city_state_zip.split(',')
-                property_data['city'] = parts[0].strip() if len(parts) > 0 else ''
-                
-                if len(parts) > 1:
-                    state_zip = parts[1].strip().split()
-                    property_data['state'] = state_zip[0] if len(state_zip) > 0 else ''
-                    property_data['zip_code'] = state_zip[1] if len(state_zip) > 1 else ''
-                else:
-                    property_data['state'] = ''
-                    property_data['zip_code'] = ''
-                    
-                property_data['full_address'] = f"{street}, {city_state_zip}"
+                city_state_zip = self.driver.find_element(By.CSS_SELECTOR, 'span.bp-cityStateZip').text
+                property_data.update(parse_address(f"{street}, {city_state_zip}"))
             except Exception as e:
                 print(f"  ⚠ Error extracting address: {e}")
                 property_data['street_address'] = 'N/A'
@@ -311,66 +314,38 @@ class RedfinScraperInteractive:
                     print(f"  ℹ 'Heating:' in page text: {'Heating:' in page_text}")
                     print(f"  ℹ 'Cooling' in page source: {'Cooling' in page_source}")
                     
-                    # Try to find heating section in HTML
+                    # Interior entries first, then the page text
                     heating_found = False
                     
-                    # Method 1: Direct HTML search
                     if 'Heating:' in page_source or 'Heating &amp;' in page_source:
                         print("  ℹ Found Heating in HTML source")
-                        
-                        # Try to get all li elements with entryItem class
                         try:
-                            all_items = self.driver.find_elements(By.CSS_SELECTOR, 'li.entryItem')
-                            print(f"  ℹ Found {len(all_items)} li.entryItem elements")
+                            item_texts = [item.text for item in self.driver.find_elements(By.CSS_SELECTOR, 'li.entryItem')]
+                            print(f"  ℹ Found {len(item_texts)} li.entryItem elements")
                             
-                            for item in all_items:
-                                item_text = item.text
-                                # print(f"    - Item text: {item_text[:50]}...")  # Debug each item
-                                
-                                if 'Heating:' in item_text or 'Heating :' in item_text:
-                                    print(f"  ✓ Found heating item: {item_text}")
-                                    heating_text = item_text.split('Heating')[1].replace(':', '').strip()
-                                    
-                                    if heating_text:
-                                        property_data['heating_type'] = heating_text
-                                        heating_found = True
-                                        
-                                        # Check for Oil (case insensitive)
-                                        if 'oil' in heating_text.lower():
-                                            property_data['has_oil_heating'] = 'Yes'
-                                            print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                        else:
-                                            print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                        break
-                                        
-                                if 'Cooling:' in item_text or 'Cooling :' in item_text:
-                                    cooling_text = item_text.split('Cooling')[1].replace(':', '').strip()
-                                    if cooling_text:
-                                        property_data['cooling_type'] = cooling_text
+                            interior = parse_interior_entries(item_texts)
+                            if interior['cooling_type'] != '-':
+                                property_data['cooling_type'] = interior['cooling_type']
+                            if interior['heating_type'] != '-':
+                                property_data['heating_type'] = interior['heating_type']
+                                property_data['has_oil_heating'] = interior['has_oil_heating']
+                                heating_found = True
                         except Exception as e:
                             print(f"  ⚠ Error iterating items: {e}")
                     
-                    # Method 2: Text-based fallback
                     if not heating_found and 'Heating:' in page_text:
                         print("  ℹ Trying text-based extraction...")
-                        lines = page_text.split('\n')
-                        for i, line in enumerate(lines):
-                            if 'Heating:' in line:
-                                heating_text = line.replace('Heating:', '').strip()
-                                
-                                if not heating_text and i + 1 < len(lines):
-                                    heating_text = lines[i + 1].strip()
-                                
-                                if heating_text:
-                                    property_data['heating_type'] = heating_text
-                                    heating_found = True
-                                    
-                                    if 'oil' in heating_text.lower():
-                                        property_data['has_oil_heating'] = 'Yes'
-                                        print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                    else:
-                                        print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                    break
+                        heating_text = parse_heating_from_text(page_text)
+                        if heating_text:
+                            property_data['heating_type'] = heating_text
+                            property_data['has_oil_heating'] = 'Yes' if 'oil' in heating_text.lower() else 'No'
+                            heating_found = True
+                    
+                    if heating_found:
+                        if property_data['has_oil_heating'] == 'Yes':
+                            print(f"  🔥 OIL HEATING FOUND: {property_data['heating_type']}")
+                        else:
+                            print(f"  ℹ Heating type: {property_data['heating_type']} (No oil)")
                     
                     if not heating_found:
                         print("  ⚠ Could not extract heating information after all methods")
@@ -471,37 +446,39 @@ class RedfinScraperInteractive:
             print(f"✗ Error navigating to next page: {e}")
             return False
     
+    def get_writer(self):
+        """Start the background writer (journal next to the Excel file) on first use"""
+        if self.writer is None:
+            self.writer = BatchedWriter(open_store(self.excel_file), self.excel_file,
+                                        # Newest row per URL wins: for sale -> sold replaces the old row
+                                        export_options={'dedup_column': 'url', 'drop_columns': [],
+                                                        'keep': 'last'},
+                                        sinks=open_sinks(self.start_url or self.base_url, self.parquet_dir,
+                                                         self.property_db))
+        return self.writer
+    
     def save_to_excel(self, properties):
-        """Save or append properties to Excel file"""
+        """Queue properties for the background writer and refresh the Excel file"""
         if not properties:
             print("⚠ No properties to save")
             return
         
-        df_new = pd.DataFrame(properties)
+        writer = self.get_writer()
+        for property_data in properties:
+            writer.put(property_data)
         
-        # Check if file exists
-        if os.path.exists(self.excel_file):
-            try:
-                # Read existing data
-                df_existing = pd.read_excel(self.excel_file)
-                # Append new data
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                # Remove duplicates based on URL
-                df_combined = df_combined.drop_duplicates(subset=['url'], keep='first')
-                df_combined.to_excel(self.excel_file, index=False)
-                print(f"\n✓ Appended {len(df_new)} properties to existing file")
-                print(f"✓ Total properties in file: {len(df_combined)}")
-            except Exception as e:
-                print(f"✗ Error appending to Excel: {e}")
-                # Save as backup
-                backup_file = f"redfin_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                df_new.to_excel(backup_file, index=False)
-                print(f"✓ Saved to backup file: {backup_file}")
-        else:
-            # Create new file
-            df_new.to_excel(self.excel_file, index=False)
-            print(f"\n✓ Created new Excel file: {self.excel_file}")
-            print(f"✓ Saved {len(df_new)} properties")
+        # Serialized on the writer thread; the next page starts right away
+        writer.request_export()
+        print(f"\n✓ Queued {len(properties)} properties for {self.excel_file}")
+    
+    def close_writer(self):
+        """Final flush of queued properties and Excel export"""
+        if self.writer is None:
+            return
+        print("\n→ Writing remaining properties to Excel...")
+        self.writer.close()
+        self.writer.store.close()
+        self.writer = None
     
     def run(self):
         """Main run method"""
@@ -537,7 +514,10 @@ class RedfinScraperInteractive:
                 
                 # Ask user if they want to continue
                 print("\n" + "-"*60)
-                continue_scraping = input("Continue to next page? (y/n): ").strip().lower()
+                if self.auto_continue:
+                    continue_scraping = 'y'
+                else:
+                    continue_scraping = input("Continue to next page? (y/n): ").strip().lower()
                 
                 if continue_scraping != 'y':
                     print("\n✓ Scraping stopped by user")
@@ -568,6 +548,9 @@ class RedfinScraperInteractive:
         except Exception as e:
             print(f"\n✗ Error during scraping: {e}")
         finally:
+            # Also runs after Ctrl+C: nothing queued is lost
+            self.close_writer()
+            
             if self.driver:
                 print("\n→ Closing browser...")
                 self.driver.quit()
@@ -576,13 +559,27 @@ class RedfinScraperInteractive:
 
 def main():
     """Run the scraper"""
+    parser = argparse.ArgumentParser(description="Redfin scraper (all properties)")
+    parser.add_argument('--url', help='filtered search URL; skips manual filter selection')
+    parser.add_argument('--excel', help='output Excel file')
+    parser.add_argument('--yes', action='store_true', help="don't ask before each page")
+    parser.add_argument('--parquet', metavar='DIR', help='also write a Parquet dataset partitioned by region/day/status')
+    parser.add_argument('--property-db', metavar='FILE', help='SQLite store of every listing with price/status history')
+    args = parser.parse_args()
+    
     print("\n")
     print("╔" + "="*58 + "╗")
     print("║" + " "*15 + "REDFIN WEB SCRAPER" + " "*25 + "║")
     print("║" + " "*12 + "Interactive User Control" + " "*22 + "║")
     print("╚" + "="*58 + "╝")
     
-    excel_file = input("\nEnter Excel filename (default: redfin_properties.xlsx): ").strip()
+    if args.excel is not None:
+        excel_file = args.excel
+    elif args.url or args.yes or not sys.stdin.isatty():
+        # Unattended (cron/CI): nobody is there to answer the prompt
+        excel_file = ""
+    else:
+        excel_file = input("\nEnter Excel filename (default: redfin_properties.xlsx): ").strip()
     if not excel_file:
         excel_file = "redfin_properties.xlsx"
     
@@ -592,6 +589,10 @@ def main():
     print(f"\n✓ Will save to: {excel_file}")
     
     scraper = RedfinScraperInteractive(excel_file=excel_file)
+    scraper.start_url = args.url
+    scraper.auto_continue = args.yes
+    scraper.parquet_dir = args.parquet
+    scraper.property_db = args.property_db
     scraper.run()
 
 
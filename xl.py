@@ -4,22 +4,34 @@ Fixed version with auto-save and oil-only filtering
 """
 
 import time
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import argparse
 import os
 import subprocess
+import sys
 from datetime import datetime
 
+from storage import open_store, open_sinks, DedupIndex, BatchedWriter
+from parsing import parse_address, parse_interior_entries, parse_heating_from_text
+
 class RedfinScraperInteractive:
-    def __init__(self, excel_file="redfin_properties.xlsx"):
+    def __init__(self, excel_file="redfin_properties.xlsx", storage_backend="jsonl"):
         self.excel_file = excel_file
         self.driver = None
+        self.storage_backend = storage_backend
+        self.store = None
+        self.writer = None  # Background group commit + Excel export
+        self.parquet_dir = None  # --parquet: also write a partitioned Parquet dataset
+        self.property_db = None  # --property-db: latest state + price/status history per listing
+        self.dedup = None
         self.base_url = "https://www.redfin.com/county/1974/NY/Nassau-County"
+        self.start_url = None  # --url: filtered listing page, skips manual selection
+        self.auto_continue = False  # --yes: don't ask before each page
         self.properties_saved_count = 0
         self.start_element = 1
         self.current_page_num = 1
@@ -68,6 +80,13 @@ class RedfinScraperInteractive:
         print("REDFIN SCRAPER - MANUAL FILTER SELECTION")
         print("="*60)
         
+        if self.start_url:
+            # Unattended run: the filters are already in the URL
+            self.driver.get(self.start_url)
+            print(f"\nOpened: {self.start_url}")
+            time.sleep(3)
+            return
+        
         self.driver.get(self.base_url)
         print(f"\nOpened: {self.base_url}")
         
@@ -221,129 +240,17 @@ class RedfinScraperInteractive:
                 property_data['listing_status'] = 'unknown'
                 property_data['sold_date'] = '-'
             
-            # Get address - try multiple selectors for both sold and for-sale
+            # Get address - h1.full-address on SOLD pages, h1.street-address on FOR SALE pages
             try:
-                # Method 1: Try the standard full address (works for SOLD)
                 try:
                     address_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.full-address')
-                    full_address_text = address_elem.text.strip()
-                    
-                    # Parse the address - SOLD format: "25 Schooner Ln, Port Washington, NY 11050"
-                    if ',' in full_address_text:
-                        parts = [p.strip() for p in full_address_text.split(',')]
-                        
-                        if len(parts) >= 3:
-                            # Format: Street, City, State Zip
-                            property_data['street_address'] = parts[0]
-                            property_data['city'] = parts[1]
-                            
-                            # Parse "NY 11050"
-                            state_zip = parts[2].split()
-                            if len(state_zip) >= 2:
-                                property_data['state'] = state_zip[0]
-                                property_data['zip_code'] = state_zip[1]
-                            else:
-                                property_data['state'] = parts[2]
-                                property_data['zip_code'] = '-'
-                                
-                        elif len(parts) == 2:
-                            # Format: Street, City State Zip
-                            property_data['street_address'] = parts[0]
-                            
-                            # Parse "Port Washington NY 11050"
-                            remainder = parts[1].split()
-                            if len(remainder) >= 3:
-                                property_data['zip_code'] = remainder[-1]
-                                property_data['state'] = remainder[-2]
-                                property_data['city'] = ' '.join(remainder[:-2])
-                            elif len(remainder) == 2:
-                                property_data['state'] = remainder[0]
-                                property_data['zip_code'] = remainder[1]
-                                property_data['city'] = '-'
-                            else:
-                                property_data['city'] = parts[1]
-                                property_data['state'] = '-'
-                                property_data['zip_code'] = '-'
-                        else:
-                            property_data['street_address'] = parts[0]
-                            property_data['city'] = '-'
-                            property_data['state'] = '-'
-                            property_data['zip_code'] = '-'
-                    else:
-                        # Single line address
-                        property_data['street_address'] = full_address_text
-                        property_data['city'] = '-'
-                        property_data['state'] = '-'
-                        property_data['zip_code'] = '-'
-                    
-                    property_data['full_address'] = full_address_text
-                    print(f"  ✓ Address: {property_data['full_address']}")
-                    
                 except:
-                    # Method 2: For FOR SALE properties with different structure
-                    try:
-                        # Try street-address class specifically
-                        street_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.street-address')
-                        full_address_text = street_elem.text.strip()
-                        
-                        # Parse: "166 N Oak St, Massapequa, NY 11758"
-                        if ',' in full_address_text:
-                            parts = [p.strip() for p in full_address_text.split(',')]
-                            
-                            if len(parts) >= 3:
-                                # Street, City, State ZIP
-                                property_data['street_address'] = parts[0]
-                                property_data['city'] = parts[1]
-                                
-                                # Parse "NY 11758"
-                                state_zip = parts[2].split()
-                                if len(state_zip) >= 2:
-                                    property_data['state'] = state_zip[0]
-                                    property_data['zip_code'] = state_zip[1]
-                                else:
-                                    property_data['state'] = parts[2]
-                                    property_data['zip_code'] = '-'
-                            elif len(parts) == 2:
-                                property_data['street_address'] = parts[0]
-                                # Try to parse city, state, zip from second part
-                                remainder = parts[1].split()
-                                if len(remainder) >= 2:
-                                    property_data['zip_code'] = remainder[-1]
-                                    property_data['state'] = remainder[-2]
-                                    property_data['city'] = ' '.join(remainder[:-2])
-                                else:
-                                    property_data['city'] = parts[1]
-                                    property_data['state'] = '-'
-                                    property_data['zip_code'] = '-'
-                            else:
-                                property_data['street_address'] = parts[0]
-                                property_data['city'] = '-'
-                                property_data['state'] = '-'
-                                property_data['zip_code'] = '-'
-                        else:
-                            property_data['street_address'] = full_address_text
-                            property_data['city'] = '-'
-                            property_data['state'] = '-'
-                            property_data['zip_code'] = '-'
-                        
-                        property_data['full_address'] = full_address_text
-                        print(f"  ✓ Address: {property_data['full_address']}")
-                        
-                    except Exception as e2:
-                        print(f"  ⚠ Both address methods failed: {e2}")
-                        property_data['street_address'] = '-'
-                        property_data['city'] = '-'
-                        property_data['state'] = '-'
-                        property_data['zip_code'] = '-'
-                        property_data['full_address'] = '-'
-                        
+                    address_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1.street-address')
+                property_data.update(parse_address(address_elem.text))
+                print(f"  ✓ Address: {property_data['full_address']}")
             except Exception as e:
                 print(f"  ⚠ Error extracting address: {e}")
-                property_data['street_address'] = '-'
-                property_data['city'] = '-'
-                property_data['state'] = '-'
-                property_data['zip_code'] = '-'
-                property_data['full_address'] = '-'
+                property_data.update(parse_address(None))
             
             # Get price
             try:
@@ -455,65 +362,38 @@ class RedfinScraperInteractive:
                     print(f"  ℹ 'Heating:' in page text: {'Heating:' in page_text}")
                     print(f"  ℹ 'Cooling' in page source: {'Cooling' in page_source}")
                     
-                    # Try to find heating section in HTML
+                    # Interior entries first, then the page text
                     heating_found = False
                     
-                    # Method 1: Direct HTML search
                     if 'Heating:' in page_source or 'Heating &amp;' in page_source:
                         print("  ℹ Found Heating in HTML source")
-                        
-                        # Try to get all li elements with entryItem class
                         try:
-                            all_items = self.driver.find_elements(By.CSS_SELECTOR, 'li.entryItem')
-                            print(f"  ℹ Found {len(all_items)} li.entryItem elements")
+                            item_texts = [item.text for item in self.driver.find_elements(By.CSS_SELECTOR, 'li.entryItem')]
+                            print(f"  ℹ Found {len(item_texts)} li.entryItem elements")
                             
-                            for item in all_items:
-                                item_text = item.text
-                                
-                                if 'Heating:' in item_text or 'Heating :' in item_text:
-                                    print(f"  ✓ Found heating item: {item_text}")
-                                    heating_text = item_text.split('Heating')[1].replace(':', '').strip()
-                                    
-                                    if heating_text:
-                                        property_data['heating_type'] = heating_text
-                                        heating_found = True
-                                        
-                                        # Check for Oil (case insensitive)
-                                        if 'oil' in heating_text.lower():
-                                            property_data['has_oil_heating'] = 'Yes'
-                                            print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                        else:
-                                            print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                        break
-                                        
-                                if 'Cooling:' in item_text or 'Cooling :' in item_text:
-                                    cooling_text = item_text.split('Cooling')[1].replace(':', '').strip()
-                                    if cooling_text:
-                                        property_data['cooling_type'] = cooling_text
+                            interior = parse_interior_entries(item_texts)
+                            if interior['cooling_type'] != '-':
+                                property_data['cooling_type'] = interior['cooling_type']
+                            if interior['heating_type'] != '-':
+                                property_data['heating_type'] = interior['heating_type']
+                                property_data['has_oil_heating'] = interior['has_oil_heating']
+                                heating_found = True
                         except Exception as e:
                             print(f"  ⚠ Error iterating items: {e}")
                     
-                    # Method 2: Text-based fallback
                     if not heating_found and 'Heating:' in page_text:
                         print("  ℹ Trying text-based extraction...")
-                        lines = page_text.split('\n')
-                        for i, line in enumerate(lines):
-                            if 'Heating:' in line:
-                                heating_text = line.replace('Heating:', '').strip()
-                                
-                                if not heating_text and i + 1 < len(lines):
-                                    heating_text = lines[i + 1].strip()
-                                
-                                if heating_text:
-                                    property_data['heating_type'] = heating_text
-                                    heating_found = True
-                                    
-                                    if 'oil' in heating_text.lower():
-                                        property_data['has_oil_heating'] = 'Yes'
-                                        print(f"  🔥 OIL HEATING FOUND: {heating_text}")
-                                    else:
-                                        print(f"  ℹ Heating type: {heating_text} (No oil)")
-                                    break
+                        heating_text = parse_heating_from_text(page_text)
+                        if heating_text:
+                            property_data['heating_type'] = heating_text
+                            property_data['has_oil_heating'] = 'Yes' if 'oil' in heating_text.lower() else 'No'
+                            heating_found = True
+                    
+                    if heating_found:
+                        if property_data['has_oil_heating'] == 'Yes':
+                            print(f"  🔥 OIL HEATING FOUND: {property_data['heating_type']}")
+                        else:
+                            print(f"  ℹ Heating type: {property_data['heating_type']} (No oil)")
                     
                     if not heating_found:
                         print("  ⚠ Could not extract heating information after all methods")
@@ -568,6 +448,36 @@ class RedfinScraperInteractive:
         
         return property_data
     
+    def get_writer(self):
+        """Start the background journal writer on first use"""
+        if self.writer is None:
+            if self.store is None:
+                self.store = open_store(self.excel_file, self.storage_backend)
+            self.writer = BatchedWriter(self.store, self.excel_file, on_commit=self.records_committed,
+                                        sinks=open_sinks(self.start_url or self.base_url, self.parquet_dir,
+                                                         self.property_db))
+        return self.writer
+    
+    def records_committed(self, records):
+        """Writer thread: remember saved properties once they are on disk"""
+        if self.dedup is not None:
+            for property_data in records:
+                self.dedup.add(property_data)
+    
+    def export_excel(self):
+        """Final journal flush, then rebuild the Excel file from the journal"""
+        if self.store is None:
+            return
+        self.get_writer().close()
+        self.writer = None
+    
+    def load_dedup_index(self):
+        """Load already-scraped URLs and addresses from the existing output"""
+        if self.store is None:
+            self.store = open_store(self.excel_file, self.storage_backend)
+        self.dedup = DedupIndex.load(self.excel_file, self.store)
+        print(f"✓ Dedup index loaded: {len(self.dedup.urls)} URLs, {len(self.dedup.addresses)} addresses")
+    
     def save_property_immediately(self, property_data):
         """Save single property immediately if it has oil heating"""
         # Only save if has oil heating
@@ -575,39 +485,15 @@ class RedfinScraperInteractive:
             print(f"  ⊗ Skipped (No oil heating)")
             return False
         
+        if self.dedup is not None and self.dedup.has_address(property_data.get('full_address')):
+            print(f"  ⊗ Skipped (Already saved: {property_data['full_address']})")
+            return False
+        
         try:
-            # Create DataFrame from single property
-            df_new = pd.DataFrame([property_data])
-            
-            # Remove unnecessary columns before saving
-            columns_to_remove = ['url', 'scrape_date', 'price', 'beds', 'baths', 
-                                'sqft', 'has_oil_heating', 'listing_agent', 'broker']
-            for col in columns_to_remove:
-                if col in df_new.columns:
-                    df_new = df_new.drop(col, axis=1)
-            
-            # Check if file exists
-            if os.path.exists(self.excel_file):
-                # Read existing data
-                df_existing = pd.read_excel(self.excel_file)
-                
-                # Append new data
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                
-                # Remove duplicates based on full_address
-                df_combined = df_combined.drop_duplicates(subset=['full_address'], keep='first')
-                
-                # Save back to file
-                df_combined.to_excel(self.excel_file, index=False)
-                
-                self.properties_saved_count += 1
-                print(f"  ✓ SAVED to Excel (Total oil properties: {self.properties_saved_count})")
-            else:
-                # Create new file
-                df_new.to_excel(self.excel_file, index=False)
-                self.properties_saved_count += 1
-                print(f"  ✓ Created Excel file and saved property (Total: {self.properties_saved_count})")
-            
+            # Queued for the writer's next group commit; Excel is written at run end
+            self.get_writer().put(property_data)
+            self.properties_saved_count += 1
+            print(f"  ✓ SAVED to journal (Total oil properties: {self.properties_saved_count})")
             return True
             
         except Exception as e:
@@ -649,12 +535,20 @@ class RedfinScraperInteractive:
             for i, url in enumerate(property_urls, 1):
                 print(f"[{i}/{properties_to_scrape}] Processing: {url}")
                 
+                # Skip listings already scraped in a previous run
+                if self.dedup is not None and self.dedup.has_url(url):
+                    print(f"  ⊗ Skipped (Already scraped)")
+                    continue
+                
                 try:
                     property_data = self.extract_property_details(url)
                     
-                    # Save immediately if has oil heating
+                    # Save immediately if has oil heating (remembered once committed)
                     if self.save_property_immediately(property_data):
                         oil_properties_on_page += 1
+                    elif self.dedup is not None and 'error' not in property_data:
+                        # Remember the visit unless extraction failed (retry next run)
+                        self.dedup.add(property_data)
                     
                     time.sleep(1)  # Be nice to the server
                     
@@ -735,6 +629,9 @@ class RedfinScraperInteractive:
             # Kill any existing Chrome processes first
             self.kill_chrome_processes()
             
+            # Load the dedup index once, before any page is opened
+            self.load_dedup_index()
+            
             # Setup browser
             self.setup_driver()
             
@@ -765,7 +662,10 @@ class RedfinScraperInteractive:
                 # Ask user if they want to continue
                 print("\n" + "-"*60)
                 print(f"📄 More pages available...")
-                continue_scraping = input("Continue to next page? (y/n, default: y): ").strip().lower()
+                if self.auto_continue:
+                    continue_scraping = 'y'
+                else:
+                    continue_scraping = input("Continue to next page? (y/n, default: y): ").strip().lower()
                 
                 if continue_scraping == 'n':
                     print("\n✓ Scraping stopped by user")
@@ -799,6 +699,14 @@ class RedfinScraperInteractive:
             import traceback
             traceback.print_exc()
         finally:
+            if self.store is not None:
+                print("\n→ Exporting journal to Excel...")
+                self.export_excel()
+                self.store.close()
+            
+            if self.dedup is not None:
+                self.dedup.close()
+            
             if self.driver:
                 print("\n→ Closing browser...")
                 try:
@@ -810,13 +718,27 @@ class RedfinScraperInteractive:
 
 def main():
     """Run the scraper"""
+    parser = argparse.ArgumentParser(description="Redfin scraper (oil-heated properties)")
+    parser.add_argument('--url', help='filtered search URL; skips manual filter selection')
+    parser.add_argument('--excel', help='output Excel file')
+    parser.add_argument('--yes', action='store_true', help="don't ask before each page")
+    parser.add_argument('--parquet', metavar='DIR', help='also write a Parquet dataset partitioned by region/day/status')
+    parser.add_argument('--property-db', metavar='FILE', help='SQLite store of every listing with price/status history')
+    args = parser.parse_args()
+    
     print("\n")
     print("╔" + "="*58 + "╗")
     print("║" + " "*15 + "REDFIN WEB SCRAPER" + " "*25 + "║")
     print("║" + " "*10 + "OIL HEATING PROPERTIES ONLY" + " "*20 + "║")
     print("╚" + "="*58 + "╝")
     
-    excel_file = input("\nEnter Excel filename (default: redfin_oil_properties.xlsx): ").strip()
+    if args.excel is not None:
+        excel_file = args.excel
+    elif args.url or args.yes or not sys.stdin.isatty():
+        # Unattended (cron/CI): nobody is there to answer the prompt
+        excel_file = ""
+    else:
+        excel_file = input("\nEnter Excel filename (default: redfin_oil_properties.xlsx): ").strip()
     if not excel_file:
         excel_file = "redfin_oil_properties.xlsx"
     
@@ -826,13 +748,17 @@ def main():
     print(f"\n✓ Will save to: {excel_file}")
     print("✓ Only properties with OIL heating will be saved")
     print("✓ URL column will NOT be included")
-    print("✓ Data is saved after EACH property (safe from interruptions)")
+    print("✓ Data is journaled after EACH property (safe from interruptions)")
     
     if os.path.exists(excel_file):
         print(f"\n⚠ File already exists: {excel_file}")
         print("✓ New data will be APPENDED to existing file")
     
     scraper = RedfinScraperInteractive(excel_file=excel_file)
+    scraper.start_url = args.url
+    scraper.auto_continue = args.yes
+    scraper.parquet_dir = args.parquet
+    scraper.property_db = args.property_db
     scraper.run()
 
 